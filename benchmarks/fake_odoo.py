@@ -0,0 +1,413 @@
+"""In-process stand-in for the Odoo XML-RPC and JSON-RPC APIs used by tests and benchmarks."""
+
+import json
+import random
+import socketserver
+import threading
+import time
+import xmlrpc.client
+from collections import Counter
+from xmlrpc.server import (
+    MultiPathXMLRPCServer,
+    SimpleXMLRPCDispatcher,
+    SimpleXMLRPCRequestHandler,
+)
+
+COMMON_PATH = "/xmlrpc/2/common"
+OBJECT_PATH = "/xmlrpc/2/object"
+JSONRPC_PATH = "/jsonrpc"
+
+DEFAULT_COUNTRIES: dict[str, tuple[str, list[str]]] = {
+    "US": ("United States", ["California", "New York", "Texas", "Florida"]),
+    "BR": ("Brazil", ["Minas Gerais", "Rio de Janeiro", "São Paulo", "Bahia"]),
+    "PT": ("Portugal", ["Lisboa", "Porto"]),
+    "AR": ("Argentina", ["Buenos Aires"]),
+}
+
+MANY2ONE_FIELDS = {
+    "res.country.state": {"country_id": "res.country"},
+    "res.partner": {"country_id": "res.country", "state_id": "res.country.state"},
+}
+
+
+def _matches(record: dict, domain: list) -> bool:
+    """Evaluate the AND-only subset of Odoo domains the importer relies on"""
+    for term in domain:
+        if isinstance(term, str):
+            # "&" is the implicit operator; anything else is unsupported
+            if term != "&":
+                raise xmlrpc.client.Fault(2, f"Unsupported domain operator: {term}")
+            continue
+
+        field, operator, value = term
+        current = record.get(field)
+
+        if operator == "=":
+            ok = current == value
+        elif operator == "!=":
+            ok = current != value
+        elif operator == "in":
+            ok = current in value
+        elif operator == "not in":
+            ok = current not in value
+        elif operator == "=ilike":
+            ok = isinstance(current, str) and current.lower() == str(value).lower()
+        elif operator == ">":
+            ok = current is not None and current > value
+        elif operator == ">=":
+            ok = current is not None and current >= value
+        elif operator == "<":
+            ok = current is not None and current < value
+        elif operator == "<=":
+            ok = current is not None and current <= value
+        else:
+            raise xmlrpc.client.Fault(2, f"Unsupported domain operator: {operator}")
+
+        if not ok:
+            return False
+
+    return True
+
+
+class FakeOdoo:
+    """In-memory Odoo database exposing the subset of the API used by the importer"""
+
+    def __init__(
+        self,
+        *,
+        db: str = "test",
+        username: str = "admin",
+        password: str = "admin",
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        failure_rate: float = 0.0,
+        seed: int | None = None,
+        countries: dict[str, tuple[str, list[str]]] = DEFAULT_COUNTRIES,
+        blocked_emails: tuple[str, ...] = (),
+    ) -> None:
+        self.db = db
+        self.username = username
+        self.password = password
+        self.uid = 2
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        # Partners with these emails violate a server-side constraint on create and write
+        self.blocked_emails = set(blocked_emails)
+        # While set, every request gets HTTP 503, like Odoo restarting behind a proxy
+        self.unavailable = False
+        self.unavailable_hits = 0
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._countries = countries
+        self.rpc_counts: Counter = Counter()
+        self.reset()
+
+    def reset(self) -> None:
+        """Drop every partner and RPC counter, keeping only the seeded references"""
+        with self._lock:
+            self.tables: dict[str, dict[int, dict]] = {
+                "res.country": {},
+                "res.country.state": {},
+                "res.partner": {},
+            }
+            self._next_id = 1
+            self.xmlids: dict[str, tuple[str, int]] = {}
+            self.rpc_counts.clear()
+
+            for code, (name, states) in self._countries.items():
+                country_id = self._insert("res.country", {"name": name, "code": code})
+                for state in states:
+                    self._insert(
+                        "res.country.state",
+                        {"name": state, "code": state[:3].upper(), "country_id": country_id},
+                    )
+
+    @property
+    def rpc_total(self) -> int:
+        with self._lock:
+            return sum(self.rpc_counts.values())
+
+    def partners(self) -> list[dict]:
+        with self._lock:
+            return [dict(r) for r in self.tables["res.partner"].values()]
+
+    @staticmethod
+    def _now() -> str:
+        # Odoo's datetime format, with one second resolution
+        return time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime())
+
+    def _insert(self, model: str, values: dict) -> int:
+        record_id = self._next_id
+        self._next_id += 1
+        self.tables[model][record_id] = {"id": record_id, **values, "write_date": self._now()}
+        return record_id
+
+    def _simulate_network(self, key: str) -> None:
+        with self._lock:
+            self.rpc_counts[key] += 1
+            delay = self.latency
+            if self.jitter:
+                delay += self._random.uniform(-self.jitter, self.jitter)
+            failed = self._random.random() < self.failure_rate
+
+        if delay > 0:
+            time.sleep(delay)
+        if failed:
+            # A serialization conflict: Odoo reports it as a Fault, yet resending succeeds
+            raise xmlrpc.client.Fault(
+                1, f"could not serialize access due to concurrent update ({key})"
+            )
+
+    def _check_credentials(self, db: str, uid: int, password: str) -> None:
+        if db != self.db or uid != self.uid or password != self.password:
+            raise xmlrpc.client.Fault(3, "Access Denied")
+
+    def _read(self, model: str, record: dict, fields: list | None) -> dict:
+        many2one = MANY2ONE_FIELDS.get(model, {})
+        names = fields or list(record)
+        result = {"id": record["id"]}
+
+        for name in names:
+            value = record.get(name)
+            if name in many2one and value:
+                target = self.tables[many2one[name]].get(value, {})
+                value = [value, target.get("name", "")]
+            result[name] = False if value is None else value
+
+        return result
+
+    def _check_constraints(self, model: str, records: list[dict]) -> None:
+        if model != "res.partner":
+            return
+        for record in records:
+            if record.get("email") in self.blocked_emails:
+                raise xmlrpc.client.Fault(
+                    1, f"ValidationError: the email {record['email']} is blocked"
+                )
+
+    def _search(self, model: str, domain: list, offset: int = 0, limit=None, order=None):
+        records = [r for r in self.tables[model].values() if _matches(r, domain)]
+
+        if order:
+            field, _, direction = order.partition(" ")
+            records.sort(
+                key=lambda r: (r.get(field) is None, r.get(field)),
+                reverse=direction.strip().lower() == "desc",
+            )
+
+        records = records[offset:]
+        return records[:limit] if limit else records
+
+    def _name_lookup(self, model: str, name: str) -> int | None:
+        # Odoo's `load` resolves many2one names with name_search on the whole comodel:
+        # a state is not narrowed to the row's country, the first match by id wins
+        for record in self._search(model, [], order="id"):
+            if record.get("name", "").lower() == name.lower():
+                return record["id"]
+        return None
+
+    def _load(self, model: str, fields: list[str], rows: list[list]) -> dict:
+        """Create or update records by external id; any error rolls back the whole call"""
+        many2one = MANY2ONE_FIELDS.get(model, {})
+        messages, staged = [], []
+
+        for index, row in enumerate(rows):
+            values = dict(zip(fields, row))
+            xmlid = values.pop("id", None) or None
+            for name, value in list(values.items()):
+                if value in ("", None):
+                    values[name] = None
+                elif name in many2one:
+                    values[name] = self._name_lookup(many2one[name], value)
+                    if values[name] is None:
+                        messages.append(
+                            {
+                                "type": "error",
+                                "record": index,
+                                "field": name,
+                                "message": f"No matching record found for name '{value}' in field '{name}'",
+                            }
+                        )
+            if model == "res.partner" and values.get("email") in self.blocked_emails:
+                messages.append(
+                    {
+                        "type": "error",
+                        "record": index,
+                        "message": f"ValidationError: the email {values['email']} is blocked",
+                    }
+                )
+            staged.append((xmlid, values))
+
+        if messages:
+            return {"ids": False, "messages": messages}
+
+        ids = []
+        for xmlid, values in staged:
+            known = self.xmlids.get(xmlid) if xmlid else None
+            if known is not None:
+                self.tables[model][known[1]].update(values, write_date=self._now())
+                ids.append(known[1])
+                continue
+            record_id = self._insert(model, values)
+            if xmlid:
+                self.xmlids[xmlid] = (model, record_id)
+            ids.append(record_id)
+
+        return {"ids": ids, "messages": []}
+
+    # RPC endpoints
+
+    def version(self) -> dict:
+        return {"server_version": "fake", "protocol_version": 1}
+
+    def authenticate(self, db: str, username: str, password: str, user_agent_env) -> int | bool:
+        self._simulate_network("common.authenticate")
+        if db == self.db and username == self.username and password == self.password:
+            return self.uid
+        return False
+
+    def execute_kw(self, db, uid, password, model, method, args, kwargs=None):
+        self._simulate_network(f"{model}.{method}")
+        self._check_credentials(db, uid, password)
+
+        if model not in self.tables:
+            raise xmlrpc.client.Fault(2, f"Object {model} doesn't exist")
+
+        kwargs = kwargs or {}
+        with self._lock:
+            if method in ("search", "search_read"):
+                records = self._search(
+                    model,
+                    args[0],
+                    offset=kwargs.get("offset", 0),
+                    limit=kwargs.get("limit"),
+                    order=kwargs.get("order"),
+                )
+                if method == "search":
+                    return [r["id"] for r in records]
+                return [self._read(model, r, kwargs.get("fields")) for r in records]
+
+            if method == "create":
+                values = args[0]
+                records = [values] if isinstance(values, dict) else values
+                # The whole call is one transaction: nothing is created on error
+                self._check_constraints(model, records)
+                ids = [self._insert(model, v) for v in records]
+                return ids[0] if isinstance(values, dict) else ids
+
+            if method == "write":
+                ids, values = args
+                for record_id in ids:
+                    if record_id not in self.tables[model]:
+                        raise xmlrpc.client.Fault(
+                            2, f"Record does not exist or has been deleted. ({model}({record_id},))"
+                        )
+                self._check_constraints(model, [self.tables[model][i] for i in ids])
+                for record_id in ids:
+                    self.tables[model][record_id].update(values, write_date=self._now())
+                return True
+
+            if method == "load":
+                return self._load(model, *args)
+
+        raise xmlrpc.client.Fault(2, f"Method {method} is not supported by FakeOdoo")
+
+
+class _JsonRpcDispatcher:
+    """Serve Odoo's /jsonrpc protocol through the XML-RPC server's dispatch hook"""
+
+    def __init__(self, odoo: FakeOdoo) -> None:
+        self.services = {
+            "common": {"version": odoo.version, "authenticate": odoo.authenticate},
+            "object": {"execute_kw": odoo.execute_kw},
+        }
+
+    def _marshaled_dispatch(self, data: bytes, dispatch_method=None, path=None) -> bytes:
+        request = json.loads(data)
+        params = request.get("params", {})
+        response = {"jsonrpc": "2.0", "id": request.get("id")}
+
+        try:
+            method = self.services[params["service"]][params["method"]]
+            response["result"] = method(*params.get("args", []))
+        except Exception as e:
+            fault_string = e.faultString if isinstance(e, xmlrpc.client.Fault) else str(e)
+            response["error"] = {
+                "code": 200,
+                "message": "Odoo Server Error",
+                "data": {"name": "odoo.exceptions.UserError", "message": fault_string},
+            }
+
+        return json.dumps(response).encode()
+
+
+class _RequestHandler(SimpleXMLRPCRequestHandler):
+    rpc_paths = (COMMON_PATH, OBJECT_PATH, JSONRPC_PATH)
+    # Keep connections open between requests, like Odoo behind a reverse proxy
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self) -> None:
+        odoo = self.server.odoo
+        if not odoo.unavailable:
+            return super().do_POST()
+
+        # Drain the body so the keep-alive connection stays usable
+        self.rfile.read(int(self.headers.get("content-length", 0)))
+        with odoo._lock:
+            odoo.unavailable_hits += 1
+        self.send_response(503)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+
+class _ThreadingServer(socketserver.ThreadingMixIn, MultiPathXMLRPCServer):
+    daemon_threads = True
+
+
+class FakeOdooServer:
+    """Serve a `FakeOdoo` on a local port from a background thread"""
+
+    def __init__(self, odoo: FakeOdoo | None = None, host: str = "127.0.0.1", port: int = 0):
+        self.odoo = odoo or FakeOdoo()
+        self._server = _ThreadingServer(
+            (host, port),
+            requestHandler=_RequestHandler,
+            logRequests=False,
+            allow_none=True,
+        )
+        self._server.odoo = self.odoo
+
+        common = SimpleXMLRPCDispatcher(allow_none=True)
+        common.register_function(self.odoo.version, "version")
+        common.register_function(self.odoo.authenticate, "authenticate")
+        self._server.add_dispatcher(COMMON_PATH, common)
+
+        models = SimpleXMLRPCDispatcher(allow_none=True)
+        models.register_function(self.odoo.execute_kw, "execute_kw")
+        self._server.add_dispatcher(OBJECT_PATH, models)
+        self._server.add_dispatcher(JSONRPC_PATH, _JsonRpcDispatcher(self.odoo))
+
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        )
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeOdooServer":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "FakeOdooServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
@@ -0,0 +1,242 @@
+"""Throughput benchmark for `import_contacts` against the in-process fake Odoo.
+
+Usage:
+    python -m benchmarks.run sweep --batch-size 250 --batch-size 1000 --max-workers 2 --max-workers 4
+"""
+
+import io
+import itertools
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Annotated
+
+import typer
+from rich.console import Console
+from rich.table import Table
+
+from benchmarks.fake_odoo import FakeOdoo, FakeOdooServer
+
+DEFAULT_FILES = [Path("data/100.csv"), Path("data/4000.csv"), Path("data/10000.csv")]
+
+app = typer.Typer()
+
+
+def run_single(
+    *,
+    url: str,
+    db: str,
+    username: str,
+    password: str,
+    file_name: Path,
+    batch_size: int,
+    max_workers: int,
+    dlq_file: str,
+    engine: str = "threads",
+    protocol: str = "xmlrpc",
+) -> dict:
+    """Run one import in the current process and return its measurements"""
+    from odoo_xmlrpc_csv_importer.application.import_contacts import import_contacts
+    from odoo_xmlrpc_csv_importer.infrastructure.csv_manager import CsvManager
+    from odoo_xmlrpc_csv_importer.infrastructure.import_stats import ImportStats
+    from odoo_xmlrpc_csv_importer.infrastructure.odoo_client import OdooClient
+    from odoo_xmlrpc_csv_importer.services.reference_cache import ReferenceCache
+
+    odoo_client = OdooClient(
+        url=url,
+        db=db,
+        username=username,
+        password=password,
+        pool_size=max_workers,
+        protocol=protocol,
+    )
+    odoo_client.authenticate()
+
+    import_stats = ImportStats(max_workers=max_workers)
+    csv_manager = CsvManager(file_name, dlq_file, import_stats=import_stats)
+
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    import_contacts(
+        file_name=file_name,
+        max_workers=max_workers,
+        batch_size=batch_size,
+        odoo_client=odoo_client,
+        csv_manager=csv_manager,
+        reference_cache=ReferenceCache(),
+        import_stats=import_stats,
+        console=Console(file=io.StringIO()),
+        prefetch_references=True,
+        engine=engine,
+    )
+    wall_seconds = time.perf_counter() - wall_start
+    cpu_seconds = time.process_time() - cpu_start
+
+    snapshot = import_stats.snapshot()
+    rows = snapshot["contacts_created"] + snapshot["contacts_skipped_odoo"]
+    return {
+        "rows": rows,
+        "created": snapshot["contacts_created"],
+        "batch_errors": snapshot["batch_errors"],
+        "seconds": wall_seconds,
+        "cpu_seconds": cpu_seconds,
+        "cpu_ms_per_1k": cpu_seconds * 1000 * 1000 / rows if rows else 0.0,
+        "rows_per_second": rows / wall_seconds if wall_seconds else 0.0,
+        # ru_maxrss is reported in KiB on Linux
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+
+@app.command("worker", hidden=True)
+def worker(
+    url: str,
+    db: str,
+    username: str,
+    password: str,
+    file_name: Path,
+    batch_size: int,
+    max_workers: int,
+    output: Path,
+    engine: str = "threads",
+    protocol: str = "xmlrpc",
+) -> None:
+    """Subprocess entrypoint, so every run gets a fresh peak RSS"""
+    with tempfile.TemporaryDirectory() as tmp:
+        result = run_single(
+            url=url,
+            db=db,
+            username=username,
+            password=password,
+            file_name=file_name,
+            batch_size=batch_size,
+            max_workers=max_workers,
+            dlq_file=str(Path(tmp) / "failed_records.csv"),
+            engine=engine,
+            protocol=protocol,
+        )
+    output.write_text(json.dumps(result))
+
+
+@app.command("sweep")
+def sweep(
+    files: Annotated[list[Path], typer.Option("--file", help="CSV files to import")] = DEFAULT_FILES,
+    batch_sizes: Annotated[list[int], typer.Option("--batch-size")] = [100, 500, 1000],
+    max_workers: Annotated[list[int], typer.Option("--max-workers")] = [1, 2, 4, 8],
+    engines: Annotated[
+        list[str], typer.Option("--engine", help="threads, pipeline and/or asyncio")
+    ] = ["threads"],
+    protocols: Annotated[
+        list[str], typer.Option("--protocol", help="xmlrpc and/or jsonrpc")
+    ] = ["xmlrpc"],
+    latency: Annotated[float, typer.Option(help="Fake RPC latency in seconds")] = 0.005,
+    jitter: Annotated[float, typer.Option(help="Uniform +/- jitter in seconds")] = 0.002,
+    failure_rate: Annotated[float, typer.Option(help="Share of RPCs that fail")] = 0.0,
+    output: Annotated[Path | None, typer.Option(help="Write results as JSON")] = None,
+    baseline: Annotated[
+        Path | None, typer.Option(help="Previous JSON results to compare against")
+    ] = None,
+    tolerance: Annotated[
+        float, typer.Option(help="Allowed throughput drop against the baseline")
+    ] = 0.2,
+) -> None:
+    """Sweep batch size and worker count, recording throughput, RPCs and peak RSS"""
+    console = Console()
+    odoo = FakeOdoo(latency=latency, jitter=jitter, failure_rate=failure_rate, seed=42)
+    results = []
+
+    with FakeOdooServer(odoo) as server, tempfile.TemporaryDirectory() as tmp:
+        for file_name, engine, protocol, batch_size, workers in itertools.product(
+            files, engines, protocols, batch_sizes, max_workers
+        ):
+            odoo.reset()
+            result_file = Path(tmp) / "result.json"
+            subprocess.run(
+                [
+                    sys.executable, "-m", "benchmarks.run", "worker",
+                    server.url, odoo.db, odoo.username, odoo.password,
+                    str(file_name), str(batch_size), str(workers), str(result_file),
+                    "--engine", engine, "--protocol", protocol,
+                ],
+                check=True,
+                stdout=subprocess.DEVNULL,
+            )
+            result = json.loads(result_file.read_text())
+            result |= {
+                "file": str(file_name),
+                "engine": engine,
+                "protocol": protocol,
+                "batch_size": batch_size,
+                "max_workers": workers,
+                "rpc_count": odoo.rpc_total,
+                "rpc_breakdown": dict(odoo.rpc_counts),
+            }
+            results.append(result)
+            console.print(
+                f"[dim]{file_name.name}[/] {engine}/{protocol} · lote {batch_size} · {workers} threads → "
+                f"[green]{result['rows_per_second']:,.0f}[/] linhas/s"
+            )
+
+    table = Table(title="Benchmark import_contacts")
+    for column in (
+        "Arquivo", "Engine", "Protocolo", "Lote", "Threads",
+        "Linhas/s", "RPCs", "CPU (s)", "CPU/1k (ms)", "RSS pico (MB)",
+    ):
+        table.add_column(column, justify="right")
+    for r in results:
+        table.add_row(
+            Path(r["file"]).name,
+            r["engine"],
+            r["protocol"],
+            str(r["batch_size"]),
+            str(r["max_workers"]),
+            f"{r['rows_per_second']:,.0f}",
+            f"{r['rpc_count']:,}",
+            f"{r['cpu_seconds']:.2f}",
+            f"{r['cpu_ms_per_1k']:.1f}",
+            f"{r['peak_rss_mb']:.1f}",
+        )
+    console.print(table)
+
+    if output:
+        output.write_text(json.dumps(results, indent=2))
+
+    if baseline:
+        regressions = compare_with_baseline(results, json.loads(baseline.read_text()), tolerance)
+        for message in regressions:
+            console.print(f"[bold red]Regressão:[/] {message}")
+        if regressions:
+            raise typer.Exit(code=1)
+
+
+def compare_with_baseline(results: list[dict], baseline: list[dict], tolerance: float) -> list[str]:
+    """List the runs whose throughput dropped more than `tolerance` against the baseline"""
+    key = lambda r: (
+        Path(r["file"]).name,
+        r.get("engine", "threads"),
+        r.get("protocol", "xmlrpc"),
+        r["batch_size"],
+        r["max_workers"],
+    )
+    previous = {key(r): r for r in baseline}
+    regressions = []
+
+    for r in results:
+        before = previous.get(key(r))
+        if before is None:
+            continue
+        floor = before["rows_per_second"] * (1 - tolerance)
+        if r["rows_per_second"] < floor:
+            regressions.append(
+                f"{key(r)}: {r['rows_per_second']:,.0f} linhas/s "
+                f"(antes {before['rows_per_second']:,.0f})"
+            )
+
+    return regressions
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,265 @@
+import asyncio
+from contextlib import nullcontext
+from functools import partial
+from typing import AsyncIterator, Iterable
+
+from odoo_xmlrpc_csv_importer.application.import_contacts import (
+    UPDATE_FIELDS,
+    BatchJob,
+    enrich_contacts,
+    enrich_existing,
+    fail_job,
+    finish_job,
+    flatten_sent,
+    interrupted_outcome,
+    plan_writes,
+    record_partner_ids,
+)
+from odoo_xmlrpc_csv_importer.core.bisection import BisectionInterrupted, bisect_failures_async
+from odoo_xmlrpc_csv_importer.infrastructure.async_odoo_client import AsyncOdooClient
+from odoo_xmlrpc_csv_importer.infrastructure.import_stats import ImportStats
+from odoo_xmlrpc_csv_importer.infrastructure.logger import logger
+from odoo_xmlrpc_csv_importer.infrastructure.retry_policy import is_call_error
+
+
+async def _abatches(batches: Iterable[list]) -> AsyncIterator[list]:
+    """Async generator over the CSV chunker; reading and validating a batch runs on a
+    worker thread, so in-flight RPCs keep progressing meanwhile"""
+    iterator = iter(batches)
+    while (batch := await asyncio.to_thread(next, iterator, None)) is not None:
+        yield batch
+
+
+async def _existing_emails(
+    client: AsyncOdooClient, emails: set, persistent_cache, partner_index=None
+) -> set:
+    # The index refresh is skipped here: it would block the event loop
+    if partner_index is not None:
+        return set(partner_index.get_partner_ids(emails))
+
+    known = persistent_cache.get_partner_ids(emails) if persistent_cache is not None else {}
+    unknown = [email for email in emails if email not in known]
+
+    found = {}
+    if unknown:
+        results = await client.search_records(unknown)
+        found = {r["email"].lower(): r["id"] for r in results if r.get("email")}
+        if persistent_cache is not None:
+            persistent_cache.set_partner_ids(found)
+
+    return set(known) | set(found)
+
+
+async def _existing_records(client: AsyncOdooClient, emails: set, partner_index=None) -> dict:
+    if partner_index is not None:
+        emails = set(partner_index.get_partner_ids(emails))
+        if not emails:
+            return {}
+    results = await client.search_records(emails, fields=("email",) + UPDATE_FIELDS)
+    return {r["email"].lower(): r for r in results if r.get("email")}
+
+
+async def _write_partners(client: AsyncOdooClient, values: dict, partner_ids: list) -> bool:
+    return await client.write_contacts(partner_ids, values)
+
+
+async def _send_or_bisect(job: BatchJob, items: list, send) -> list[tuple[list, object]]:
+    """Async counterpart of `send_or_bisect`"""
+    try:
+        return [(items, await send(items))]
+    except Exception as e:
+        if is_call_error(e):
+            raise
+        logger.warning("bisecting_batch", rows=len(items), error=str(e))
+        try:
+            sent, rejected = await bisect_failures_async(
+                items, send, e, is_transient=is_call_error
+            )
+        except BisectionInterrupted as interrupted:
+            sent, rejected = interrupted_outcome(interrupted)
+        job.rejected.extend(rejected)
+        return sent
+
+
+async def process_batch_async(
+    batch: list,
+    client: AsyncOdooClient,
+    odoo_client,
+    csv_manager,
+    reference_cache,
+    import_stats: ImportStats,
+    persistent_cache=None,
+    write_method: str = "create",
+    partner_index=None,
+    journal=None,
+    on_conflict: str = "skip",
+) -> None:
+    """Async counterpart of `process_batch`; references must be prefetched"""
+    tracer = import_stats.tracer
+    # Batches interleave on the loop thread, so each one is traced on a track of its own
+    span = (
+        tracer.batch(getattr(batch, "number", 0), len(batch), own_track=True)
+        if tracer is not None
+        else nullcontext()
+    )
+    with span:
+        await _process_batch_async(
+            batch,
+            client,
+            odoo_client,
+            csv_manager,
+            reference_cache,
+            import_stats,
+            persistent_cache,
+            write_method,
+            partner_index,
+            journal,
+            on_conflict,
+        )
+
+
+async def _process_batch_async(
+    batch: list,
+    client: AsyncOdooClient,
+    odoo_client,
+    csv_manager,
+    reference_cache,
+    import_stats: ImportStats,
+    persistent_cache=None,
+    write_method: str = "create",
+    partner_index=None,
+    journal=None,
+    on_conflict: str = "skip",
+) -> None:
+    import_stats.worker_enter()
+    job = BatchJob(batch=batch, contacts=batch)
+    try:
+        # The range of a file without valid rows comes as an empty batch, only to be journaled
+        if not batch:
+            await asyncio.to_thread(finish_job, job, import_stats, journal, csv_manager)
+            return
+
+        if write_method == "load":
+            with import_stats.timed("load"):
+                sent = await _send_or_bisect(job, job.contacts, client.load_contacts)
+            job.contacts, loaded_ids = flatten_sent(sent)
+            record_partner_ids(job.contacts, loaded_ids, persistent_cache)
+            job.loaded = len(job.contacts)
+            await asyncio.to_thread(finish_job, job, import_stats, journal, csv_manager)
+            return
+
+        emails = {c["email"] for c in batch}
+        with import_stats.timed("search"):
+            if on_conflict == "update":
+                records = await _existing_records(client, emails, partner_index)
+                job.existing = [(c, records[c["email"]]) for c in batch if c["email"] in records]
+                existing = set(records)
+            else:
+                existing = await _existing_emails(client, emails, persistent_cache, partner_index)
+        job.contacts = [c for c in batch if c["email"] not in existing]
+        # Prefetched references resolve locally, without touching the network
+        with import_stats.timed("references"):
+            job.contacts = enrich_contacts(job.contacts, reference_cache, odoo_client, None)
+            job.existing = enrich_existing(job.existing, reference_cache, odoo_client, None)
+
+        if job.contacts:
+            with import_stats.timed("create"):
+                sent = await _send_or_bisect(job, job.contacts, client.create_contacts)
+            job.contacts, created_ids = flatten_sent(sent)
+            record_partner_ids(job.contacts, created_ids, persistent_cache, partner_index)
+
+        contacts_by_id = {record["id"]: contact for contact, record in job.existing}
+        for partner_ids, values in plan_writes(job.existing):
+            rejected = len(job.rejected)
+            with import_stats.timed("create"):
+                sent = await _send_or_bisect(
+                    job, partner_ids, partial(_write_partners, client, values)
+                )
+            job.rejected[rejected:] = [
+                (contacts_by_id[pid], e) for pid, e in job.rejected[rejected:]
+            ]
+            job.updated += sum(len(ids) for ids, _ in sent)
+            job.write_calls += len(sent)
+
+        # DLQ and journal fsyncs would stall every batch sharing the loop
+        await asyncio.to_thread(finish_job, job, import_stats, journal, csv_manager)
+
+    except Exception as e:
+        await asyncio.to_thread(fail_job, job, e, csv_manager, import_stats, journal)
+
+    finally:
+        import_stats.worker_exit()
+
+
+async def import_batches_async(
+    batches: Iterable[list],
+    *,
+    max_concurrency: int,
+    max_in_flight: int,
+    progress,
+    batch_task,
+    odoo_client,
+    csv_manager,
+    reference_cache,
+    import_stats: ImportStats,
+    persistent_cache=None,
+    write_method: str = "create",
+    partner_index=None,
+    journal=None,
+    on_conflict: str = "skip",
+) -> int:
+    """Drive every batch on one event loop, with RPC concurrency bounded by a semaphore"""
+    submitted = 0
+    tasks: set[asyncio.Task] = set()
+
+    def on_done(task: asyncio.Task) -> None:
+        progress.advance(batch_task)
+
+    async with AsyncOdooClient(
+        url=odoo_client.url,
+        db=odoo_client.db,
+        uid=odoo_client.uid,
+        password=odoo_client.password,
+        max_concurrency=max_concurrency,
+        protocol=odoo_client.protocol,
+        stats=odoo_client.connection_stats,
+        tracer=getattr(odoo_client, "tracer", None),
+    ) as client:
+        async for batch in _abatches(batches):
+            # Keep the read-ahead window bounded, like the threaded engine
+            while len(tasks) >= max_in_flight:
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    task.result()
+
+            if import_stats.tracer is not None:
+                import_stats.tracer.mark_queued(getattr(batch, "number", 0))
+            task = asyncio.create_task(
+                process_batch_async(
+                    batch,
+                    client,
+                    odoo_client,
+                    csv_manager,
+                    reference_cache,
+                    import_stats,
+                    persistent_cache,
+                    write_method,
+                    partner_index,
+                    journal,
+                    on_conflict,
+                )
+            )
+            task.add_done_callback(on_done)
+            tasks.add(task)
+            submitted += 1
+            progress.update(
+                batch_task,
+                description=f"[cyan]Lotes[/] — {submitted:,} lidos · {len(tasks):,} em andamento",
+            )
+
+        if submitted:
+            progress.update(batch_task, total=submitted, description="[cyan]Lotes processados[/]")
+        for task in asyncio.as_completed(tasks):
+            await task
+
+    return submitted
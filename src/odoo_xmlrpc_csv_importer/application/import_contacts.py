@@ -1,6 +1,9 @@
+import asyncio
 import time
-import xmlrpc.client
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from functools import partial
 from pathlib import Path
 
 from rich.console import Console
@@ -9,27 +12,139 @@ from odoo_xmlrpc_csv_importer.application.ui import (
     build_import_progress,
     print_summary_table,
 )
-from odoo_xmlrpc_csv_importer.core.chunker import chunker
+from odoo_xmlrpc_csv_importer.core.bisection import BisectionInterrupted, bisect_failures
+from odoo_xmlrpc_csv_importer.core.bounded_submitter import (
+    BoundedSubmitter,
+    estimate_batch_bytes,
+)
+from odoo_xmlrpc_csv_importer.core.pipeline import Pipeline, Stage
+from odoo_xmlrpc_csv_importer.domain.contact import CONTACT_FIELDS
+from odoo_xmlrpc_csv_importer.infrastructure.circuit_breaker import CircuitOpenError
 from odoo_xmlrpc_csv_importer.infrastructure.import_stats import ImportStats
 from odoo_xmlrpc_csv_importer.infrastructure.logger import logger
+from odoo_xmlrpc_csv_importer.infrastructure.retry_policy import (
+    is_call_error,
+    is_outage_error,
+)
+
+
+# The email is the match key, so an update never rewrites it
+UPDATE_FIELDS = tuple(name for name in CONTACT_FIELDS if name != "email")
+
+# Times a batch caught by an outage is rerun once the circuit closes, before the DLQ
+MAX_REQUEUES = 3
 
 
-def _search_existing_emails(emails: list | set, models, odoo_client) -> set:
-    results: list = odoo_client.search_records(models, emails)
-    return {r["email"].lower() for r in results if r.get("email")}
+def _search_existing_emails(
+    emails: list | set, models, odoo_client, persistent_cache=None, partner_index=None
+) -> set:
+    # A loaded partner index is complete, so a miss means the email is new
+    if partner_index is not None:
+        partner_index.maybe_refresh(models=models, odoo_client=odoo_client)
+        return set(partner_index.get_partner_ids(emails))
 
+    if persistent_cache is None:
+        results: list = odoo_client.search_records(models, emails)
+        return {r["email"].lower() for r in results if r.get("email")}
 
-def filter_contacts(batch: list, models, odoo_client) -> list:
+    # Emails already known from previous runs skip the remote search
+    known: dict = persistent_cache.get_partner_ids(emails)
+    unknown = [email for email in emails if email not in known]
+
+    found = {}
+    if unknown:
+        results = odoo_client.search_records(models, unknown)
+        found = {r["email"].lower(): r["id"] for r in results if r.get("email")}
+        persistent_cache.set_partner_ids(found)
+
+    return set(known) | set(found)
+
+
+def filter_contacts(
+    batch: list, models, odoo_client, persistent_cache=None, partner_index=None
+) -> list:
     """Filter contacts based on existing emails in Odoo"""
-    existing_emails: set = _search_existing_emails({c["email"] for c in batch}, models, odoo_client)
+    existing_emails: set = _search_existing_emails(
+        {c["email"] for c in batch}, models, odoo_client, persistent_cache, partner_index
+    )
     return [contact for contact in batch if contact["email"] not in existing_emails]
 
 
+def _search_existing_records(
+    emails: list | set, models, odoo_client, persistent_cache=None, partner_index=None
+) -> dict:
+    """email -> partner read with every updatable field, for `--on-conflict update`"""
+    # The index only narrows the search down: the current values still come from Odoo
+    if partner_index is not None:
+        partner_index.maybe_refresh(models=models, odoo_client=odoo_client)
+        emails = list(partner_index.get_partner_ids(emails))
+        if not emails:
+            return {}
+
+    results = odoo_client.search_records(models, emails, fields=("email",) + UPDATE_FIELDS)
+    records = {r["email"].lower(): r for r in results if r.get("email")}
+    if persistent_cache is not None:
+        persistent_cache.set_partner_ids({email: r["id"] for email, r in records.items()})
+    return records
+
+
+def match_contacts(
+    batch: list, models, odoo_client, persistent_cache=None, partner_index=None
+) -> tuple[list, list]:
+    """Split a batch into new contacts and (contact, existing partner) pairs"""
+    records = _search_existing_records(
+        {c["email"] for c in batch}, models, odoo_client, persistent_cache, partner_index
+    )
+    new, existing = [], []
+    for contact in batch:
+        record = records.get(contact["email"])
+        if record is None:
+            new.append(contact)
+        else:
+            existing.append((contact, record))
+    return new, existing
+
+
+def _comparable(value):
+    # Odoo reads many2one fields as [id, name] and empty fields as False
+    if isinstance(value, (list, tuple)):
+        return value[0] if value else None
+    return None if value is False or value == "" else value
+
+
+def changed_values(contact, record: dict) -> dict:
+    """Fields of an enriched contact that differ from the partner read from Odoo"""
+    changes = {}
+    for name in UPDATE_FIELDS:
+        value = _comparable(contact.get(name))
+        if value != _comparable(record.get(name)):
+            changes[name] = False if value is None else value
+    return changes
+
+
+def plan_writes(existing: list) -> list[tuple[list[int], dict]]:
+    """Group partners with identical changes, so each group costs one multi-id `write`"""
+    groups: dict[tuple, list[int]] = {}
+    for contact, record in existing:
+        changes = changed_values(contact, record)
+        if changes:
+            groups.setdefault(tuple(sorted(changes.items())), []).append(record["id"])
+    return [(partner_ids, dict(key)) for key, partner_ids in groups.items()]
+
+
+def enrich_existing(existing: list, reference_cache, odoo_client, models) -> list:
+    """Enrich the contacts of (contact, partner) pairs, so their ids compare with Odoo's"""
+    contacts = enrich_contacts([c for c, _ in existing], reference_cache, odoo_client, models)
+    return [(contact, record) for contact, (_, record) in zip(contacts, existing)]
+
+
 def enrich_contacts(contacts, reference_cache, odoo_client, models) -> list:
     """Sanitize data to get reference ids and filter records that already exists in db"""
     enriched_contacts = []
     
     for contact in contacts:
+        # Rows stay as read, so the DLQ gets country and state names, not ids
+        contact = contact.copy()
         contact["country_id"], contact["state_id"] = (
             reference_cache.get_contact_reference_ids(
                 state_name=contact["state_id"],
@@ -44,50 +159,508 @@ def enrich_contacts(contacts, reference_cache, odoo_client, models) -> list:
     return enriched_contacts
 
 
+@dataclass
+class BatchJob:
+    """A batch moving through the search → enrich → create steps"""
+
+    batch: list
+    contacts: list
+    started_at: float = field(default_factory=time.perf_counter)
+    # (contact, partner read from Odoo) pairs to update with `--on-conflict update`
+    existing: list = field(default_factory=list)
+    # Rows of the batch written to existing partners, or skipped as unchanged by a sync
+    updated: int = 0
+    unchanged: int = 0
+    write_calls: int = 0
+    # Rows upserted by `load`: Odoo does not tell which were created and which updated
+    loaded: int = 0
+    # (row, error) pairs isolated by bisection, bound for the DLQ one by one
+    rejected: list = field(default_factory=list)
+
+
+def send_or_bisect(job: BatchJob, items: list, send) -> list[tuple[list, object]]:
+    """Send items in one call; on a data error, bisect so only the bad rows are rejected.
+
+    Returns (chunk, result) pairs for the accepted chunks and adds the rejected
+    rows to `job.rejected`. Transient errors are raised as is: bisecting during
+    an outage would only multiply the failing calls.
+    """
+    try:
+        return [(items, send(items))]
+    except Exception as e:
+        if is_call_error(e):
+            raise
+        logger.warning("bisecting_batch", rows=len(items), error=str(e))
+        try:
+            sent, rejected = bisect_failures(items, send, e, is_transient=is_call_error)
+        except BisectionInterrupted as interrupted:
+            sent, rejected = interrupted_outcome(interrupted)
+        job.rejected.extend(rejected)
+        return sent
+
+
+def interrupted_outcome(interrupted: BisectionInterrupted) -> tuple[list, list]:
+    """Keep the chunks written before the outage; only the rest is rejected, for the DLQ"""
+    logger.warning(
+        "bisection_interrupted",
+        written=sum(len(chunk) for chunk, _ in interrupted.sent),
+        unsent=len(interrupted.unsent),
+        error=str(interrupted.error),
+    )
+    rejected = interrupted.failed + [(item, interrupted.error) for item in interrupted.unsent]
+    return interrupted.sent, rejected
+
+
+def flatten_sent(sent: list) -> tuple[list, list]:
+    """Flatten accepted chunks back into (items, ids), in matching order"""
+    items = [item for chunk, _ in sent for item in chunk]
+    ids = [pid for _, chunk_ids in sent for pid in chunk_ids]
+    return items, ids
+
+
+def search_step(
+    job: BatchJob,
+    models,
+    odoo_client,
+    persistent_cache=None,
+    partner_index=None,
+    on_conflict: str = "skip",
+) -> BatchJob:
+    # The range of a file without valid rows comes as an empty batch, only to be journaled
+    if not job.batch:
+        return job
+    if on_conflict == "update":
+        job.contacts, job.existing = match_contacts(
+            job.batch, models, odoo_client, persistent_cache, partner_index
+        )
+    else:
+        job.contacts = filter_contacts(
+            job.batch, models, odoo_client, persistent_cache, partner_index
+        )
+    return job
+
+
+def enrich_step(job: BatchJob, models, odoo_client, reference_cache) -> BatchJob:
+    job.contacts = enrich_contacts(job.contacts, reference_cache, odoo_client, models)
+    if job.existing:
+        job.existing = enrich_existing(job.existing, reference_cache, odoo_client, models)
+    return job
+
+
+def create_step(
+    job: BatchJob, models, odoo_client, persistent_cache=None, partner_index=None
+) -> BatchJob:
+    if job.contacts:
+        sent = send_or_bisect(job, job.contacts, partial(odoo_client.create_contacts, models))
+        job.contacts, created_ids = flatten_sent(sent)
+        record_partner_ids(job.contacts, created_ids, persistent_cache, partner_index)
+    if job.existing:
+        write_step(job, models, odoo_client)
+    return job
+
+
+def write_step(job: BatchJob, models, odoo_client) -> BatchJob:
+    """Update existing partners whose values changed; identical partners cost nothing"""
+    contacts_by_id = {record["id"]: contact for contact, record in job.existing}
+    for partner_ids, values in plan_writes(job.existing):
+        rejected = len(job.rejected)
+        sent = send_or_bisect(
+            job, partner_ids, lambda ids: odoo_client.write_contacts(models, ids, values)
+        )
+        # Bisection rejects partner ids; the DLQ needs their rows
+        job.rejected[rejected:] = [(contacts_by_id[pid], e) for pid, e in job.rejected[rejected:]]
+        job.updated += sum(len(ids) for ids, _ in sent)
+        job.write_calls += len(sent)
+    return job
+
+
+def record_partner_ids(contacts: list, partner_ids: list, *stores) -> None:
+    """Remember the ids of partners written by this run in every enabled store"""
+    mapping = {c["email"]: pid for c, pid in zip(contacts, partner_ids)}
+    for store in stores:
+        if store is not None:
+            store.set_partner_ids(mapping)
+
+
+def load_step(job: BatchJob, models, odoo_client, persistent_cache=None) -> BatchJob:
+    """Upsert the whole batch by external id; Odoo resolves country and state names itself"""
+    if job.contacts:
+        sent = send_or_bisect(job, job.contacts, partial(odoo_client.load_contacts, models))
+        job.contacts, loaded_ids = flatten_sent(sent)
+        record_partner_ids(job.contacts, loaded_ids, persistent_cache)
+        job.loaded = len(job.contacts)
+    return job
+
+
+def finish_job(
+    job: BatchJob, import_stats: ImportStats | None, journal=None, csv_manager=None
+) -> None:
+    skipped_odoo = (
+        len(job.batch) - len(job.contacts) - job.updated - job.unchanged - len(job.rejected)
+    )
+    created = len(job.contacts) - job.loaded
+
+    # Rows of this batch's range must be safe in the DLQ before it is journaled
+    must_sync = journal is not None and csv_manager is not None
+    if job.rejected or must_sync:
+        with _timed(import_stats, "dlq"):
+            # Rejected rows are enriched copies: the DLQ gets the rows as read
+            rows = {row["email"]: row for row in job.batch} if job.rejected else {}
+            for contact, error in job.rejected:
+                csv_manager.log_to_dlq([rows.get(contact["email"], contact)], str(error))
+            if must_sync:
+                csv_manager.sync_dlq()
+    if journal is not None:
+        journal.record(job.batch, "done")
+
+    if import_stats is not None:
+        import_stats.record_batch_success(
+            created=created,
+            skipped_odoo=skipped_odoo,
+            loaded=job.loaded,
+            updated=job.updated,
+            unchanged=job.unchanged,
+            write_calls=job.write_calls,
+            rejected=len(job.rejected),
+        )
+
+    logger.debug(
+        "batch_processed",
+        created=created,
+        loaded=job.loaded,
+        updated=job.updated,
+        unchanged=job.unchanged,
+        rejected=len(job.rejected),
+        ingored=skipped_odoo,
+        seconds=round(time.perf_counter() - job.started_at, 2),
+    )
+
+
+def fail_job(
+    job: BatchJob,
+    error: Exception,
+    csv_manager,
+    import_stats: ImportStats | None,
+    journal=None,
+) -> None:
+    logger.error(error)
+    with _timed(import_stats, "dlq"):
+        csv_manager.log_to_dlq(job.batch, str(error))
+        # Journaled only once the rows are safe in the DLQ
+        if journal is not None:
+            csv_manager.sync_dlq()
+    if journal is not None:
+        journal.record(job.batch, "failed")
+    if import_stats is not None:
+        import_stats.record_batch_failure(len(job.batch))
+
+
+def _timed(import_stats: ImportStats | None, stage: str):
+    return import_stats.timed(stage) if import_stats is not None else nullcontext()
+
+
+def _tracer(import_stats: ImportStats | None):
+    return import_stats.tracer if import_stats is not None else None
+
+
+def _traced_batch(import_stats: ImportStats | None, batch: list):
+    """Span of the whole batch when tracing, tagging the spans recorded inside it"""
+    tracer = _tracer(import_stats)
+    if tracer is None:
+        return nullcontext()
+    return tracer.batch(getattr(batch, "number", 0), len(batch))
+
+
+def _tagged(import_stats: ImportStats | None, batch: list):
+    tracer = _tracer(import_stats)
+    if tracer is None:
+        return nullcontext()
+    return tracer.tagged(getattr(batch, "number", 0))
+
+
+def _tracked(controller, kind: str, contacts: list, with_payload: bool = False):
+    """Report the latency of one step to the adaptive controller, when enabled"""
+    if controller is None:
+        return nullcontext()
+    payload_bytes = estimate_batch_bytes(contacts) if with_payload else 0
+    return controller.track(kind, len(contacts), payload_bytes)
+
+
+def _held_by_breaker(breaker, trips_at_start: int, error: Exception) -> bool:
+    if breaker is None or isinstance(error, CircuitOpenError):
+        return False
+    return is_outage_error(error) and (breaker.trips != trips_at_start or breaker.is_open)
+
+
+def run_requeuing(attempt, breaker, import_stats: ImportStats | None, rows: int):
+    """Return `attempt()`, rerunning it after the pause when an outage tripped the breaker.
+
+    Batches caught by the outage wait with every other worker for the probe
+    instead of going to the DLQ; the rerun starts over from the search, which
+    skips whatever a half-finished attempt already wrote.
+    """
+    for requeues in range(MAX_REQUEUES + 1):
+        trips_at_start = breaker.trips if breaker is not None else 0
+        try:
+            return attempt()
+        except Exception as e:
+            if requeues == MAX_REQUEUES or not _held_by_breaker(breaker, trips_at_start, e):
+                raise
+            logger.warning("lote_reenfileirado", rows=rows, error=str(e))
+            if import_stats is not None:
+                import_stats.record_batch_requeued()
+            breaker.wait_closed()
+
+
 def process_batch(
     batch: list,
     odoo_client,
     csv_manager,
     reference_cache,
     import_stats: ImportStats | None,
+    persistent_cache=None,
+    write_method: str = "create",
+    partner_index=None,
+    journal=None,
+    on_conflict: str = "skip",
+    controller=None,
 ) -> None:
     """Process batch of contacts and orquestrates deduplication, cache and load in Odoo"""
     if import_stats is not None:
         import_stats.worker_enter()
-    try:
-        start_time = time.time()
 
-        # Each thread creates its own models proxy
-        models = xmlrpc.client.ServerProxy(f"{odoo_client.url}/xmlrpc/2/object")
-        
-        filtered_contacts = filter_contacts(batch, models, odoo_client)
-        enriched_contacts = enrich_contacts(filtered_contacts, reference_cache, odoo_client, models)
+    def attempt() -> BatchJob:
+        job = BatchJob(batch=batch, contacts=batch)
+        # Each batch borrows a keep-alive connection from the client pool
+        with odoo_client.models() as models:
+            if write_method == "load":
+                with (
+                    _timed(import_stats, "load"),
+                    _tracked(controller, "load", job.contacts, with_payload=True),
+                ):
+                    load_step(job, models, odoo_client, persistent_cache)
+            else:
+                with _timed(import_stats, "search"), _tracked(controller, "search", job.batch):
+                    search_step(
+                        job, models, odoo_client, persistent_cache, partner_index, on_conflict
+                    )
+                with _timed(import_stats, "references"):
+                    enrich_step(job, models, odoo_client, reference_cache)
+                with (
+                    _timed(import_stats, "create"),
+                    _tracked(controller, "create", job.contacts, with_payload=True),
+                ):
+                    create_step(job, models, odoo_client, persistent_cache, partner_index)
+        return job
 
-        if enriched_contacts:
-            odoo_client.create_contacts(models, enriched_contacts)
+    try:
+        with _traced_batch(import_stats, batch):
+            try:
+                job = run_requeuing(
+                    attempt, getattr(odoo_client, "breaker", None), import_stats, len(batch)
+                )
+                finish_job(job, import_stats, journal, csv_manager)
+
+            except Exception as e:
+                fail_job(
+                    BatchJob(batch=batch, contacts=batch), e, csv_manager, import_stats, journal
+                )
 
-        skipped_odoo = len(batch) - len(enriched_contacts)
-        
+    finally:
         if import_stats is not None:
-            import_stats.record_batch_success(
-                created=len(enriched_contacts),
-                skipped_odoo=skipped_odoo,
+            import_stats.worker_exit()
+
+
+def _run_stage(step, stage: str, odoo_client, import_stats: ImportStats, *args):
+    """Wrap a batch step as a pipeline stage with its own pooled connection"""
+
+    def run(job: BatchJob) -> BatchJob:
+        import_stats.worker_enter()
+        try:
+            with (
+                _tagged(import_stats, job.batch),
+                odoo_client.models() as models,
+                import_stats.timed(stage),
+            ):
+                return step(job, models, odoo_client, *args)
+        finally:
+            import_stats.worker_exit()
+
+    return run
+
+
+def _release_done(pending: set, progress, batch_task) -> set:
+    """Drop finished futures right away, so their batches can be collected"""
+    still_pending = set()
+    for fut in pending:
+        if fut.done():
+            fut.result()
+            progress.advance(batch_task)
+        else:
+            still_pending.add(fut)
+    return still_pending
+
+
+def run_threaded(
+    batches,
+    process,
+    *,
+    max_workers: int,
+    max_in_flight: int,
+    max_in_flight_bytes: int | None,
+    progress,
+    batch_task,
+    controller=None,
+    tracer=None,
+) -> int:
+    """Run `process(batch)` for every batch on a ThreadPoolExecutor worker.
+
+    With an adaptive controller, `max_workers` is the ceiling and the in-flight
+    window follows the controller's concurrency instead of `max_in_flight`.
+    """
+    submitted = 0
+    pending: set = set()
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        submitter = BoundedSubmitter(
+            executor,
+            max_in_flight=max_in_flight,
+            max_bytes=max_in_flight_bytes,
+        )
+        if controller is not None:
+            controller.subscribe(submitter.set_limit)
+        for batch in batches:
+            if tracer is not None:
+                tracer.mark_queued(getattr(batch, "number", 0))
+            # Blocks the reader while the window of queued batches is full
+            pending.add(
+                submitter.submit(
+                    process,
+                    batch,
+                    weight=estimate_batch_bytes(batch) if max_in_flight_bytes else 0,
+                )
             )
+            submitted += 1
+            pending = _release_done(pending, progress, batch_task)
+            progress.update(
+                batch_task,
+                description=f"[cyan]Lotes[/] — {submitted:,} lidos · {len(pending):,} em andamento",
+            )
+
+        if submitted:
+            progress.update(batch_task, total=submitted, description="[cyan]Lotes processados[/]")
+        for fut in as_completed(pending):
+            fut.result()
+            progress.advance(batch_task)
 
-        logger.debug(
-            "batch_processed",
-            created=len(enriched_contacts),
-            ingored=skipped_odoo,
-            seconds=round(time.time() - start_time, 2),
+    return submitted
+
+
+def build_pipeline(
+    *,
+    stage_workers: tuple[int, int, int],
+    queue_size: int,
+    odoo_client,
+    reference_cache,
+    import_stats: ImportStats,
+    persistent_cache=None,
+    write_method: str = "create",
+    partner_index=None,
+    on_conflict: str = "skip",
+) -> Pipeline:
+    """Search, enrich and create stages, each with its own concurrency limit"""
+    search_workers, enrich_workers, create_workers = stage_workers
+    if write_method == "load":
+        # `load` needs neither the search nor the enrich round-trips
+        return Pipeline(
+            [
+                Stage(
+                    "carga",
+                    _run_stage(load_step, "load", odoo_client, import_stats, persistent_cache),
+                    create_workers,
+                    queue_size,
+                ),
+            ]
         )
+    return Pipeline(
+        [
+            Stage(
+                "busca",
+                _run_stage(
+                    search_step,
+                    "search",
+                    odoo_client,
+                    import_stats,
+                    persistent_cache,
+                    partner_index,
+                    on_conflict,
+                ),
+                search_workers,
+                queue_size,
+            ),
+            Stage(
+                "enriquecimento",
+                _run_stage(enrich_step, "references", odoo_client, import_stats, reference_cache),
+                enrich_workers,
+                queue_size,
+            ),
+            Stage(
+                "criação",
+                _run_stage(
+                    create_step,
+                    "create",
+                    odoo_client,
+                    import_stats,
+                    persistent_cache,
+                    partner_index,
+                ),
+                create_workers,
+                queue_size,
+            ),
+        ]
+    )
 
-    except Exception as e:
-        logger.error(e)
-        csv_manager.log_to_dlq(batch, str(e))
-        import_stats.record_batch_failure(len(batch))
 
+def _import_pipelined(
+    batches,
+    *,
+    pipeline: Pipeline,
+    progress,
+    batch_task,
+    csv_manager,
+    import_stats: ImportStats,
+    journal=None,
+) -> int:
+    """Overlap search, enrich and create of different batches through bounded queues"""
+
+    def on_done(job: BatchJob) -> None:
+        with _tagged(import_stats, job.batch):
+            finish_job(job, import_stats, journal, csv_manager)
+        progress.advance(batch_task)
+
+    def on_error(job: BatchJob, stage_name: str, error: Exception) -> None:
+        with _tagged(import_stats, job.batch):
+            fail_job(job, error, csv_manager, import_stats, journal)
+        progress.advance(batch_task)
+
+    pipeline.on_done = on_done
+    pipeline.on_error = on_error
+    pipeline.start()
+
+    submitted = 0
+    try:
+        for batch in batches:
+            # Blocks the reader while the search queue is full
+            pipeline.put(BatchJob(batch=batch, contacts=batch))
+            submitted += 1
+            progress.update(batch_task, description=f"[cyan]Lotes[/] — {submitted:,} lidos")
+
+        if submitted:
+            progress.update(batch_task, total=submitted, description="[cyan]Lotes processados[/]")
     finally:
-        import_stats.worker_exit()
+        pipeline.close()
+
+    return submitted
 
 
 def import_contacts(
@@ -100,57 +673,142 @@ def import_contacts(
     reference_cache,
     import_stats: ImportStats,
     console: Console,
+    prefetch_references: bool = True,
+    persistent_cache=None,
+    max_in_flight: int | None = None,
+    max_in_flight_bytes: int | None = None,
+    engine: str = "threads",
+    stage_workers: tuple[int, int, int] | None = None,
+    write_method: str = "create",
+    partner_index=None,
+    journal=None,
+    resume_point=None,
+    on_conflict: str = "skip",
+    controller=None,
 ) -> None:
+    if controller is not None and engine != "threads":
+        raise ValueError("O modo adaptativo (--adaptive) requer o engine threads.")
     wall_start = time.perf_counter()
 
+    # The asyncio engine resolves references locally only, so it always prefetches;
+    # `load` leaves the name resolution to the server
+    if write_method != "load" and (prefetch_references or engine == "asyncio"):
+        with odoo_client.models() as models:
+            reference_cache.prefetch(models=models, odoo_client=odoo_client)
+
+    # `load` upserts by external id and never checks existence
+    if write_method == "load":
+        partner_index = None
+    if partner_index is not None and not partner_index.loaded:
+        with odoo_client.models() as models:
+            partner_index.load(models=models, odoo_client=odoo_client)
+
     logger.info("lendo_arquivo", path=str(file_name))
+    if resume_point is not None:
+        logger.info(
+            "retomando",
+            offset=resume_point.offset,
+            lotes_concluidos=resume_point.batches_done,
+            intervalos_pulados=len(resume_point.completed),
+        )
 
-    contacts_stream = csv_manager.stream_csv_contacts()
+    pipeline = None
+    if engine == "pipeline":
+        pipeline = build_pipeline(
+            stage_workers=stage_workers or (max_workers, max_workers, max_workers),
+            queue_size=max_in_flight or max_workers,
+            odoo_client=odoo_client,
+            reference_cache=reference_cache,
+            import_stats=import_stats,
+            persistent_cache=persistent_cache,
+            write_method=write_method,
+            partner_index=partner_index,
+            on_conflict=on_conflict,
+        )
 
     started_at = time.monotonic()
-    progress = build_import_progress(import_stats, started_at)
+    progress = build_import_progress(
+        import_stats, started_at, pipeline=pipeline, controller=controller
+    )
 
     with progress:
         batch_task = progress.add_task("[cyan]Lotes[/] — enfileirando…", total=None)
-        futures = []
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            for batch in chunker(contacts_stream, batch_size):
-                futures.append(
-                    executor.submit(
-                        process_batch,
-                        batch,
-                        odoo_client,
-                        csv_manager,
-                        reference_cache,
-                        import_stats,
-                    )
-                )
-                progress.update(
-                    batch_task,
-                    description=f"[cyan]Lotes[/] — {len(futures):,} na fila",
-                )
+        batches = csv_manager.stream_batches(
+            controller.current_batch_size if controller is not None else batch_size,
+            resume_point,
+        )
 
-            total = len(futures)
-            if total == 0:
-                progress.update(
-                    batch_task,
-                    total=1,
-                    completed=1,
-                    description="[yellow]Nenhum lote (CSV vazio ou só inválidos)[/]",
-                )
-            else:
-                progress.update(
-                    batch_task,
-                    total=total,
-                    completed=0,
-                    description="[cyan]Lotes processados[/]",
+        if engine == "asyncio":
+            from odoo_xmlrpc_csv_importer.application.async_engine import (
+                import_batches_async,
+            )
+
+            submitted = asyncio.run(
+                import_batches_async(
+                    batches,
+                    max_concurrency=max_workers,
+                    max_in_flight=max_in_flight or 2 * max_workers,
+                    progress=progress,
+                    batch_task=batch_task,
+                    odoo_client=odoo_client,
+                    csv_manager=csv_manager,
+                    reference_cache=reference_cache,
+                    import_stats=import_stats,
+                    persistent_cache=persistent_cache,
+                    write_method=write_method,
+                    partner_index=partner_index,
+                    journal=journal,
+                    on_conflict=on_conflict,
                 )
-                for fut in as_completed(futures):
-                    fut.result()
-                    progress.advance(batch_task)
+            )
+        elif engine == "pipeline":
+            submitted = _import_pipelined(
+                batches,
+                pipeline=pipeline,
+                progress=progress,
+                batch_task=batch_task,
+                csv_manager=csv_manager,
+                import_stats=import_stats,
+                journal=journal,
+            )
+        else:
+            submitted = run_threaded(
+                batches,
+                partial(
+                    process_batch,
+                    odoo_client=odoo_client,
+                    csv_manager=csv_manager,
+                    reference_cache=reference_cache,
+                    import_stats=import_stats,
+                    persistent_cache=persistent_cache,
+                    write_method=write_method,
+                    partner_index=partner_index,
+                    journal=journal,
+                    on_conflict=on_conflict,
+                    controller=controller,
+                ),
+                max_workers=max_workers,
+                max_in_flight=max_in_flight or 2 * max_workers,
+                max_in_flight_bytes=max_in_flight_bytes,
+                progress=progress,
+                batch_task=batch_task,
+                controller=controller,
+                tracer=import_stats.tracer,
+            )
+
+        if submitted == 0:
+            progress.update(
+                batch_task,
+                total=1,
+                completed=1,
+                description="[yellow]Nenhum lote (CSV vazio)[/]",
+            )
 
+    # Rows still buffered by the DLQ writer are on disk before the summary
+    csv_manager.close_dlq()
+    breaker = getattr(odoo_client, "breaker", None)
     wall_seconds = time.perf_counter() - wall_start
-    logger.info("success", segundos=round(wall_seconds, 2))
+    logger.info("success", segundos=round(wall_seconds, 2), dedup=csv_manager.dedup_stats)
     print_summary_table(
         console,
         import_stats,
@@ -158,4 +816,9 @@ def import_contacts(
         file_name=file_name,
         batch_size=batch_size,
         max_workers=max_workers,
+        reference_stats=reference_cache.stats(),
+        connection_stats=odoo_client.connection_stats.snapshot(),
+        dedup_stats=csv_manager.dedup_stats,
+        adaptive_stats=controller.snapshot() if controller is not None else None,
+        breaker_stats=breaker.snapshot() if breaker is not None else None,
     )
@@ -0,0 +1,19 @@
+import os
+import time
+from pathlib import Path
+
+from odoo_xmlrpc_csv_importer.domain.contact import is_validation_error
+from odoo_xmlrpc_csv_importer.infrastructure.dlq_writer import ERROR_COLUMN
+
+
+def set_aside_dlq(dlq_file: Path) -> Path:
+    """Rename the DLQ before replaying it, so rows that fail again start a fresh one"""
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    replay_file = dlq_file.with_name(f"{dlq_file.stem}.replay-{stamp}{dlq_file.suffix}")
+    os.replace(dlq_file, replay_file)
+    return replay_file
+
+
+def is_replayable(row) -> bool:
+    """Row filter skipping DLQ rows that failed validation: resending cannot fix them"""
+    return not is_validation_error(row.get(ERROR_COLUMN) or "")
@@ -0,0 +1,229 @@
+import time
+from contextlib import nullcontext
+from functools import partial
+from pathlib import Path
+
+from rich.console import Console
+
+from odoo_xmlrpc_csv_importer.application.import_contacts import (
+    UPDATE_FIELDS,
+    BatchJob,
+    enrich_contacts,
+    fail_job,
+    finish_job,
+    flatten_sent,
+    run_requeuing,
+    run_threaded,
+    send_or_bisect,
+    write_step,
+)
+from odoo_xmlrpc_csv_importer.application.ui import (
+    build_import_progress,
+    print_summary_table,
+)
+from odoo_xmlrpc_csv_importer.domain.contact import contact_content_hash
+from odoo_xmlrpc_csv_importer.infrastructure.import_stats import ImportStats
+from odoo_xmlrpc_csv_importer.infrastructure.logger import logger
+
+
+def classify_batch(batch: list, state_store) -> tuple[list, list, int]:
+    """Split a batch into new and changed contacts by comparing content hashes with the state store.
+
+    Returns (new, changed, unchanged_count); new items are (contact, hash) and
+    changed items are (contact, hash, partner_id).
+    """
+    known = state_store.get({c["email"] for c in batch})
+    new, changed, unchanged = [], [], 0
+
+    for contact in batch:
+        # Hashed before enrichment replaces country and state names with ids
+        content_hash = contact_content_hash(contact)
+        entry = known.get(contact["email"])
+        if entry is None:
+            new.append((contact, content_hash))
+        elif entry[0] == content_hash:
+            unchanged += 1
+        else:
+            changed.append((contact, content_hash, entry[1]))
+
+    return new, changed, unchanged
+
+
+def sync_batch(
+    batch: list,
+    *,
+    odoo_client,
+    csv_manager,
+    reference_cache,
+    import_stats: ImportStats,
+    state_store,
+) -> None:
+    """Create new contacts, write changed ones and skip unchanged ones without any RPC"""
+    import_stats.worker_enter()
+
+    def attempt() -> BatchJob:
+        job = BatchJob(batch=batch, contacts=[])
+        new, changed, job.unchanged = classify_batch(batch, state_store)
+        synced: dict[str, tuple[str, int]] = {}
+
+        if new or changed:
+            with odoo_client.models() as models:
+                # Partners created outside of sync are adopted as the baseline and get
+                # only the fields that differ from the row, like changed ones
+                hashes = {c["email"]: h for c, h in new}
+                adopted = {}
+                if new:
+                    with import_stats.timed("search"):
+                        results = odoo_client.search_records(
+                            models, list(hashes), ("email",) + UPDATE_FIELDS
+                        )
+                    adopted = {
+                        r["email"].lower(): r
+                        for r in results
+                        if r.get("email") and r["email"].lower() in hashes
+                    }
+
+                to_create = [c for c, _ in new if c["email"] not in adopted]
+                to_adopt = [c for c, _ in new if c["email"] in adopted]
+                with import_stats.timed("references"):
+                    contacts = enrich_contacts(
+                        to_create + to_adopt + [c for c, _, _ in changed],
+                        reference_cache,
+                        odoo_client,
+                        models,
+                    )
+                job.contacts = contacts[: len(to_create)]
+                adopted_contacts = contacts[len(to_create) : len(to_create) + len(to_adopt)]
+                updates = contacts[len(to_create) + len(to_adopt) :]
+
+                if job.contacts:
+                    with import_stats.timed("create"):
+                        sent = send_or_bisect(
+                            job, job.contacts, partial(odoo_client.create_contacts, models)
+                        )
+                    job.contacts, created_ids = flatten_sent(sent)
+                    synced.update(
+                        (c["email"], (hashes[c["email"]], pid))
+                        for c, pid in zip(job.contacts, created_ids)
+                    )
+
+                job.existing = [(c, adopted[c["email"]]) for c in adopted_contacts]
+                if changed:
+                    with import_stats.timed("search"):
+                        results = odoo_client.search_records(
+                            models, [c["email"] for c, _, _ in changed], ("email",) + UPDATE_FIELDS
+                        )
+                    records = {r["id"]: r for r in results}
+                    # A partner the search misses gets every field written
+                    job.existing += [
+                        (contact, records.get(partner_id, {"id": partner_id}))
+                        for contact, (_, _, partner_id) in zip(updates, changed)
+                    ]
+
+                if job.existing:
+                    # Only the fields that differ are written, so identical corrections share a write
+                    with import_stats.timed("create"):
+                        write_step(job, models, odoo_client)
+
+                    rejected = {c["email"] for c, _ in job.rejected}
+                    synced.update(
+                        (c["email"], (hashes[c["email"]], adopted[c["email"]]["id"]))
+                        for c in adopted_contacts
+                        if c["email"] not in rejected
+                    )
+                    synced.update(
+                        (contact["email"], (content_hash, partner_id))
+                        for contact, (_, content_hash, partner_id) in zip(updates, changed)
+                        if contact["email"] not in rejected
+                    )
+
+        if synced:
+            state_store.set(synced)
+        return job
+
+    tracer = import_stats.tracer
+    span = tracer.batch(getattr(batch, "number", 0), len(batch)) if tracer else nullcontext()
+    try:
+        with span:
+            try:
+                # A rerun after an outage adopts the partners a half-finished attempt created
+                job = run_requeuing(
+                    attempt, getattr(odoo_client, "breaker", None), import_stats, len(batch)
+                )
+                finish_job(job, import_stats, csv_manager=csv_manager)
+
+            except Exception as e:
+                fail_job(BatchJob(batch=batch, contacts=[]), e, csv_manager, import_stats)
+
+    finally:
+        import_stats.worker_exit()
+
+
+def sync_contacts(
+    *,
+    file_name: Path,
+    max_workers: int,
+    batch_size: int,
+    odoo_client,
+    csv_manager,
+    reference_cache,
+    import_stats: ImportStats,
+    console: Console,
+    state_store,
+    max_in_flight: int | None = None,
+) -> None:
+    wall_start = time.perf_counter()
+
+    with odoo_client.models() as models:
+        reference_cache.prefetch(models=models, odoo_client=odoo_client)
+
+    logger.info("sincronizando_arquivo", path=str(file_name), estado=state_store.path)
+
+    started_at = time.monotonic()
+    progress = build_import_progress(import_stats, started_at)
+
+    with progress:
+        batch_task = progress.add_task("[cyan]Lotes[/] — enfileirando…", total=None)
+        submitted = run_threaded(
+            csv_manager.stream_batches(batch_size),
+            partial(
+                sync_batch,
+                odoo_client=odoo_client,
+                csv_manager=csv_manager,
+                reference_cache=reference_cache,
+                import_stats=import_stats,
+                state_store=state_store,
+            ),
+            max_workers=max_workers,
+            max_in_flight=max_in_flight or 2 * max_workers,
+            max_in_flight_bytes=None,
+            progress=progress,
+            batch_task=batch_task,
+            tracer=import_stats.tracer,
+        )
+
+        if submitted == 0:
+            progress.update(
+                batch_task,
+                total=1,
+                completed=1,
+                description="[yellow]Nenhum lote (CSV vazio)[/]",
+            )
+
+    # Rows still buffered by the DLQ writer are on disk before the summary
+    csv_manager.close_dlq()
+    breaker = getattr(odoo_client, "breaker", None)
+    wall_seconds = time.perf_counter() - wall_start
+    logger.info("success", segundos=round(wall_seconds, 2), dedup=csv_manager.dedup_stats)
+    print_summary_table(
+        console,
+        import_stats,
+        wall_seconds=wall_seconds,
+        file_name=file_name,
+        batch_size=batch_size,
+        max_workers=max_workers,
+        reference_stats=reference_cache.stats(),
+        connection_stats=odoo_client.connection_stats.snapshot(),
+        dedup_stats=csv_manager.dedup_stats,
+        breaker_stats=breaker.snapshot() if breaker is not None else None,
+    )
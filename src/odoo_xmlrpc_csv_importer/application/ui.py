@@ -32,12 +32,12 @@ class _StatsColumn(ProgressColumn):
     def render(self, task) -> Text:
         s = self.stats.snapshot()
         elapsed = max(time.monotonic() - self.started_at, 1e-6)
-        rate = s["contacts_created"] / elapsed
+        rate = (s["contacts_created"] + s["contacts_loaded"]) / elapsed
         workers = s["active_workers"]
         mx = s["max_workers"]
         return Text.from_markup(
             f"[dim]workers[/] [cyan]{workers}[/]/[cyan]{mx}[/]  "
-            f"[dim]criados/s[/] [green]{rate:,.1f}[/]"
+            f"[dim]gravados/s[/] [green]{rate:,.1f}[/]"
         )
 
 
@@ -58,8 +58,39 @@ class _ErrorsColumn(ProgressColumn):
         )
 
 
-def build_import_progress(stats: ImportStats, started_at: float) -> Progress:
-    return Progress(
+class _PipelineColumn(ProgressColumn):
+    """Profundidade das filas de cada estágio do pipeline."""
+
+    def __init__(self, pipeline) -> None:
+        self.pipeline = pipeline
+        super().__init__()
+
+    def render(self, task) -> Text:
+        depths = self.pipeline.depths()
+        return Text.from_markup(
+            "  ".join(f"[dim]{name}[/] [magenta]{depth}[/]" for name, depth in depths.items())
+        )
+
+
+class _AdaptiveColumn(ProgressColumn):
+    """Concorrência e tamanho de lote escolhidos pelo controle adaptativo."""
+
+    def __init__(self, controller) -> None:
+        self.controller = controller
+        super().__init__()
+
+    def render(self, task) -> Text:
+        s = self.controller.snapshot()
+        return Text.from_markup(
+            f"[dim]adaptativo[/] [yellow]{s['concurrency']}[/]/[yellow]{s['max_concurrency']}[/]"
+            f" [dim]em voo · lote[/] [yellow]{s['batch_size']:,}[/]"
+        )
+
+
+def build_import_progress(
+    stats: ImportStats, started_at: float, pipeline=None, controller=None
+) -> Progress:
+    columns = [
         SpinnerColumn(),
         TextColumn("[bold blue]{task.description}"),
         BarColumn(bar_width=None),
@@ -68,8 +99,24 @@ def build_import_progress(stats: ImportStats, started_at: float) -> Progress:
         TimeRemainingColumn(),
         _StatsColumn(stats, started_at),
         _ErrorsColumn(stats),
-        expand=True,
-    )
+    ]
+    if pipeline is not None:
+        columns.append(_PipelineColumn(pipeline))
+    if controller is not None:
+        columns.append(_AdaptiveColumn(controller))
+    return Progress(*columns, expand=True)
+
+
+# Stages in the order a row goes through them
+STAGE_ORDER = ("csv_read", "validation", "search", "references", "create", "load", "dlq", "dlq_write")
+
+
+def _stage_order(stage: str) -> int:
+    return STAGE_ORDER.index(stage) if stage in STAGE_ORDER else len(STAGE_ORDER)
+
+
+def _format_seconds(seconds: float) -> str:
+    return f"{seconds * 1000:,.1f} ms" if seconds < 1 else f"{seconds:,.2f} s"
 
 
 def print_summary_table(
@@ -80,14 +127,20 @@ def print_summary_table(
     file_name: Path,
     batch_size: int,
     max_workers: int,
+    reference_stats: dict[str, int] | None = None,
+    connection_stats: dict[str, int] | None = None,
+    dedup_stats: dict[str, int] | None = None,
+    adaptive_stats: dict | None = None,
+    breaker_stats: dict[str, int] | None = None,
 ) -> None:
     s = stats.snapshot()
     processed_hint = (
         s["contacts_created"]
+        + s["contacts_loaded"]
         + s["contacts_skipped_odoo"]
         + s["contacts_in_failed_batches"]
     )
-    rate = s["contacts_created"] / wall_seconds if wall_seconds > 0 else 0.0
+    rate = (s["contacts_created"] + s["contacts_loaded"]) / wall_seconds if wall_seconds > 0 else 0.0
 
     table = Table(title="Importação concluída", show_header=False, box=None)
     table.add_column(style="dim", width=28)
@@ -98,16 +151,78 @@ def print_summary_table(
     table.add_row("Threads", str(max_workers))
     table.add_row("Tamanho do lote", str(batch_size))
     table.add_row("Contatos criados", f"[green]{s['contacts_created']:,}[/]")
+    if s["contacts_loaded"]:
+        # `load` upserts by external id and does not say which rows already existed
+        table.add_row(
+            "Carregados via load (upsert)",
+            f"[green]{s['contacts_loaded']:,}[/] [dim](criados ou atualizados)[/]",
+        )
+    if s["contacts_updated"]:
+        table.add_row(
+            "Contatos atualizados",
+            f"[green]{s['contacts_updated']:,}[/] · {s['write_calls']:,} chamadas write",
+        )
+    if s["contacts_unchanged"]:
+        table.add_row("Inalterados (estado local)", f"{s['contacts_unchanged']:,}")
     table.add_row("Ignorados (Odoo)", f"{s['contacts_skipped_odoo']:,}")
     table.add_row("Erros validação → DLQ", f"[red]{s['validation_errors']:,}[/]")
     table.add_row("Falhas de lote → DLQ", f"[red]{s['batch_errors']:,}[/]")
+    if s["contacts_rejected"]:
+        table.add_row("Linhas isoladas (bisseção) → DLQ", f"[red]{s['contacts_rejected']:,}[/]")
     if s["contacts_in_failed_batches"]:
         table.add_row(
             "Contatos em lotes falhos",
             f"[red]{s['contacts_in_failed_batches']:,}[/]",
         )
+    if reference_stats:
+        table.add_row(
+            "Cache referências",
+            f"{reference_stats['hits']:,} hits · {reference_stats['misses']:,} misses · "
+            f"{reference_stats['coalesced']:,} agrupados",
+        )
+    if connection_stats:
+        table.add_row(
+            "Conexões HTTP",
+            f"{connection_stats['connections_opened']:,} abertas · "
+            f"{connection_stats['connections_reused']:,} reutilizadas",
+        )
+        table.add_row(
+            "Tráfego RPC",
+            f"{connection_stats['bytes_sent'] / 1e6:,.1f} MB enviados · "
+            f"{connection_stats['bytes_received'] / 1e6:,.1f} MB recebidos",
+        )
+    stages = stats.stage_histograms()
+    for stage in sorted(stages, key=_stage_order):
+        histogram = stages[stage]
+        table.add_row(
+            f"Latência {stage}",
+            " · ".join(
+                f"p{round(q * 100)} {_format_seconds(histogram.quantile(q))}"
+                for q in (0.50, 0.95, 0.99)
+            )
+            + f" [dim]({histogram.count:,}×)[/]",
+        )
+    if dedup_stats:
+        dedup_text = (
+            f"{dedup_stats['emails']:,} e-mails · {dedup_stats['duplicates']:,} duplicados"
+        )
+        if "false_positives" in dedup_stats:
+            dedup_text += f" · {dedup_stats['false_positives']:,} falsos positivos do Bloom"
+        table.add_row("Deduplicação", dedup_text)
+    if adaptive_stats:
+        table.add_row(
+            "Controle adaptativo",
+            f"{adaptive_stats['concurrency']} em voo · lote {adaptive_stats['batch_size']:,} · "
+            f"{adaptive_stats['increases']:,} aumentos · {adaptive_stats['decreases']:,} reduções",
+        )
+    if breaker_stats and breaker_stats["trips"]:
+        table.add_row(
+            "Circuit breaker",
+            f"[yellow]{breaker_stats['trips']:,} pausas[/] · {breaker_stats['probes']:,} sondagens · "
+            f"{s['batches_requeued']:,} lotes reenfileirados",
+        )
     table.add_row("Tempo total", f"{wall_seconds:.1f} s")
-    table.add_row("Taxa (criados)", f"{rate:,.1f} contatos/s")
+    table.add_row("Taxa (gravados)", f"{rate:,.1f} contatos/s")
     if processed_hint:
         table.add_row(
             "[dim]Volume tratado (aprox.)[/]",
@@ -0,0 +1,161 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable
+
+
+class AdaptiveController:
+    """AIMD control of in-flight batches and batch size, driven by observed RPC latency.
+
+    Each RPC kind ("search", "create", ...) keeps a smoothed latency per row; the
+    lowest value seen, drifting up slowly, is its no-load baseline. Observations
+    and transient errors are counted in rounds of `concurrency` calls. A round
+    within `tolerance` x baseline adds one in-flight batch (additive increase).
+    The first call above it, or transient error, in a round multiplies concurrency
+    by `backoff` right away (multiplicative decrease), so sustained overload cuts
+    again every round.
+    Batch size follows the duration of write calls: it grows while calls finish
+    well under `target_seconds` and shrinks when they exceed it or when the
+    payload would pass `max_payload_bytes`.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_concurrency: int,
+        batch_size: int,
+        min_batch_size: int = 50,
+        max_batch_size: int = 5000,
+        initial_concurrency: int = 2,
+        target_seconds: float = 2.0,
+        max_payload_bytes: int = 8 * 1024 * 1024,
+        tolerance: float = 1.5,
+        backoff: float = 0.7,
+        smoothing: float = 0.3,
+        baseline_drift: float = 0.01,
+        is_transient: Callable[[BaseException], bool] = lambda error: True,
+    ) -> None:
+        self.max_concurrency = max(1, max_concurrency)
+        self.min_batch_size = max(1, min(min_batch_size, batch_size))
+        self.max_batch_size = max(batch_size, max_batch_size)
+        self.target_seconds = target_seconds
+        self.max_payload_bytes = max_payload_bytes
+        self.tolerance = tolerance
+        self.backoff = backoff
+        self.smoothing = smoothing
+        self.baseline_drift = baseline_drift
+        self.is_transient = is_transient
+
+        self._lock = threading.Lock()
+        self._listeners: list[Callable[[int], None]] = []
+        self.concurrency = min(self.max_concurrency, max(1, initial_concurrency))
+        self.batch_size = batch_size
+
+        self._latency: dict[str, float] = {}
+        self._baseline: dict[str, float] = {}
+        self._round = 0
+        self._round_size = self.concurrency
+        self._round_congested = False
+        self.increases = 0
+        self.decreases = 0
+        self.errors = 0
+        self.observations = 0
+
+    def subscribe(self, listener: Callable[[int], None]) -> None:
+        """Call `listener(concurrency)` now and on every change"""
+        self._listeners.append(listener)
+        listener(self.concurrency)
+
+    def current_batch_size(self) -> int:
+        return self.batch_size
+
+    @contextmanager
+    def track(self, kind: str, rows: int, payload_bytes: int = 0):
+        """Time an RPC step; failures are reported and re-raised"""
+        started = time.perf_counter()
+        try:
+            yield
+        except Exception as e:
+            self.record_error(e)
+            raise
+        self.record(kind, time.perf_counter() - started, rows, payload_bytes)
+
+    def record(self, kind: str, seconds: float, rows: int, payload_bytes: int = 0) -> None:
+        with self._lock:
+            self.observations += 1
+            per_row = seconds / max(1, rows)
+            latency = self._latency.get(kind)
+            latency = per_row if latency is None else latency + self.smoothing * (per_row - latency)
+            self._latency[kind] = latency
+
+            # The baseline creeps up, so a lasting change of server load becomes the new normal
+            baseline = self._baseline.get(kind, latency)
+            baseline = min(latency, baseline * (1 + self.baseline_drift))
+            self._baseline[kind] = baseline
+
+            self._observe(congested=latency > baseline * self.tolerance)
+
+            if kind != "search" and rows:
+                self._resize_batch(seconds, rows, payload_bytes)
+
+            concurrency = self.concurrency
+        self._notify(concurrency)
+
+    def record_error(self, error: BaseException) -> None:
+        # Data errors say nothing about the server load
+        if not self.is_transient(error):
+            return
+        with self._lock:
+            self.errors += 1
+            self._observe(congested=True)
+            self.batch_size = max(self.min_batch_size, int(self.batch_size * self.backoff))
+            concurrency = self.concurrency
+        self._notify(concurrency)
+
+    def _observe(self, *, congested: bool) -> None:
+        if congested and not self._round_congested:
+            # One cut per round: the calls already in flight were sent under the old limit
+            self._round_congested = True
+            lowered = max(1, int(self.concurrency * self.backoff))
+            if lowered < self.concurrency:
+                self.concurrency = lowered
+                self.decreases += 1
+
+        self._round += 1
+        if self._round < self._round_size:
+            return
+        if not self._round_congested and self.concurrency < self.max_concurrency:
+            self.concurrency += 1
+            self.increases += 1
+        self._round = 0
+        self._round_size = self.concurrency
+        self._round_congested = False
+
+    def _resize_batch(self, seconds: float, rows: int, payload_bytes: int) -> None:
+        size = self.batch_size
+        if seconds > self.target_seconds:
+            size = int(size * self.backoff)
+        elif seconds < self.target_seconds / 2 and not self._round_congested:
+            size += max(1, size // 10)
+
+        if payload_bytes:
+            size = min(size, int(self.max_payload_bytes / (payload_bytes / rows)))
+        self.batch_size = max(self.min_batch_size, min(self.max_batch_size, size))
+
+    def _notify(self, concurrency: int) -> None:
+        for listener in self._listeners:
+            listener(concurrency)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "concurrency": self.concurrency,
+                "max_concurrency": self.max_concurrency,
+                "batch_size": self.batch_size,
+                "latency_ms_per_row": {
+                    kind: round(value * 1000, 3) for kind, value in self._latency.items()
+                },
+                "increases": self.increases,
+                "decreases": self.decreases,
+                "errors": self.errors,
+            }
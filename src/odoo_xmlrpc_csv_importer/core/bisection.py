@@ -0,0 +1,108 @@
+from collections import deque
+from typing import Awaitable, Callable, Generator
+
+
+def _halves(items: list) -> tuple[list, list]:
+    middle = len(items) // 2
+    return items[:middle], items[middle:]
+
+
+class BisectionInterrupted(Exception):
+    """A transient error stopped the bisection part way.
+
+    `sent` holds the (chunk, result) pairs already accepted, `failed` the
+    (item, error) pairs isolated so far and `unsent` every other item, which
+    was never accepted. `error` is the transient error itself.
+    """
+
+    def __init__(self, error: Exception, sent: list, failed: list, unsent: list) -> None:
+        super().__init__(str(error))
+        self.error = error
+        self.sent = sent
+        self.failed = failed
+        self.unsent = unsent
+
+
+def _bisection(items: list, error: Exception) -> Generator[list, tuple, tuple[list, list]]:
+    """Yield the halves to resend, each answered with (result, None) or (None, error).
+
+    Returns (sent, failed). An error thrown in stops it with `BisectionInterrupted`.
+    """
+    sent, failed = [], []
+    pending = deque([(items, error)])
+
+    while pending:
+        chunk, chunk_error = pending.popleft()
+        if len(chunk) == 1:
+            failed.append((chunk[0], chunk_error))
+            continue
+
+        halves = _halves(chunk)
+        for index, half in enumerate(halves):
+            try:
+                result, half_error = yield half
+            except Exception as e:
+                unsent = [item for part in halves[index:] for item in part]
+                unsent += [item for part, _ in pending for item in part]
+                raise BisectionInterrupted(e, sent, failed, unsent) from e
+            if half_error is None:
+                sent.append((half, result))
+            else:
+                pending.append((half, half_error))
+
+    return sent, failed
+
+
+def bisect_failures(
+    items: list,
+    send: Callable[[list], object],
+    error: Exception,
+    *,
+    is_transient: Callable[[BaseException], bool],
+) -> tuple[list, list]:
+    """Isolate the items that make `send` fail by resending halves of a rejected call.
+
+    `error` is the failure of `send(items)`, which must be all-or-nothing. Returns
+    (sent, failed): sent holds (chunk, result) for every accepted chunk and failed
+    holds (item, error) for each item rejected on its own, after O(k log n) calls
+    for k bad items. A transient error stops the bisection with
+    `BisectionInterrupted`, which tells the accepted chunks from the rest.
+    """
+    steps = _bisection(items, error)
+    outcome = None
+
+    while True:
+        try:
+            half = steps.send(outcome)
+        except StopIteration as done:
+            return done.value
+        try:
+            outcome = (send(half), None)
+        except Exception as e:
+            if is_transient(e):
+                steps.throw(e)
+            outcome = (None, e)
+
+
+async def bisect_failures_async(
+    items: list,
+    send: Callable[[list], Awaitable],
+    error: Exception,
+    *,
+    is_transient: Callable[[BaseException], bool],
+) -> tuple[list, list]:
+    """`bisect_failures` for a coroutine `send`"""
+    steps = _bisection(items, error)
+    outcome = None
+
+    while True:
+        try:
+            half = steps.send(outcome)
+        except StopIteration as done:
+            return done.value
+        try:
+            outcome = (await send(half), None)
+        except Exception as e:
+            if is_transient(e):
+                steps.throw(e)
+            outcome = (None, e)
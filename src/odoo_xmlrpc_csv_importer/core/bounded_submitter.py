@@ -0,0 +1,74 @@
+import sys
+import threading
+from concurrent.futures import Executor, Future
+
+# Rough per-row overhead of a contact dict on top of its string payload
+_ROW_OVERHEAD_BYTES = 400
+
+
+def estimate_batch_bytes(batch: list) -> int:
+    """Cheap estimate of the memory held by a batch of contacts"""
+    total = 0
+    for contact in batch:
+        total += _ROW_OVERHEAD_BYTES
+        for value in contact.values():
+            if isinstance(value, str):
+                total += sys.getsizeof(value)
+    return total
+
+
+class BoundedSubmitter:
+    """Submit work to an executor, blocking the caller while the in-flight window is full."""
+
+    def __init__(
+        self,
+        executor: Executor,
+        *,
+        max_in_flight: int,
+        max_bytes: int | None = None,
+    ) -> None:
+        self.executor = executor
+        self.max_in_flight = max(1, max_in_flight)
+        self.max_bytes = max_bytes
+
+        self._cond = threading.Condition()
+        self.in_flight = 0
+        self.bytes_in_flight = 0
+
+    def _has_room(self, weight: int) -> bool:
+        if self.in_flight >= self.max_in_flight:
+            return False
+        # An oversized item still goes through once the window is empty
+        if self.max_bytes is not None and self.in_flight:
+            return self.bytes_in_flight + weight <= self.max_bytes
+        return True
+
+    def set_limit(self, max_in_flight: int) -> None:
+        with self._cond:
+            self.max_in_flight = max(1, max_in_flight)
+            self._cond.notify_all()
+
+    def submit(self, fn, *args, weight: int = 0) -> Future:
+        with self._cond:
+            self._cond.wait_for(lambda: self._has_room(weight))
+            self.in_flight += 1
+            self.bytes_in_flight += weight
+
+        try:
+            future = self.executor.submit(fn, *args)
+        except BaseException:
+            self._release(weight)
+            raise
+
+        future.add_done_callback(lambda _: self._release(weight))
+        return future
+
+    def _release(self, weight: int) -> None:
+        with self._cond:
+            self.in_flight -= 1
+            self.bytes_in_flight -= weight
+            self._cond.notify_all()
+
+    def wait_all(self) -> None:
+        with self._cond:
+            self._cond.wait_for(lambda: self.in_flight == 0)
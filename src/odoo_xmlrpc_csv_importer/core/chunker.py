@@ -7,3 +7,15 @@ def chunker(iterable, size):
             batch = []
     if batch:
         yield batch
+
+
+class Batch(list):
+    """A list of rows that remembers which byte range of the source file it covers"""
+
+    __slots__ = ("number", "start_offset", "end_offset")
+
+    def __init__(self, rows=(), *, number: int = 0, start_offset: int = 0, end_offset: int = 0):
+        super().__init__(rows)
+        self.number = number
+        self.start_offset = start_offset
+        self.end_offset = end_offset
@@ -0,0 +1,91 @@
+import threading
+from typing import Callable, Hashable
+
+
+class _Flight:
+    """A lookup in progress that other threads can wait on"""
+
+    __slots__ = ("done", "value", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.value = None
+        self.error: BaseException | None = None
+
+
+class ConcurrentCache:
+    """Thread-safe cache where concurrent misses on a key share a single load."""
+
+    def __init__(self) -> None:
+        self._values: dict = {}
+        self._flights: dict[Hashable, _Flight] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], object]):
+        """Return the cached value, or run `loader` once for every thread asking for `key`"""
+        with self._lock:
+            if key in self._values:
+                self.hits += 1
+                return self._values[key]
+
+            flight = self._flights.get(key)
+            is_leader = flight is None
+            if is_leader:
+                flight = self._flights[key] = _Flight()
+                self.misses += 1
+            else:
+                self.coalesced += 1
+
+        if not is_leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            flight.value = loader()
+        except BaseException as e:
+            # Failures are not cached, the next caller retries the lookup
+            flight.error = e
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+            raise
+
+        with self._lock:
+            self._values[key] = flight.value
+            del self._flights[key]
+        flight.done.set()
+
+        return flight.value
+
+    def get(self, key: Hashable, default=None):
+        with self._lock:
+            return self._values.get(key, default)
+
+    def setdefault(self, key: Hashable, value):
+        with self._lock:
+            return self._values.setdefault(key, value)
+
+    def items(self) -> list[tuple]:
+        with self._lock:
+            return list(self._values.items())
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._values
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._values)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+            }
@@ -0,0 +1,129 @@
+import hashlib
+import math
+import os
+import sqlite3
+import tempfile
+
+# Fixed-width key stored for each email; 128-bit collisions are not a practical concern
+DIGEST_SIZE = 16
+_HASHES = 7
+_FLUSH_EVERY = 10_000
+
+
+def email_digest(email: str) -> bytes:
+    return hashlib.blake2b(email.encode(), digest_size=DIGEST_SIZE).digest()
+
+
+class ExactEmailSet:
+    """Unbounded in-memory dedup, the default: one Python string per email seen."""
+
+    def __init__(self) -> None:
+        self._seen: set[str] = set()
+        self.duplicates = 0
+
+    def add(self, email: str) -> bool:
+        """Remember the email, returning False when it was already seen"""
+        if email in self._seen:
+            self.duplicates += 1
+            return False
+        self._seen.add(email)
+        return True
+
+    def stats(self) -> dict[str, int]:
+        return {"emails": len(self._seen), "duplicates": self.duplicates}
+
+    def close(self) -> None:
+        self._seen.clear()
+
+
+class BloomEmailSet:
+    """Memory-capped dedup: a Bloom filter in front of an exact on-disk digest table.
+
+    The filter lives in a `bytearray` of `memory_bytes`. A negative answer is
+    always right, so new emails only append their digest to a write buffer
+    flushed to SQLite in bulk. A positive may be false — more likely as the
+    filter fills up — so it is confirmed against the buffer and the table,
+    and false positives are counted instead of being treated as duplicates.
+    """
+
+    def __init__(self, memory_bytes: int, directory: str | None = None) -> None:
+        self._bits = max(8, memory_bytes * 8)
+        self._filter = bytearray(self._bits // 8)
+
+        fd, self.path = tempfile.mkstemp(prefix="etl-dedup-", suffix=".sqlite", dir=directory)
+        os.close(fd)
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.executescript(
+            """
+            PRAGMA journal_mode=OFF;
+            PRAGMA synchronous=OFF;
+            PRAGMA cache_size=-8192;
+            CREATE TABLE seen (digest BLOB PRIMARY KEY) WITHOUT ROWID;
+            """
+        )
+        self._pending: set[bytes] = set()
+
+        self.emails = 0
+        self.duplicates = 0
+        self.filter_positives = 0
+        self.false_positives = 0
+
+    def _positions(self, digest: bytes):
+        # Kirsch-Mitzenmacher double hashing over the two halves of the digest
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self._bits for i in range(_HASHES)]
+
+    def _in_store(self, digest: bytes) -> bool:
+        if digest in self._pending:
+            return True
+        row = self._db.execute("SELECT 1 FROM seen WHERE digest = ?", (digest,)).fetchone()
+        return row is not None
+
+    def _flush(self) -> None:
+        if self._pending:
+            with self._db:
+                self._db.executemany(
+                    "INSERT OR IGNORE INTO seen VALUES (?)", ((d,) for d in self._pending)
+                )
+            self._pending.clear()
+
+    def add(self, email: str) -> bool:
+        """Remember the email, returning False when it was already seen"""
+        digest = email_digest(email)
+        positions = self._positions(digest)
+        bloom = self._filter
+
+        if all(bloom[p >> 3] & (1 << (p & 7)) for p in positions):
+            self.filter_positives += 1
+            if self._in_store(digest):
+                self.duplicates += 1
+                return False
+            self.false_positives += 1
+        else:
+            for p in positions:
+                bloom[p >> 3] |= 1 << (p & 7)
+
+        self.emails += 1
+        self._pending.add(digest)
+        if len(self._pending) >= _FLUSH_EVERY:
+            self._flush()
+        return True
+
+    def expected_false_positive_rate(self) -> float:
+        return (1 - math.exp(-_HASHES * self.emails / self._bits)) ** _HASHES
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "emails": self.emails,
+            "duplicates": self.duplicates,
+            "filter_positives": self.filter_positives,
+            "false_positives": self.false_positives,
+        }
+
+    def close(self) -> None:
+        self._db.close()
+        self._filter = bytearray()
+        self._pending.clear()
+        if os.path.exists(self.path):
+            os.remove(self.path)
@@ -0,0 +1,73 @@
+import bisect
+
+
+def _default_bounds() -> tuple[float, ...]:
+    # 0.5 ms to ~2 min, each bucket √2 wider than the previous one
+    return tuple(float(f"{0.0005 * 2 ** (i / 2):.3g}") for i in range(37))
+
+
+DEFAULT_BOUNDS = _default_bounds()
+
+
+class LatencyHistogram:
+    """Fixed log-spaced buckets of durations, in seconds; not thread safe on its own.
+
+    Quantiles are interpolated inside the bucket holding the rank, so they are
+    accurate to the bucket width (~41%) at worst and usually much closer. The
+    buckets are exported as is by the OpenMetrics exporter.
+    """
+
+    def __init__(self, bounds: tuple[float, ...] = DEFAULT_BOUNDS) -> None:
+        self.bounds = bounds
+        # The last bucket is +Inf
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        self.max = max(self.max, seconds)
+
+    def quantile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+
+        rank = q * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            if bucket_count and seen + bucket_count >= rank:
+                lower = self.bounds[index - 1] if index else 0.0
+                upper = self.bounds[index] if index < len(self.bounds) else self.max
+                # Never report more than was actually observed
+                upper = min(upper, self.max)
+                return lower + (upper - lower) * max(0.0, rank - seen) / bucket_count
+            seen += bucket_count
+        return self.max
+
+    def cumulative(self) -> list[tuple[float, int]]:
+        """(upper bound, observations <= bound) pairs, ending with +Inf"""
+        pairs, total = [], 0
+        for bound, bucket_count in zip((*self.bounds, float("inf")), self.counts):
+            total += bucket_count
+            pairs.append((bound, total))
+        return pairs
+
+    def summary(self) -> dict[str, float]:
+        return {
+            "count": self.count,
+            "sum_seconds": round(self.sum, 6),
+            "mean_seconds": round(self.sum / self.count, 6) if self.count else 0.0,
+            "p50_seconds": round(self.quantile(0.50), 6),
+            "p95_seconds": round(self.quantile(0.95), 6),
+            "p99_seconds": round(self.quantile(0.99), 6),
+            "max_seconds": round(self.max, 6),
+        }
+
+    def copy(self) -> "LatencyHistogram":
+        clone = LatencyHistogram(self.bounds)
+        clone.counts = list(self.counts)
+        clone.count, clone.sum, clone.max = self.count, self.sum, self.max
+        return clone
@@ -0,0 +1,25 @@
+from collections import deque
+from concurrent.futures import Executor, Future
+from typing import Callable, Iterable, Iterator
+
+
+def ordered_map(
+    executor: Executor,
+    fn: Callable,
+    iterable: Iterable,
+    *,
+    max_pending: int,
+) -> Iterator:
+    """Like `Executor.map`, but reads the input lazily, keeping at most `max_pending` tasks queued"""
+    pending: deque[Future] = deque()
+    try:
+        for item in iterable:
+            pending.append(executor.submit(fn, item))
+            if len(pending) >= max(1, max_pending):
+                yield pending.popleft().result()
+
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
@@ -0,0 +1,122 @@
+import queue
+import threading
+from dataclasses import dataclass, field
+from typing import Callable
+
+_STOP = object()
+
+
+@dataclass
+class Stage:
+    """A group of worker threads consuming one bounded queue."""
+
+    name: str
+    fn: Callable
+    workers: int
+    queue_size: int
+    inbox: queue.Queue = field(init=False, repr=False)
+    _alive: int = field(init=False, repr=False, default=0)
+
+    def __post_init__(self) -> None:
+        self.workers = max(1, self.workers)
+        self.inbox = queue.Queue(maxsize=max(1, self.queue_size))
+
+
+class Pipeline:
+    """Chain of stages connected by bounded queues, so slow stages push back on faster ones.
+
+    Each stage function receives an item and returns the item for the next
+    stage, or None to stop it there. `on_done` runs for items that leave the
+    last stage and `on_error(item, stage_name, exc)` for items whose stage raised.
+    """
+
+    def __init__(
+        self,
+        stages: list[Stage],
+        *,
+        on_done: Callable | None = None,
+        on_error: Callable | None = None,
+    ) -> None:
+        self.stages = stages
+        self.on_done = on_done
+        self.on_error = on_error
+
+        self._lock = threading.Lock()
+        self._threads: list[threading.Thread] = []
+        self._unexpected: list[BaseException] = []
+
+    def start(self) -> "Pipeline":
+        for index, stage in enumerate(self.stages):
+            stage._alive = stage.workers
+            for n in range(stage.workers):
+                thread = threading.Thread(
+                    target=self._work,
+                    args=(index,),
+                    name=f"{stage.name}-{n}",
+                    daemon=True,
+                )
+                thread.start()
+                self._threads.append(thread)
+        return self
+
+    def put(self, item) -> None:
+        """Feed the first stage, blocking while its queue is full"""
+        self.stages[0].inbox.put(item)
+
+    def depths(self) -> dict[str, int]:
+        return {stage.name: stage.inbox.qsize() for stage in self.stages}
+
+    def close(self) -> None:
+        """Signal the end of input and wait until every stage drains"""
+        first = self.stages[0]
+        for _ in range(first.workers):
+            first.inbox.put(_STOP)
+        for thread in self._threads:
+            thread.join()
+
+        if self._unexpected:
+            raise self._unexpected[0]
+
+    def _record_unexpected(self, error: BaseException) -> None:
+        with self._lock:
+            self._unexpected.append(error)
+
+    def _guard(self, callback: Callable, *args) -> None:
+        """Run a callback without letting its failure kill the worker thread"""
+        try:
+            callback(*args)
+        except Exception as e:
+            self._record_unexpected(e)
+
+    def _work(self, index: int) -> None:
+        stage = self.stages[index]
+        next_stage = self.stages[index + 1] if index + 1 < len(self.stages) else None
+
+        while True:
+            item = stage.inbox.get()
+            if item is _STOP:
+                break
+
+            try:
+                result = stage.fn(item)
+            except Exception as e:
+                if self.on_error is None:
+                    self._record_unexpected(e)
+                else:
+                    self._guard(self.on_error, item, stage.name, e)
+                continue
+
+            if result is None:
+                continue
+            if next_stage is not None:
+                next_stage.inbox.put(result)
+            elif self.on_done is not None:
+                self._guard(self.on_done, result)
+
+        # The last worker of a stage forwards the end of input downstream
+        with self._lock:
+            stage._alive -= 1
+            is_last = stage._alive == 0
+        if is_last and next_stage is not None:
+            for _ in range(next_stage.workers):
+                next_stage.inbox.put(_STOP)
@@ -0,0 +1,69 @@
+from collections.abc import Mapping
+
+
+class Record(Mapping):
+    """Read-mostly row backed by a tuple of values and a header index shared by every row.
+
+    Behaves like a dict for lookups, so it can flow through chunking, validation
+    and enrichment, but costs one small object per row instead of a hash table.
+    Missing trailing values (short CSV rows) read as None, like `csv.DictReader`.
+    Raw rows may wrap the list produced by `csv.reader` as is.
+    """
+
+    __slots__ = ("_index", "_values")
+
+    def __init__(self, index: dict[str, int], values: tuple | list) -> None:
+        self._index = index
+        self._values = values
+
+    @staticmethod
+    def build_index(header) -> dict[str, int]:
+        return {name: position for position, name in enumerate(header)}
+
+    def __getitem__(self, key: str):
+        position = self._index[key]
+        return self._values[position] if position < len(self._values) else None
+
+    def __setitem__(self, key: str, value) -> None:
+        # Copy on write: enrichment touches two fields, every row is read many times
+        position = self._index[key]
+        values = list(self._values)
+        if position >= len(values):
+            values.extend([None] * (position + 1 - len(values)))
+        values[position] = value
+        self._values = tuple(values)
+
+    def get(self, key, default=None):
+        position = self._index.get(key)
+        if position is None:
+            return default
+        return self._values[position] if position < len(self._values) else None
+
+    def __contains__(self, key) -> bool:
+        return key in self._index
+
+    def __iter__(self):
+        return iter(self._index)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __reduce__(self):
+        # Rows pickled together (e.g. one validation chunk) share the memoized index
+        return (Record, (self._index, self._values))
+
+    def __repr__(self) -> str:
+        return f"Record({self.to_dict()!r})"
+
+    def copy(self) -> "Record":
+        # Values are an immutable tuple once written, so both copies can share them
+        return Record(self._index, self._values)
+
+    def to_dict(self) -> dict:
+        padding = (None,) * (len(self._index) - len(self._values))
+        return dict(zip(self._index, (*self._values, *padding)))
+
+
+def as_dicts(rows: list) -> list[dict]:
+    """Materialize records as plain dicts, right before they are marshaled into an RPC"""
+    return [row if isinstance(row, dict) else row.to_dict() for row in rows]
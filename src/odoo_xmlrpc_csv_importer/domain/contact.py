@@ -1,4 +1,17 @@
-from pydantic import BaseModel, ConfigDict, EmailStr, Field, HttpUrl, field_validator
+import hashlib
+import re
+
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    EmailStr,
+    Field,
+    HttpUrl,
+    ValidationError,
+    field_validator,
+)
+
+from odoo_xmlrpc_csv_importer.core.record import Record
 
 
 class ContactSchema(BaseModel):
@@ -20,10 +33,176 @@ class ContactSchema(BaseModel):
         return v.lower()
 
 
+CONTACT_FIELDS: tuple[str, ...] = tuple(ContactSchema.model_fields)
+CONTACT_INDEX: dict[str, int] = Record.build_index(CONTACT_FIELDS)
+
+# ir.model.data module used for the external ids of imported partners
+EXTERNAL_ID_MODULE = "etl_contacts"
+
+
+def contact_external_id(email: str) -> str:
+    """Stable external id derived from the normalized email, so re-imports update in place"""
+    digest = hashlib.sha1(email.strip().lower().encode()).hexdigest()[:24]
+    return f"{EXTERNAL_ID_MODULE}.partner_{digest}"
+
+
+def contact_content_hash(contact) -> str:
+    """Digest of the validated fields, so a sync can tell changed rows from unchanged ones"""
+    payload = "\x1f".join("" if contact.get(f) is None else str(contact[f]) for f in CONTACT_FIELDS)
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
 def validate_contact(contact: dict) -> dict:
     validated_contact = ContactSchema(**contact)
     return validated_contact.model_dump(mode="json")
 
 
+# Fast path: a conservative subset of the ContactSchema rules. Rows it cannot
+# vouch for (odd whitespace, IDNA domains, ports, queries...) go to pydantic.
+_ASCII_WHITESPACE = " \t\n\r\x0b\x0c"
+_LABEL = r"[a-z0-9](?:[a-z0-9-]{0,61}[a-z0-9])?"
+_EMAIL_RE = re.compile(
+    rf"(?P<local>[a-z0-9_%+-]+(?:\.[a-z0-9_%+-]+)*)@(?:{_LABEL}\.)+(?P<tld>[a-z]{{1,63}})",
+    re.IGNORECASE,
+)
+_URL_RE = re.compile(rf"https?://(?:{_LABEL}\.)+[a-z]{{1,63}}(?P<path>/[A-Za-z0-9._~/-]*)?")
+_URL_NORMALIZED_PATH_RE = re.compile(r"/\.\.?(?:/|$)|//")
+# Domains email_validator refuses as special-use (RFC 6761)
+_SPECIAL_USE_TLDS = frozenset({"arpa", "invalid", "local", "localhost", "onion", "test"})
+_MAX_EMAIL_LENGTH = 254
+_MAX_EMAIL_LOCAL_LENGTH = 64
+_MAX_URL_LENGTH = 2083
+
+
+def _max_length(field_name: str) -> int | None:
+    metadata = ContactSchema.model_fields[field_name].metadata
+    return next((m.max_length for m in metadata if hasattr(m, "max_length")), None)
+
+
+_TEXT_FIELDS = tuple(
+    (name, _max_length(name))
+    for name in CONTACT_FIELDS
+    if name not in ("name", "email", "website")
+)
+_MAX_NAME_LENGTH = _max_length("name")
+
+
+def _strip(value: str) -> str | None:
+    """str.strip(), or None when pydantic's own whitespace rules could disagree"""
+    if not (value[:1].isspace() or value[-1:].isspace()):
+        return value
+    stripped = value.strip()
+    return stripped if stripped == value.strip(_ASCII_WHITESPACE) else None
+
+
+def _fast_email(value) -> str | None:
+    if not isinstance(value, str) or (value := _strip(value)) is None:
+        return None
+    match = _EMAIL_RE.fullmatch(value)
+    if (
+        match is None
+        or len(value) > _MAX_EMAIL_LENGTH
+        or len(match["local"]) > _MAX_EMAIL_LOCAL_LENGTH
+        or "--" in value
+        or match["tld"].lower() in _SPECIAL_USE_TLDS
+    ):
+        return None
+    return value.lower()
+
+
+def _fast_website(value) -> str | None:
+    if not isinstance(value, str) or len(value) > _MAX_URL_LENGTH:
+        return None
+    match = _URL_RE.fullmatch(value)
+    if match is None or "--" in value:
+        return None
+    path = match["path"]
+    if path is None:
+        return value + "/"
+    if _URL_NORMALIZED_PATH_RE.search(path):
+        return None
+    return value
+
+
+def _fast_values(contact) -> list | None:
+    """Validated values in CONTACT_FIELDS order, or None when only pydantic can decide"""
+    if None in contact:
+        return None
+
+    name = contact.get("name")
+    if not isinstance(name, str) or (name := _strip(name)) is None:
+        return None
+    if not 1 <= len(name) <= _MAX_NAME_LENGTH:
+        return None
+
+    email = _fast_email(contact.get("email"))
+    if email is None:
+        return None
+
+    values = [name, email]
+    for field_name, max_length in _TEXT_FIELDS:
+        value = contact.get(field_name)
+        if value is not None:
+            if not isinstance(value, str) or (value := _strip(value)) is None:
+                return None
+            if len(value) > max_length:
+                return None
+        values.append(value)
+
+    website = contact.get("website")
+    if website is not None and (website := _fast_website(website)) is None:
+        return None
+    values.append(website)
+
+    return values
+
+
+def _fast_validate(contact) -> dict | None:
+    """The dump `validate_contact` would return, or None when only pydantic can decide"""
+    values = _fast_values(contact)
+    return None if values is None else dict(zip(CONTACT_FIELDS, values))
+
+
+def format_validation_error(error: ValidationError) -> str:
+    return str(error).replace("\n", " | ").strip()
+
+
+# Prefix of every message produced by `format_validation_error`
+_VALIDATION_ERROR_RE = re.compile(r"\d+ validation errors? for ")
+
+
+def is_validation_error(error_log: str) -> bool:
+    """Whether a DLQ row was rejected by validation rather than by Odoo"""
+    return _VALIDATION_ERROR_RE.match(error_log) is not None
+
+
+def validate_chunk(contacts: list, as_records: bool = False) -> list[tuple]:
+    """Validate many rows at once, returning (validated, None) or (raw row, error) per row, in order.
+
+    Rows go through the precompiled fast path first; pydantic only sees the rest.
+    With `as_records`, valid rows come back as compact `Record`s instead of dicts.
+    Errors travel as strings, so the function can run in a worker process.
+    """
+    results = []
+    for contact in contacts:
+        values = _fast_values(contact)
+        if values is None:
+            try:
+                validated = validate_contact(contact)
+            except ValidationError as e:
+                results.append((contact, format_validation_error(e)))
+                continue
+            if not as_records:
+                results.append((validated, None))
+                continue
+            values = validated.values()
+
+        if as_records:
+            results.append((Record(CONTACT_INDEX, tuple(values)), None))
+        else:
+            results.append((dict(zip(CONTACT_FIELDS, values)), None))
+    return results
+
+
 def is_duplicate(email: str, set_emails: set[str]):
     return email in set_emails
@@ -0,0 +1,150 @@
+import asyncio
+import itertools
+import xmlrpc.client
+from contextlib import nullcontext
+
+from tenacity import (
+    retry,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_exponential,
+)
+
+from odoo_xmlrpc_csv_importer.core.record import as_dicts
+from odoo_xmlrpc_csv_importer.infrastructure.odoo_client import (
+    LOAD_FIELDS,
+    build_load_rows,
+    parse_load_result,
+)
+from odoo_xmlrpc_csv_importer.infrastructure.jsonrpc import (
+    fault_from_error,
+    json_dumps,
+    json_loads,
+)
+from odoo_xmlrpc_csv_importer.infrastructure.retry_policy import is_transient_error
+from odoo_xmlrpc_csv_importer.infrastructure.tracer import Tracer
+from odoo_xmlrpc_csv_importer.infrastructure.transport import ConnectionStats
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - optional dependency
+    httpx = None
+
+
+class AsyncOdooClient:
+    """Non-blocking XML-RPC/JSON-RPC client for the object service, bounded by a semaphore."""
+
+    def __init__(
+        self,
+        *,
+        url: str,
+        db: str,
+        uid: int,
+        password: str,
+        max_concurrency: int,
+        timeout: float = 120.0,
+        protocol: str = "xmlrpc",
+        stats: ConnectionStats | None = None,
+        tracer: Tracer | None = None,
+    ) -> None:
+        if httpx is None:
+            raise RuntimeError(
+                "O engine asyncio requer o httpx: instale com `uv sync --extra async`."
+            )
+
+        base_url = str(url).rstrip("/")
+        self.protocol = protocol
+        self.endpoint = (
+            f"{base_url}/jsonrpc" if protocol == "jsonrpc" else f"{base_url}/xmlrpc/2/object"
+        )
+        self._ids = itertools.count(1)
+        self.db = db
+        self.uid = uid
+        self.password = password
+        self.stats = stats if stats is not None else ConnectionStats()
+        self.tracer = tracer
+
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._http = httpx.AsyncClient(
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max_concurrency,
+                max_keepalive_connections=max_concurrency,
+            ),
+        )
+
+    async def __aenter__(self) -> "AsyncOdooClient":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self._http.aclose()
+
+    @retry(
+        retry=retry_if_exception(is_transient_error),
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=2, max=10),
+        reraise=True,
+    )
+    async def execute_kw(self, model: str, method: str, args: list, kwargs: dict | None = None):
+        """Call `execute_kw` without blocking the event loop; raises `xmlrpc.client.Fault`"""
+        params = (self.db, self.uid, self.password, model, method, args, kwargs or {})
+
+        if self.protocol == "jsonrpc":
+            body = json_dumps(
+                {
+                    "jsonrpc": "2.0",
+                    "method": "call",
+                    "params": {"service": "object", "method": "execute_kw", "args": params},
+                    "id": next(self._ids),
+                }
+            )
+            content_type = "application/json"
+        else:
+            body = xmlrpc.client.dumps(params, "execute_kw").encode()
+            content_type = "text/xml"
+
+        async with self._semaphore:
+            # Traced once a slot is free, so the span is the RPC and not the wait
+            span = (
+                self.tracer.span(f"{model}.{method}", "rpc")
+                if self.tracer is not None
+                else nullcontext()
+            )
+            with span:
+                response = await self._http.post(
+                    self.endpoint, content=body, headers={"Content-Type": content_type}
+                )
+        self.stats.record_bytes(sent=len(body), received=response.num_bytes_downloaded)
+        response.raise_for_status()
+
+        if self.protocol == "jsonrpc":
+            payload = json_loads(response.content)
+            if payload.get("error"):
+                raise fault_from_error(payload["error"])
+            return payload.get("result")
+
+        (result,), _ = xmlrpc.client.loads(response.content)
+        return result
+
+    async def search_records(self, emails_to_search, fields=("email",)) -> list:
+        return (
+            await self.execute_kw(
+                "res.partner",
+                "search_read",
+                [[["email", "in", list(emails_to_search)]]],
+                {"fields": list(fields)},
+            )
+            or []
+        )
+
+    async def create_contacts(self, contacts: list) -> list[int]:
+        return await self.execute_kw("res.partner", "create", [as_dicts(contacts)])
+
+    async def write_contacts(self, partner_ids: list[int], values: dict) -> bool:
+        return await self.execute_kw("res.partner", "write", [partner_ids, dict(values)])
+
+    async def load_contacts(self, contacts: list) -> list[int]:
+        result = await self.execute_kw(
+            "res.partner", "load", [LOAD_FIELDS, build_load_rows(contacts)]
+        )
+        return parse_load_result(result)
@@ -0,0 +1,101 @@
+import json
+import os
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from odoo_xmlrpc_csv_importer.infrastructure.logger import logger
+
+
+@dataclass
+class ResumePoint:
+    """Where a resumed run starts reading, and which later byte ranges it can skip"""
+
+    offset: int
+    completed: list[tuple[int, int]] = field(default_factory=list)
+    next_batch: int = 1
+    batches_done: int = 0
+
+
+class CheckpointJournal:
+    """Append-only JSONL journal with the byte range and status of every finished batch.
+
+    The first line identifies the source file; each following line is written
+    and fsynced as soon as a batch is done (created) or failed (sent to the
+    DLQ), so the journal survives a killed container.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._file = None
+        self._entries: list[dict] = []
+
+    @staticmethod
+    def _source_identity(source: Path) -> dict:
+        return {"file": str(Path(source).resolve()), "size": Path(source).stat().st_size}
+
+    def open(self, source: Path, *, resume: bool = False) -> None:
+        identity = self._source_identity(source)
+
+        if resume and self.path.exists():
+            with open(self.path, encoding="utf-8") as file:
+                lines = [json.loads(line) for line in file if line.strip()]
+            if lines and lines[0] != identity:
+                raise RuntimeError(
+                    f"O journal {self.path} pertence a outro arquivo ou o arquivo mudou desde a execução anterior."
+                )
+            self._entries = lines[1:]
+            self._file = open(self.path, "a", encoding="utf-8")
+            if not lines:
+                self._write(identity)
+            return
+
+        self._entries = []
+        self._file = open(self.path, "w", encoding="utf-8")
+        self._write(identity)
+
+    def _write(self, entry: dict) -> None:
+        self._file.write(json.dumps(entry) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def resume_point(self) -> ResumePoint:
+        """Resume after the contiguous prefix of finished batches; later ones are skipped"""
+        # The first batch starts at byte 0, header included, so batches tile the file
+        ranges = sorted((e["start"], e["end"]) for e in self._entries)
+        offset = 0
+        index = 0
+        while index < len(ranges) and ranges[index][0] <= offset:
+            offset = max(offset, ranges[index][1])
+            index += 1
+
+        return ResumePoint(
+            offset=offset,
+            completed=ranges[index:],
+            next_batch=max((e["batch"] for e in self._entries), default=0) + 1,
+            batches_done=len(ranges),
+        )
+
+    def record(self, batch, status: str) -> None:
+        """Persist a finished batch; `batch` is a `core.chunker.Batch`"""
+        entry = {
+            "batch": batch.number,
+            "start": batch.start_offset,
+            "end": batch.end_offset,
+            "rows": len(batch),
+            "status": status,
+        }
+        with self._lock:
+            if self._file is None:
+                return
+            try:
+                self._write(entry)
+            except OSError as e:
+                logger.error("journal_write_failed", error=str(e), batch=batch.number)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
@@ -0,0 +1,114 @@
+import threading
+import time
+from typing import Callable
+
+from odoo_xmlrpc_csv_importer.infrastructure.logger import logger
+
+
+class CircuitOpenError(ConnectionError):
+    """Odoo stayed unreachable for longer than the breaker is willing to wait"""
+
+
+class CircuitBreaker:
+    """Client-wide breaker shared by every worker thread of an `OdooClient`.
+
+    After `failure_threshold` consecutive transient failures the circuit opens:
+    every call waits in `wait_closed()` while a single thread probes the server
+    with a cheap call, backing off from `probe_interval` up to `max_probe_interval`.
+    The first successful probe closes the circuit and releases all workers at
+    once. A caller that waited `max_open_seconds` gets `CircuitOpenError`; probing
+    goes on, so later callers still resume as soon as Odoo is back.
+    """
+
+    def __init__(
+        self,
+        *,
+        failure_threshold: int = 5,
+        probe_interval: float = 1.0,
+        max_probe_interval: float = 30.0,
+        max_open_seconds: float = 900.0,
+    ) -> None:
+        self.failure_threshold = max(1, failure_threshold)
+        self.probe_interval = probe_interval
+        self.max_probe_interval = max_probe_interval
+        self.max_open_seconds = max_open_seconds
+        self.probe: Callable[[], object] | None = None
+
+        self._cond = threading.Condition()
+        self._open = False
+        self._probing = False
+        self._failures = 0
+        self._opened_at = 0.0
+        self._next_probe = 0.0
+        self._interval = probe_interval
+        self.trips = 0
+        self.probes = 0
+
+    @property
+    def is_open(self) -> bool:
+        return self._open
+
+    def record_success(self) -> None:
+        with self._cond:
+            self._failures = 0
+
+    def record_failure(self) -> None:
+        with self._cond:
+            self._failures += 1
+            if self._open or self._failures < self.failure_threshold:
+                return
+            self._open = True
+            self.trips += 1
+            self._opened_at = time.monotonic()
+            self._interval = self.probe_interval
+            self._next_probe = self._opened_at + self._interval
+        logger.warning("circuito_aberto", falhas_consecutivas=self.failure_threshold)
+
+    def wait_closed(self) -> None:
+        """Block while the circuit is open; one of the waiting threads runs the probes"""
+        waiting_since = time.monotonic()
+        while True:
+            with self._cond:
+                if not self._open:
+                    return
+                now = time.monotonic()
+                # Only this caller gives up; the circuit stays open until a probe succeeds
+                if now - waiting_since > self.max_open_seconds:
+                    raise CircuitOpenError(
+                        f"Odoo indisponível há mais de {self.max_open_seconds:.0f} s"
+                    )
+                if self._probing or now < self._next_probe:
+                    self._cond.wait(timeout=max(0.01, self._next_probe - now))
+                    continue
+                self._probing = True
+
+            # Probe outside the lock: the other workers keep waiting, silent
+            healthy = self._run_probe()
+
+            with self._cond:
+                self._probing = False
+                if healthy:
+                    self._open = False
+                    self._failures = 0
+                    paused = time.monotonic() - self._opened_at
+                else:
+                    self._interval = min(self._interval * 2, self.max_probe_interval)
+                    self._next_probe = time.monotonic() + self._interval
+                self._cond.notify_all()
+
+            if healthy:
+                logger.info("circuito_fechado", segundos_pausado=round(paused, 2))
+
+    def _run_probe(self) -> bool:
+        self.probes += 1
+        if self.probe is None:
+            return True
+        try:
+            self.probe()
+        except Exception:
+            return False
+        return True
+
+    def snapshot(self) -> dict[str, int]:
+        with self._cond:
+            return {"trips": self.trips, "probes": self.probes}
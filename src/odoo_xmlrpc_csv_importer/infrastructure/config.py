@@ -1,4 +1,5 @@
 from functools import lru_cache
+from typing import Literal
 
 from pydantic import Field, HttpUrl, SecretStr
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -10,6 +11,15 @@ class Settings(BaseSettings):
     username: str = Field(...)
     password: SecretStr = Field(...)
     dlq_file: str = "failed_records.csv"
+    protocol: Literal["xmlrpc", "jsonrpc"] = "xmlrpc"
+    cache_file: str | None = None
+    cache_ttl_seconds: int = 7 * 24 * 3600
+    sync_state_file: str = ".etl_sync.sqlite"
+    # Gzip XML-RPC requests above this size; only enable when the server decodes them
+    gzip_min_bytes: int | None = None
+    # Consecutive outage errors that pause every worker; 0 disables the breaker
+    circuit_breaker_threshold: int = 5
+    circuit_breaker_max_wait_seconds: float = 900.0
 
     model_config = SettingsConfigDict(
         env_prefix="odoo_", env_file=".env", extra="ignore"
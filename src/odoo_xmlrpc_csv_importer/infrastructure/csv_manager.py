@@ -1,13 +1,31 @@
-import csv
+import multiprocessing
 import os
 import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
-from typing import Generator
+from typing import Callable, Generator, Iterable
+
+from odoo_xmlrpc_csv_importer.core.chunker import Batch, chunker
+from odoo_xmlrpc_csv_importer.core.dedup import BloomEmailSet, ExactEmailSet
+from odoo_xmlrpc_csv_importer.core.ordered_map import ordered_map
+from odoo_xmlrpc_csv_importer.domain.contact import is_duplicate, validate_chunk
+from odoo_xmlrpc_csv_importer.infrastructure.checkpoint_journal import ResumePoint
+from odoo_xmlrpc_csv_importer.infrastructure.dlq_writer import DlqWriter
+from odoo_xmlrpc_csv_importer.infrastructure.import_stats import ImportStats
+from odoo_xmlrpc_csv_importer.infrastructure.input_readers import read_rows
 
-from pydantic import ValidationError
+# Rows shipped to a validation process at a time; large enough to amortize pickling
+VALIDATION_CHUNK_SIZE = 2000
 
-from odoo_xmlrpc_csv_importer.domain.contact import is_duplicate, validate_contact
-from odoo_xmlrpc_csv_importer.infrastructure.import_stats import ImportStats
+
+def _timed_validate(chunk: list, *, as_records: bool) -> tuple[list, float]:
+    # Timed where it runs, so process pool queueing is not counted as validation
+    started = time.perf_counter()
+    results = validate_chunk(chunk, as_records=as_records)
+    return results, time.perf_counter() - started
 
 
 class CsvManager:
@@ -16,12 +34,30 @@ class CsvManager:
         contacts_file: Path,
         dlq_file: str,
         import_stats: ImportStats | None = None,
+        validation_workers: int = 1,
+        validation_chunk_size: int = VALIDATION_CHUNK_SIZE,
+        compact_rows: bool = False,
+        dedup_memory_mb: int | None = None,
+        row_filter: Callable | None = None,
+        input_format: str = "auto",
     ) -> None:
         self.contacts_file = contacts_file
         self.dlq_file = dlq_file
         self.import_stats = import_stats
+        self.validation_workers = max(1, validation_workers)
+        self.validation_chunk_size = max(1, validation_chunk_size)
+        self.compact_rows = compact_rows
+        self.dedup_memory_mb = dedup_memory_mb
+        self.dedup_stats: dict[str, int] | None = None
+        # Rows for which it returns False are dropped before validation
+        self.row_filter = row_filter
+        # csv, jsonl or parquet; "auto" picks one from the file name
+        self.input_format = input_format
 
         self._lock = threading.Lock()
+        self._dlq_writer: DlqWriter | None = None
+        # End of the last row read, valid or not, by the current stream
+        self._read_end = 0
 
     def deduplicate_contacts(contacts):
         seen_emails = set()
@@ -34,58 +70,174 @@ class CsvManager:
 
             yield contact
 
-    def sanitize_contacts(self, contacts: list):
-        seen_emails = set()
+    def _record_stage(self, stage: str, seconds: float) -> None:
+        if self.import_stats is not None:
+            self.import_stats.record_stage(stage, seconds)
+
+    def _validated_chunks(self, chunks: Iterable[list]) -> Generator[list]:
+        validate = partial(_timed_validate, as_records=self.compact_rows)
+        if self.validation_workers == 1:
+            for results, seconds in map(validate, chunks):
+                self._record_stage("validation", seconds)
+                yield results
+            return
+
+        # Chunks are validated on several cores and come back in input order. The
+        # pool starts while HTTP, progress and worker threads run, which fork() must not copy
+        with ProcessPoolExecutor(
+            max_workers=self.validation_workers,
+            mp_context=multiprocessing.get_context("forkserver"),
+        ) as executor:
+            for results, seconds in ordered_map(
+                executor,
+                validate,
+                chunks,
+                max_pending=2 * self.validation_workers,
+            ):
+                self._record_stage("validation", seconds)
+                yield results
+
+    def _validated_rows(self, rows: Iterable[tuple]) -> Generator[tuple]:
+        """Validate (row, offset) pairs in chunks, keeping each result paired with its offset"""
+        offsets: deque[list] = deque()
+
+        def row_chunks():
+            started = time.perf_counter()
+            for chunk in chunker(rows, self.validation_chunk_size):
+                # Reading and parsing one chunk, without the time spent downstream
+                self._record_stage("csv_read", time.perf_counter() - started)
+                offsets.append([offset for _, offset in chunk])
+                yield [row for row, _ in chunk]
+                started = time.perf_counter()
+
+        for results in self._validated_chunks(row_chunks()):
+            yield from zip(results, offsets.popleft())
+
+    def _email_set(self) -> ExactEmailSet | BloomEmailSet:
+        if self.dedup_memory_mb is None:
+            return ExactEmailSet()
+        # Spill next to the DLQ: /tmp is often a tmpfs counted as container memory
+        return BloomEmailSet(
+            self.dedup_memory_mb * 1024 * 1024,
+            directory=os.path.dirname(os.path.abspath(self.dlq_file)),
+        )
+
+    def _sanitize_rows(self, rows: Iterable[tuple]) -> Generator[tuple]:
+        # Deduplication runs here, in the parent, so it stays global across chunks
+        seen_emails = self._email_set()
+        try:
+            for (contact, error), offset in self._validated_rows(rows):
+                if error is not None:
+                    self.import_stats.record_validation_error()
+                    self.log_to_dlq([contact], error)
+                    continue
+
+                if not seen_emails.add(contact["email"]):
+                    continue
+
+                yield contact, offset
+        finally:
+            self.dedup_stats = seen_emails.stats()
+            seen_emails.close()
+
+    def sanitize_contacts(self, contacts: Iterable[dict]):
+        for contact, _ in self._sanitize_rows((contact, None) for contact in contacts):
+            yield contact
 
-        for contact in contacts:
-            try:
-                validated_contact = validate_contact(contact)
-            except ValidationError as e:
-                self.import_stats.record_validation_error()
-                self.log_to_dlq([contact], str(e).replace("\n", " | ").strip())
+    def _read_rows(self, resume: ResumePoint | None) -> Generator[tuple]:
+        """Yield (row, end offset) pairs, skipping batches a previous run finished"""
+        rows = read_rows(
+            self.contacts_file,
+            self.input_format,
+            compact_rows=self.compact_rows,
+            start=resume.offset if resume is not None else 0,
+        )
+        skip = resume.completed if resume is not None else []
+
+        pending_skip = iter(skip)
+        next_skip = next(pending_skip, None)
+        self._read_end = resume.offset if resume is not None else 0
+        for row, offset in rows:
+            self._read_end = offset
+            # Rows inside a range finished out of order are neither re-validated nor re-sent
+            while next_skip is not None and offset > next_skip[1]:
+                next_skip = next(pending_skip, None)
+            if next_skip is not None and next_skip[0] < offset <= next_skip[1]:
                 continue
-
-            if is_duplicate(validated_contact["email"], seen_emails):
+            if self.row_filter is not None and not self.row_filter(row):
                 continue
+            yield row, offset
 
-            seen_emails.add(contact["email"])
+    def _stream_rows(self, resume: ResumePoint | None = None) -> Generator[tuple]:
+        try:
+            yield from self._sanitize_rows(self._read_rows(resume))
 
-            yield validated_contact
+        except Exception as e:
+            raise RuntimeError(f"Erro durante o stream do arquivo: {e}")
 
     def stream_csv_contacts(self) -> Generator[dict]:
         """Import csv data and return an array of contacts with deduplication"""
-        try:
-            with open(
-                self.contacts_file, mode="r", newline="", encoding="utf-8"
-            ) as file:
-                reader = csv.DictReader(file)
+        for contact, _ in self._stream_rows():
+            yield contact
 
-                yield from self.sanitize_contacts(reader)
-
-        except Exception as e:
-            raise RuntimeError(f"Erro durante o stream do arquivo: {e}")
+    def stream_batches(
+        self, batch_size: int | Callable[[], int], resume: ResumePoint | None = None
+    ) -> Generator[Batch]:
+        """Group valid contacts into batches tagged with the byte range they cover.
+
+        Consecutive batches tile the file, so rows rejected by validation or
+        deduplication belong to the range of the batch that follows them, and
+        the ones after the last valid row to the last batch. A file without any
+        valid row gets one empty batch, so its range is journaled all the same.
+        `batch_size` may be a callable, read again for every batch.
+        """
+        size_of = batch_size if callable(batch_size) else lambda: batch_size
+        number = resume.next_batch if resume is not None else 1
+        size = size_of()
+        start_offset = resume.offset if resume is not None else 0
+        batch = Batch(number=number, start_offset=start_offset)
+        # A full batch waits for the next valid row, in case it is the last one
+        full = None
+
+        for contact, offset in self._stream_rows(resume):
+            if full is not None:
+                yield full
+                full = None
+            batch.append(contact)
+            batch.end_offset = offset
+
+            if len(batch) >= size:
+                full = batch
+                number += 1
+                size = size_of()
+                batch = Batch(number=number, start_offset=offset)
+
+        # Without this range, --resume would validate the trailing rows and log them to the DLQ again
+        last = full if full is not None else batch
+        if last or self._read_end > start_offset:
+            last.end_offset = max(last.end_offset, self._read_end)
+            yield last
 
     def log_to_dlq(self, batch: list, error_msg: str) -> None:
-        """Log into DLQ file with an new error column"""
-        try:
-            with self._lock:
-                file_exists = os.path.isfile(self.dlq_file)
-                with open(
-                    self.dlq_file,
-                    mode="a",
-                    newline="",
-                    encoding="utf-8",
-                ) as file:
-                    if batch:
-                        # Include the new error column into the csv headline
-                        fieldnames = list(batch[0].keys()) + ["error_log"]
-                        writer = csv.DictWriter(file, fieldnames=fieldnames)
-
-                        if not file_exists:
-                            writer.writeheader()
-
-                        for row in batch:
-                            row["error_log"] = str(error_msg)
-                            writer.writerow(row)
-        except Exception as e:
-            raise RuntimeError(f"Falha ao escrever no DLQ: {e}")
+        """Queue rows for the DLQ writer thread, with an new error column"""
+        with self._lock:
+            if self._dlq_writer is None:
+                self._dlq_writer = DlqWriter(
+                    self.dlq_file, on_write=partial(self._record_stage, "dlq_write")
+                )
+            writer = self._dlq_writer
+        writer.write(batch, str(error_msg))
+
+    def sync_dlq(self) -> None:
+        """Block until every row logged so far is on disk"""
+        with self._lock:
+            writer = self._dlq_writer
+        if writer is not None:
+            writer.sync()
+
+    def close_dlq(self) -> None:
+        """Flush the DLQ and stop its writer; a later failure starts a new one"""
+        with self._lock:
+            writer, self._dlq_writer = self._dlq_writer, None
+        if writer is not None:
+            writer.close()
@@ -0,0 +1,142 @@
+import csv
+import os
+import queue
+import threading
+import time
+from typing import Callable
+
+ERROR_COLUMN = "error_log"
+WRITE_BUFFER_BYTES = 256 * 1024
+
+_STOP = object()
+
+
+class DlqWriter:
+    """Single thread appending failed rows to the DLQ through one open, buffered handle.
+
+    Callers only enqueue (rows, error) pairs, so a dirty file no longer costs a
+    lock, a stat, an open and a new DictWriter per invalid row. The buffer is
+    flushed at most every `flush_interval` seconds; `sync()` forces it to disk.
+    Appending to an existing DLQ reuses its header.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        *,
+        flush_interval: float = 1.0,
+        buffer_bytes: int = WRITE_BUFFER_BYTES,
+        on_write: Callable[[float], None] | None = None,
+    ) -> None:
+        self.path = path
+        self.flush_interval = flush_interval
+        self.buffer_bytes = buffer_bytes
+        # Called with the seconds spent on each append, flush or fsync
+        self.on_write = on_write
+
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._error: BaseException | None = None
+        self._file = None
+        self._writer: csv.DictWriter | None = None
+        self._thread = threading.Thread(target=self._run, name="dlq-writer", daemon=True)
+        self._thread.start()
+
+    def write(self, rows: list, error: str) -> None:
+        self._raise_if_failed()
+        if rows:
+            self._queue.put((rows, error))
+
+    def sync(self) -> None:
+        """Block until every row queued so far is flushed and fsynced"""
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait()
+        self._raise_if_failed()
+
+    def close(self) -> None:
+        """Write what is still queued, close the file and stop the thread"""
+        self._queue.put(_STOP)
+        self._thread.join()
+        self._raise_if_failed()
+
+    def _raise_if_failed(self) -> None:
+        if self._error is not None:
+            raise RuntimeError(f"Falha ao escrever no DLQ: {self._error}")
+
+    def _open(self, first_row) -> None:
+        header = None
+        if os.path.isfile(self.path) and os.path.getsize(self.path) > 0:
+            with open(self.path, newline="", encoding="utf-8") as existing:
+                header = next(csv.reader(existing), None)
+
+        self._file = open(
+            self.path, mode="a", newline="", encoding="utf-8", buffering=self.buffer_bytes
+        )
+        # Replayed DLQ rows already carry the error column
+        fieldnames = header or [k for k in first_row if k != ERROR_COLUMN] + [ERROR_COLUMN]
+        self._writer = csv.DictWriter(self._file, fieldnames=fieldnames, extrasaction="ignore")
+        if header is None:
+            self._writer.writeheader()
+
+    def _append(self, rows: list, error: str) -> None:
+        if self._writer is None:
+            self._open(rows[0])
+        for row in rows:
+            record = dict(row)
+            record[ERROR_COLUMN] = error
+            self._writer.writerow(record)
+
+    def _timed(self, action, *args) -> None:
+        started = time.perf_counter()
+        action(*args)
+        if self.on_write is not None:
+            self.on_write(time.perf_counter() - started)
+
+    def _sync_file(self) -> None:
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def _run(self) -> None:
+        dirty = unsynced = False
+        last_flush = time.monotonic()
+
+        while True:
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                item = None
+
+            if item is _STOP:
+                break
+
+            if isinstance(item, threading.Event):
+                try:
+                    if unsynced:
+                        self._timed(self._sync_file)
+                        dirty = unsynced = False
+                except Exception as e:
+                    self._error = e
+                item.set()
+                continue
+
+            # After a failure, rows are dropped but sync() callers are still released
+            if item is not None and self._error is None:
+                try:
+                    self._timed(self._append, *item)
+                    dirty = unsynced = True
+                except Exception as e:
+                    self._error = e
+
+            if dirty and time.monotonic() - last_flush >= self.flush_interval:
+                try:
+                    self._timed(self._file.flush)
+                except Exception as e:
+                    self._error = e
+                dirty = False
+                last_flush = time.monotonic()
+
+        if self._file is not None:
+            try:
+                self._file.close()
+            except Exception as e:
+                self._error = self._error or e
@@ -1,12 +1,19 @@
+import time
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 from threading import Lock
 
+from odoo_xmlrpc_csv_importer.core.histogram import LatencyHistogram
+from odoo_xmlrpc_csv_importer.infrastructure.tracer import Tracer
+
 
 @dataclass
 class ImportStats:
     """Thread safe counters to follow up import stats."""
 
     max_workers: int
+    # With a tracer, every stage timing is also recorded as a span
+    tracer: Tracer | None = field(default=None, repr=False)
     _lock: Lock = field(default_factory=Lock, init=False, repr=False)
     active_workers: int = 0
     validation_errors: int = 0
@@ -14,7 +21,16 @@ class ImportStats:
     batch_errors: int = 0
     contacts_created: int = 0
     contacts_skipped_odoo: int = 0
+    # Upserted by `load`, created or updated
+    contacts_loaded: int = 0
+    contacts_updated: int = 0
+    contacts_unchanged: int = 0
+    write_calls: int = 0
+    contacts_rejected: int = 0
     contacts_in_failed_batches: int = 0
+    batches_requeued: int = 0
+    # Duration histograms per stage: csv_read, validation, search, references, create...
+    _stages: dict[str, LatencyHistogram] = field(default_factory=dict, init=False, repr=False)
 
     def worker_enter(self) -> None:
         with self._lock:
@@ -28,11 +44,26 @@ class ImportStats:
         with self._lock:
             self.validation_errors += 1
 
-    def record_batch_success(self, *, created: int, skipped_odoo: int) -> None:
+    def record_batch_success(
+        self,
+        *,
+        created: int,
+        skipped_odoo: int,
+        loaded: int = 0,
+        updated: int = 0,
+        unchanged: int = 0,
+        write_calls: int = 0,
+        rejected: int = 0,
+    ) -> None:
         with self._lock:
             self.batches_completed += 1
             self.contacts_created += created
             self.contacts_skipped_odoo += skipped_odoo
+            self.contacts_loaded += loaded
+            self.contacts_updated += updated
+            self.contacts_unchanged += unchanged
+            self.write_calls += write_calls
+            self.contacts_rejected += rejected
 
     def record_batch_failure(self, batch_rows: int) -> None:
         with self._lock:
@@ -40,6 +71,34 @@ class ImportStats:
             self.batch_errors += 1
             self.contacts_in_failed_batches += batch_rows
 
+    def record_batch_requeued(self) -> None:
+        with self._lock:
+            self.batches_requeued += 1
+
+    def record_stage(self, stage: str, seconds: float) -> None:
+        """Record a stage that just finished, after `seconds`"""
+        if self.tracer is not None:
+            ended = time.perf_counter()
+            self.tracer.complete(stage, "stage", ended - seconds, ended)
+        with self._lock:
+            histogram = self._stages.get(stage)
+            if histogram is None:
+                histogram = self._stages[stage] = LatencyHistogram()
+            histogram.observe(seconds)
+
+    @contextmanager
+    def timed(self, stage: str):
+        """Record how long the block took under `stage`, failures included"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_stage(stage, time.perf_counter() - started)
+
+    def stage_histograms(self) -> dict[str, LatencyHistogram]:
+        with self._lock:
+            return {stage: h.copy() for stage, h in self._stages.items()}
+
     def snapshot(self) -> dict[str, int]:
         with self._lock:
             return {
@@ -50,5 +109,11 @@ class ImportStats:
                 "batch_errors": self.batch_errors,
                 "contacts_created": self.contacts_created,
                 "contacts_skipped_odoo": self.contacts_skipped_odoo,
+                "contacts_loaded": self.contacts_loaded,
+                "contacts_updated": self.contacts_updated,
+                "contacts_unchanged": self.contacts_unchanged,
+                "write_calls": self.write_calls,
+                "contacts_rejected": self.contacts_rejected,
                 "contacts_in_failed_batches": self.contacts_in_failed_batches,
+                "batches_requeued": self.batches_requeued,
             }
@@ -0,0 +1,227 @@
+import csv
+import gzip
+import io
+import json
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Generator
+
+from odoo_xmlrpc_csv_importer.core.record import Record
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional dependency
+    pq = None
+
+READ_BUFFER_BYTES = 1024 * 1024
+# Parquet rows turned into Python objects at a time, within one row group
+PARQUET_SLICE_ROWS = 10_000
+
+_MAGIC = {
+    b"\x1f\x8b": "gzip",
+    b"\x28\xb5\x2f\xfd": "zstd",
+}
+_COMPRESSION_SUFFIXES = {".gz", ".gzip", ".zst", ".zstd"}
+_FORMAT_SUFFIXES = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl", ".parquet": "parquet"}
+
+
+class _OffsetLines:
+    """Decoded lines of a binary stream, counting the bytes consumed so far.
+
+    csv.reader pulls one line at a time and never reads ahead, so right after
+    it yields a row, `offset` is the byte position where that row ends. For a
+    compressed file it is the position in the decompressed content.
+    """
+
+    def __init__(self, raw) -> None:
+        self.raw = raw
+        self.offset = 0
+
+    def __iter__(self) -> "_OffsetLines":
+        return self
+
+    def __next__(self) -> str:
+        line = self.raw.readline()
+        if not line:
+            raise StopIteration
+        self.offset += len(line)
+        return line.decode("utf-8")
+
+    def skip_to(self, offset: int) -> None:
+        """Move forward to `offset`; compressed streams are decompressed up to it and discarded"""
+        if self.raw.seekable():
+            self.raw.seek(offset)
+        else:
+            remaining = offset - self.offset
+            while remaining > 0:
+                chunk = self.raw.read(min(remaining, READ_BUFFER_BYTES))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+        self.offset = offset
+
+
+def detect_compression(path: Path) -> str | None:
+    """gzip, zstd or None, from the magic bytes rather than the file name"""
+    with open(path, "rb") as file:
+        head = file.read(4)
+    for magic, compression in _MAGIC.items():
+        if head.startswith(magic):
+            return compression
+    return None
+
+
+def detect_format(path: Path) -> str:
+    """csv, jsonl or parquet, from the extension under any compression suffix"""
+    suffixes = [s.lower() for s in Path(path).suffixes]
+    while suffixes and suffixes[-1] in _COMPRESSION_SUFFIXES:
+        suffixes.pop()
+    if suffixes and suffixes[-1] in _FORMAT_SUFFIXES:
+        return _FORMAT_SUFFIXES[suffixes[-1]]
+
+    with open(path, "rb") as file:
+        return "parquet" if file.read(4) == b"PAR1" else "csv"
+
+
+@contextmanager
+def open_decompressed(path: Path):
+    """Binary stream of the file content, decompressed on the fly"""
+    compression = detect_compression(path)
+    if compression == "zstd" and zstandard is None:
+        raise RuntimeError(
+            "Arquivos zstd requerem o zstandard: instale com `uv sync --extra zstd`."
+        )
+
+    with open(path, mode="rb", buffering=READ_BUFFER_BYTES) as raw:
+        if compression is None:
+            yield raw
+        elif compression == "gzip":
+            with gzip.GzipFile(fileobj=raw) as stream:
+                yield stream
+        else:
+            reader = zstandard.ZstdDecompressor().stream_reader(raw, read_across_frames=True)
+            with io.BufferedReader(reader, READ_BUFFER_BYTES) as stream:
+                yield stream
+
+
+def _text(value):
+    # Validation expects the strings a CSV would hold
+    if value is None or isinstance(value, str):
+        return value
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False)
+    return str(value)
+
+
+def read_csv_rows(path: Path, *, compact_rows: bool = False, start: int = 0) -> Generator[tuple]:
+    """Yield (row, end offset) pairs; `start` is the offset of a row end to continue from"""
+    with open_decompressed(path) as raw:
+        lines = _OffsetLines(raw)
+        header = next(csv.reader(lines), None)
+        if header is None:
+            return
+        if start > lines.offset:
+            lines.skip_to(start)
+
+        if compact_rows:
+            index = Record.build_index(header)
+            # csv.DictReader skips blank lines too
+            rows = (Record(index, values) for values in csv.reader(lines) if values)
+        else:
+            rows = csv.DictReader(lines, fieldnames=header)
+
+        for row in rows:
+            yield row, lines.offset
+
+
+def read_jsonl_rows(path: Path, *, compact_rows: bool = False, start: int = 0) -> Generator[tuple]:
+    """Yield (row, end offset) pairs from one JSON object per line, values as strings"""
+    index: dict[str, int] = {}
+    with open_decompressed(path) as raw:
+        lines = _OffsetLines(raw)
+        if start:
+            lines.skip_to(start)
+
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                item = json.loads(line)
+            except ValueError as e:
+                raise ValueError(f"JSON inválido antes do byte {lines.offset}: {e}") from e
+            if not isinstance(item, dict):
+                raise ValueError(f"Linha antes do byte {lines.offset} não é um objeto JSON")
+
+            row = {key: _text(value) for key, value in item.items()}
+            if compact_rows:
+                # Keys first seen on a later line extend the index; earlier records keep theirs
+                for key in row:
+                    if key not in index:
+                        index = {**index, key: len(index)}
+                yield Record(index, tuple(row.get(key) for key in index)), lines.offset
+            else:
+                yield row, lines.offset
+
+
+def read_parquet_rows(path: Path, *, compact_rows: bool = False, start: int = 0) -> Generator[tuple]:
+    """Yield (row, row number) pairs, decoding one row group at a time.
+
+    Row groups entirely before `start` are skipped from the footer metadata,
+    without being read.
+    """
+    if pq is None:
+        raise RuntimeError("Arquivos Parquet requerem o pyarrow: instale com `uv sync --extra parquet`.")
+
+    parquet = pq.ParquetFile(path)
+    try:
+        header = parquet.schema_arrow.names
+        index = Record.build_index(header)
+        position = 0
+        for group in range(parquet.num_row_groups):
+            group_rows = parquet.metadata.row_group(group).num_rows
+            if position + group_rows <= start:
+                position += group_rows
+                continue
+
+            table = parquet.read_row_group(group)
+            for batch in table.to_batches(max_chunksize=PARQUET_SLICE_ROWS):
+                if position + batch.num_rows <= start:
+                    position += batch.num_rows
+                    continue
+                columns = [[_text(v) for v in column.to_pylist()] for column in batch.columns]
+                for values in zip(*columns):
+                    position += 1
+                    if position <= start:
+                        continue
+                    yield (Record(index, values) if compact_rows else dict(zip(header, values))), position
+            # Released before the next group is decoded, so only one is in memory
+            del table
+    finally:
+        parquet.close()
+
+
+READERS: dict[str, Callable[..., Generator[tuple]]] = {
+    "csv": read_csv_rows,
+    "jsonl": read_jsonl_rows,
+    "parquet": read_parquet_rows,
+}
+
+
+def read_rows(
+    path: Path, input_format: str = "auto", *, compact_rows: bool = False, start: int = 0
+) -> Generator[tuple]:
+    """Yield (row, position) pairs from any supported input, picked by `input_format` or the file.
+
+    Positions only grow and are what checkpoint journals record: byte offsets
+    of the decompressed content for CSV and JSONL, row numbers for Parquet.
+    """
+    if input_format == "auto":
+        input_format = detect_format(path)
+    if input_format not in READERS:
+        raise ValueError(f"Formato de entrada desconhecido: {input_format}")
+    return READERS[input_format](path, compact_rows=compact_rows, start=start)
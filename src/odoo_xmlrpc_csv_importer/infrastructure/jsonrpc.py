@@ -0,0 +1,124 @@
+import gzip
+import http.client
+import itertools
+import json
+import urllib.parse
+import xmlrpc.client
+from functools import partial
+
+from odoo_xmlrpc_csv_importer.infrastructure.transport import ConnectionStats
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+def json_dumps(payload) -> bytes:
+    """Encode with orjson when available, falling back to the stdlib codec"""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, separators=(",", ":")).encode()
+
+
+def json_loads(data: bytes):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def fault_from_error(error: dict) -> xmlrpc.client.Fault:
+    """Map a JSON-RPC error object to the Fault raised by the XML-RPC backend"""
+    data = error.get("data") or {}
+    return xmlrpc.client.Fault(
+        data.get("name") or error.get("code", 1),
+        data.get("message") or error.get("message", "Odoo Server Error"),
+    )
+
+
+class JsonRpcProxy:
+    """Keep-alive client for Odoo's /jsonrpc endpoint, called like a `ServerProxy` of one service."""
+
+    def __init__(
+        self,
+        endpoint: str,
+        service: str,
+        *,
+        stats: ConnectionStats,
+        gzip_min_bytes: int | None = None,
+        timeout: float | None = None,
+    ) -> None:
+        parsed = urllib.parse.urlsplit(endpoint)
+        self._connection_cls = (
+            http.client.HTTPSConnection
+            if parsed.scheme == "https"
+            else http.client.HTTPConnection
+        )
+        self._netloc = parsed.netloc
+        self._path = parsed.path or "/jsonrpc"
+        self.service = service
+        self.stats = stats
+        self.gzip_min_bytes = gzip_min_bytes
+        self.timeout = timeout
+
+        self._connection: http.client.HTTPConnection | None = None
+        self._ids = itertools.count(1)
+
+    def __getattr__(self, method: str):
+        if method.startswith("_"):
+            raise AttributeError(method)
+        return partial(self._call, method)
+
+    def _call(self, method: str, *args):
+        body = json_dumps(
+            {
+                "jsonrpc": "2.0",
+                "method": "call",
+                "params": {"service": self.service, "method": method, "args": list(args)},
+                "id": next(self._ids),
+            }
+        )
+        headers = {"Content-Type": "application/json", "Accept-Encoding": "gzip"}
+        if self.gzip_min_bytes is not None and len(body) > self.gzip_min_bytes:
+            body = gzip.compress(body)
+            headers["Content-Encoding"] = "gzip"
+
+        response = json_loads(self._post(body, headers))
+        if response.get("error"):
+            raise fault_from_error(response["error"])
+        return response.get("result")
+
+    def _post(self, body: bytes, headers: dict) -> bytes:
+        # Retry once when a cached keep-alive connection was closed by the server
+        for attempt in (0, 1):
+            reused = self._connection is not None
+            if not reused:
+                self._connection = self._connection_cls(self._netloc, timeout=self.timeout)
+            self.stats.record(reused=reused)
+
+            try:
+                self._connection.request("POST", self._path, body, headers)
+                response = self._connection.getresponse()
+                data = response.read()
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                self.close()
+                if attempt or not reused:
+                    raise
+                continue
+            except Exception:
+                self.close()
+                raise
+
+            self.stats.record_bytes(sent=len(body), received=len(data))
+            if response.status != 200:
+                raise xmlrpc.client.ProtocolError(
+                    self._netloc + self._path, response.status, response.reason, dict(response.getheaders())
+                )
+            if response.getheader("Content-Encoding") == "gzip":
+                data = gzip.decompress(data)
+            return data
+
+    def close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
@@ -0,0 +1,192 @@
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from odoo_xmlrpc_csv_importer.infrastructure.import_stats import ImportStats
+from odoo_xmlrpc_csv_importer.infrastructure.logger import logger
+from odoo_xmlrpc_csv_importer.infrastructure.transport import ConnectionStats
+
+OPENMETRICS_CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# (metric family, ImportStats/ConnectionStats snapshot key, help)
+_COUNTERS = (
+    ("etl_contacts_created", "contacts_created", "Contacts created in Odoo."),
+    ("etl_contacts_loaded", "contacts_loaded", "Contacts upserted by res.partner.load, created or updated."),
+    ("etl_contacts_updated", "contacts_updated", "Existing partners written."),
+    ("etl_contacts_skipped", "contacts_skipped_odoo", "Contacts already in Odoo."),
+    ("etl_contacts_unchanged", "contacts_unchanged", "Contacts skipped by the sync state."),
+    ("etl_contacts_rejected", "contacts_rejected", "Rows isolated by bisection and sent to the DLQ."),
+    ("etl_validation_errors", "validation_errors", "Rows rejected by validation."),
+    ("etl_batches_completed", "batches_completed", "Batches finished, failed ones included."),
+    ("etl_batch_errors", "batch_errors", "Batches sent whole to the DLQ."),
+    ("etl_batches_requeued", "batches_requeued", "Batches rerun after an outage."),
+    ("etl_rpc_requests", "requests", "HTTP requests sent to Odoo."),
+    ("etl_rpc_sent_bytes", "bytes_sent", "Request bytes sent to Odoo, as on the wire."),
+    ("etl_rpc_received_bytes", "bytes_received", "Response bytes received from Odoo, as on the wire."),
+)
+
+
+def _format_bound(bound: float) -> str:
+    return "+Inf" if bound == float("inf") else repr(bound)
+
+
+def render_metrics(
+    import_stats: ImportStats, connection_stats: ConnectionStats, *, openmetrics: bool = True
+) -> str:
+    """Exposition text in OpenMetrics, or in the Prometheus 0.0.4 format textfile collectors read"""
+    values = {**import_stats.snapshot(), **connection_stats.snapshot()}
+    lines = []
+
+    for family, key, help_text in _COUNTERS:
+        # OpenMetrics names the family without the _total suffix of its sample
+        lines.append(f"# TYPE {family if openmetrics else family + '_total'} counter")
+        lines.append(f"# HELP {family if openmetrics else family + '_total'} {help_text}")
+        lines.append(f"{family}_total {values[key]}")
+
+    lines.append("# TYPE etl_active_workers gauge")
+    lines.append("# HELP etl_active_workers Workers running a batch or a stage right now.")
+    lines.append(f"etl_active_workers {values['active_workers']}")
+
+    family = "etl_stage_duration_seconds"
+    lines.append(f"# TYPE {family} histogram")
+    lines.append(f"# HELP {family} Duration of each stage, per batch (per chunk for csv_read and validation).")
+    for stage, histogram in sorted(import_stats.stage_histograms().items()):
+        for bound, count in histogram.cumulative():
+            lines.append(f'{family}_bucket{{stage="{stage}",le="{_format_bound(bound)}"}} {count}')
+        lines.append(f'{family}_count{{stage="{stage}"}} {histogram.count}')
+        lines.append(f'{family}_sum{{stage="{stage}"}} {histogram.sum!r}')
+
+    if openmetrics:
+        lines.append("# EOF")
+    return "\n".join(lines) + "\n"
+
+
+def build_report(
+    import_stats: ImportStats, connection_stats: ConnectionStats, *, wall_seconds: float
+) -> dict:
+    """End-of-run summary: counters, RPC traffic and p50/p95/p99 per stage"""
+    return {
+        "wall_seconds": round(wall_seconds, 3),
+        "counters": import_stats.snapshot(),
+        "rpc": connection_stats.snapshot(),
+        "stages": {
+            stage: histogram.summary()
+            for stage, histogram in sorted(import_stats.stage_histograms().items())
+        },
+    }
+
+
+def _write_atomically(path: Path, text: str) -> None:
+    # Collectors may read at any moment; they must never see a half-written file
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, path)
+
+
+class MetricsExporter:
+    """Publish the metrics of a running import on an HTTP endpoint, a textfile, or both.
+
+    The endpoint answers `GET /metrics` in OpenMetrics when the scraper asks for
+    it and in the Prometheus text format otherwise. The textfile, meant for the
+    node_exporter textfile collector, is rewritten every `interval` seconds and
+    once more on `stop()`.
+    """
+
+    def __init__(
+        self,
+        import_stats: ImportStats,
+        connection_stats: ConnectionStats,
+        *,
+        port: int | None = None,
+        host: str = "0.0.0.0",
+        textfile: Path | None = None,
+        interval: float = 15.0,
+    ) -> None:
+        self.import_stats = import_stats
+        self.connection_stats = connection_stats
+        self.port = port
+        self.host = host
+        self.textfile = textfile
+        self.interval = interval
+        self.started_at = time.perf_counter()
+
+        self._server: ThreadingHTTPServer | None = None
+        self._writer: threading.Thread | None = None
+        self._stopped = threading.Event()
+
+    def render(self, *, openmetrics: bool = True) -> str:
+        return render_metrics(self.import_stats, self.connection_stats, openmetrics=openmetrics)
+
+    def start(self) -> "MetricsExporter":
+        if self.port is not None:
+            self._server = ThreadingHTTPServer((self.host, self.port), _handler_for(self))
+            self._server.daemon_threads = True
+            # Port 0 picks a free port; report the real one
+            self.port = self._server.server_address[1]
+            threading.Thread(
+                target=self._server.serve_forever, name="metrics-http", daemon=True
+            ).start()
+            logger.info("metricas_http", porta=self.port)
+
+        if self.textfile is not None:
+            self._writer = threading.Thread(
+                target=self._write_periodically, name="metrics-textfile", daemon=True
+            )
+            self._writer.start()
+        return self
+
+    def _write_textfile(self) -> None:
+        try:
+            _write_atomically(Path(self.textfile), self.render(openmetrics=False))
+        except OSError as e:
+            logger.warning("falha_textfile_metricas", error=str(e))
+
+    def _write_periodically(self) -> None:
+        while not self._stopped.wait(self.interval):
+            self._write_textfile()
+
+    def write_report(self, path: Path) -> None:
+        report = build_report(
+            self.import_stats,
+            self.connection_stats,
+            wall_seconds=time.perf_counter() - self.started_at,
+        )
+        _write_atomically(Path(path), json.dumps(report, indent=2, ensure_ascii=False) + "\n")
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._writer is not None:
+            self._writer.join()
+            self._write_textfile()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+
+
+def _handler_for(exporter: MetricsExporter) -> type[BaseHTTPRequestHandler]:
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+
+            openmetrics = "application/openmetrics-text" in self.headers.get("Accept", "")
+            body = exporter.render(openmetrics=openmetrics).encode("utf-8")
+            self.send_response(200)
+            self.send_header(
+                "Content-Type",
+                OPENMETRICS_CONTENT_TYPE if openmetrics else PROMETHEUS_CONTENT_TYPE,
+            )
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args) -> None:
+            # Scrapes every few seconds would flood the import output
+            pass
+
+    return MetricsHandler
@@ -1,22 +1,169 @@
-import xmlrpc.client
+from contextlib import contextmanager, nullcontext
+from typing import Iterator
 
 from pydantic import HttpUrl
 from tenacity import (
     retry,
+    retry_if_exception,
     stop_after_attempt,
     wait_exponential,
 )
 
+from odoo_xmlrpc_csv_importer.core.record import as_dicts
+from odoo_xmlrpc_csv_importer.domain.contact import CONTACT_FIELDS, contact_external_id
+from odoo_xmlrpc_csv_importer.infrastructure.circuit_breaker import CircuitBreaker
 from odoo_xmlrpc_csv_importer.infrastructure.logger import logger
+from odoo_xmlrpc_csv_importer.infrastructure.retry_policy import (
+    is_outage_error,
+    is_transient_error,
+)
+from odoo_xmlrpc_csv_importer.infrastructure.tracer import Tracer
+from odoo_xmlrpc_csv_importer.infrastructure.transport import (
+    ConnectionPool,
+    ConnectionStats,
+)
+
+
+# `load` takes column-oriented rows; many2one columns are resolved by name on the server
+LOAD_FIELDS = ["id", *CONTACT_FIELDS]
+
+
+class LoadError(Exception):
+    """res.partner.load reported errors, so Odoo rolled back the whole batch"""
+
+    def __init__(self, messages: list[dict]) -> None:
+        self.messages = messages
+        super().__init__(" | ".join(m.get("message", "") for m in messages))
+
+
+def build_load_rows(contacts: list) -> list[list[str]]:
+    return [
+        [
+            contact_external_id(contact["email"]),
+            *("" if contact.get(f) in (None, False) else str(contact[f]) for f in CONTACT_FIELDS),
+        ]
+        for contact in contacts
+    ]
+
+
+def parse_load_result(result: dict) -> list[int]:
+    errors = [m for m in result.get("messages", []) if m.get("type") == "error"]
+    if errors:
+        raise LoadError(errors)
+    return result["ids"]
+
+
+_backoff = wait_exponential(multiplier=1, min=2, max=10)
+
+
+def _coordinated_wait(retry_state) -> float:
+    """No private backoff while the circuit is open: the next attempt waits for the probe"""
+    breaker = retry_state.args[0].breaker
+    if breaker is not None and breaker.is_open:
+        return 0
+    return _backoff(retry_state)
 
 
 class OdooClient:
-    def __init__(self, *, url: HttpUrl, db: str, username: str, password: str):
-        self.url = url
+    def __init__(
+        self,
+        *,
+        url: HttpUrl,
+        db: str,
+        username: str,
+        password: str,
+        pool_size: int = 4,
+        gzip_min_bytes: int | None = None,
+        protocol: str = "xmlrpc",
+        breaker: CircuitBreaker | None = None,
+        tracer: Tracer | None = None,
+    ):
+        self.url = str(url).rstrip("/")
         self.db = db
         self.username = username
         self.password = password
         self.uid = None
+        self.protocol = protocol
+        self.tracer = tracer
+
+        # Both endpoints share the counters, so reuse is reported once per client
+        self.connection_stats = ConnectionStats()
+        self._common_pool = self._build_pool("common", 1, gzip_min_bytes)
+        self._models_pool = self._build_pool("object", pool_size, gzip_min_bytes)
+
+        # Shared by every thread using this client, so an outage pauses them together
+        self.breaker = breaker
+        if breaker is not None:
+            breaker.probe = self._probe
+            # Paused workers hold every pooled connection, so the probe brings its own
+            self._probe_pool = self._build_pool("object", 1, None)
+
+    def _build_pool(self, service: str, size: int, gzip_min_bytes: int | None) -> ConnectionPool:
+        endpoint = (
+            f"{self.url}/jsonrpc"
+            if self.protocol == "jsonrpc"
+            else f"{self.url}/xmlrpc/2/{service}"
+        )
+        return ConnectionPool(
+            endpoint,
+            max_size=size,
+            gzip_min_bytes=gzip_min_bytes,
+            stats=self.connection_stats,
+            protocol=self.protocol,
+            service=service,
+        )
+
+    @contextmanager
+    def models(self):
+        """Borrow a keep-alive proxy to the object endpoint from the pool"""
+        with self._models_pool.connection() as models:
+            yield models
+
+    def close(self) -> None:
+        self._common_pool.close()
+        self._models_pool.close()
+        if self.breaker is not None:
+            self._probe_pool.close()
+
+    def _execute(self, models, model: str, method: str, args: list, kwargs: dict | None = None):
+        """Run one `execute_kw` call through the circuit breaker, when there is one"""
+        call_args = (self.db, self.uid, self.password, model, method, args)
+        if kwargs is not None:
+            call_args += (kwargs,)
+        if self.breaker is not None:
+            self.breaker.wait_closed()
+
+        span = (
+            self.tracer.span(f"{model}.{method}", "rpc")
+            if self.tracer is not None
+            else nullcontext()
+        )
+        try:
+            with span:
+                result = models.execute_kw(*call_args)
+        except Exception as e:
+            if self.breaker is not None:
+                if is_outage_error(e):
+                    self.breaker.record_failure()
+                else:
+                    self.breaker.record_success()
+            raise
+        if self.breaker is not None:
+            self.breaker.record_success()
+        return result
+
+    def _probe(self) -> None:
+        """The cheapest authenticated call, run alone while the circuit is open"""
+        with self._probe_pool.connection() as models:
+            models.execute_kw(
+                self.db,
+                self.uid,
+                self.password,
+                "res.partner",
+                "search",
+                [[["id", "=", 0]]],
+                {"limit": 1},
+            )
 
     @retry(
         stop=stop_after_attempt(3),
@@ -26,8 +173,8 @@ class OdooClient:
     def authenticate(self) -> None:
         """authenticate the user information to return uid"""
         try:
-            common = xmlrpc.client.ServerProxy(f"{self.url}/xmlrpc/2/common")
-            uid = common.authenticate(self.db, self.username, self.password, {})
+            with self._common_pool.connection() as common:
+                uid = common.authenticate(self.db, self.username, self.password, {})
 
             if not uid:
                 raise ValueError("Falha na autenticação. Verifique as credenciais.")
@@ -38,33 +185,28 @@ class OdooClient:
             logger.info(f"Erro ao autenticar usuário: {e}")
 
     @retry(
+        retry=retry_if_exception(is_transient_error),
         stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
+        wait=_coordinated_wait,
         reraise=True,
     )
     def get_country_id(self, models, country_name: str):
         """get the country id based on the country name"""
-        country_ids = models.execute_kw(
-            self.db,
-            self.uid,
-            self.password,
-            "res.country",
-            "search",
-            [[("name", "=", country_name)]],
+        country_ids = self._execute(
+            models, "res.country", "search", [[("name", "=", country_name)]]
         )
         return country_ids[0] if country_ids else False
 
     @retry(
+        retry=retry_if_exception(is_transient_error),
         stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
+        wait=_coordinated_wait,
         reraise=True,
     )
     def get_state_id(self, models, country_id, state_name: str):
         """get the state id based on the state name"""
-        state_ids = models.execute_kw(
-            self.db,
-            self.uid,
-            self.password,
+        state_ids = self._execute(
+            models,
             "res.country.state",
             "search",
             [[("name", "=", state_name), ("country_id", "=", country_id)]],
@@ -72,20 +214,55 @@ class OdooClient:
         return state_ids[0] if state_ids else False
 
     @retry(
+        retry=retry_if_exception(is_transient_error),
         stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
+        wait=_coordinated_wait,
+        reraise=True,
+    )
+    def search_read_page(
+        self, models, model: str, domain: list, fields: list, *, offset: int, limit: int
+    ) -> list:
+        """Read a single page of records ordered by id"""
+        return (
+            self._execute(
+                models,
+                model,
+                "search_read",
+                [domain],
+                {"fields": fields, "offset": offset, "limit": limit, "order": "id"},
+            )
+            or []
+        )
+
+    def search_read_all(
+        self, models, model: str, domain: list, fields: list, page_size: int = 1000
+    ) -> Iterator[dict]:
+        """Stream every record matching the domain, one page per RPC"""
+        offset = 0
+        while True:
+            page = self.search_read_page(
+                models, model, domain, fields, offset=offset, limit=page_size
+            )
+            yield from page
+
+            if len(page) < page_size:
+                return
+            offset += page_size
+
+    @retry(
+        retry=retry_if_exception(is_transient_error),
+        stop=stop_after_attempt(3),
+        wait=_coordinated_wait,
         reraise=True,
     )
-    def search_records(self, models, emails_to_search: set) -> list:
+    def search_records(self, models, emails_to_search: set, fields=("email",)) -> list:
         records_db = (
-            models.execute_kw(
-                self.db,
-                self.uid,
-                self.password,
+            self._execute(
+                models,
                 "res.partner",
                 "search_read",
                 [[["email", "in", list(emails_to_search)]]],
-                {"fields": ["email"]},
+                {"fields": list(fields)},
             )
             or []
         )
@@ -93,12 +270,34 @@ class OdooClient:
         return records_db
 
     @retry(
+        retry=retry_if_exception(is_transient_error),
         stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
+        wait=_coordinated_wait,
+        reraise=True,
+    )
+    def create_contacts(self, models, contacts: list) -> list[int]:
+        """Create contacts in Odoo database and return their ids, in order"""
+        return self._execute(models, "res.partner", "create", [as_dicts(contacts)])
+
+    @retry(
+        retry=retry_if_exception(is_transient_error),
+        stop=stop_after_attempt(3),
+        wait=_coordinated_wait,
+        reraise=True,
+    )
+    def write_contacts(self, models, partner_ids: list[int], values: dict) -> bool:
+        """Apply the same values to every partner id in a single `write` call"""
+        return self._execute(models, "res.partner", "write", [partner_ids, dict(values)])
+
+    @retry(
+        retry=retry_if_exception(is_transient_error),
+        stop=stop_after_attempt(3),
+        wait=_coordinated_wait,
         reraise=True,
     )
-    def create_contacts(self, models, contacts: list) -> None:
-        """Create contacts in Odoo database"""
-        models.execute_kw(
-            self.db, self.uid, self.password, "res.partner", "create", [contacts]
+    def load_contacts(self, models, contacts: list) -> list[int]:
+        """Create or update contacts by external id in a single `load` call"""
+        result = self._execute(
+            models, "res.partner", "load", [LOAD_FIELDS, build_load_rows(contacts)]
         )
+        return parse_load_result(result)
@@ -0,0 +1,130 @@
+import sqlite3
+import threading
+import time
+from typing import Iterable
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS refs (
+    scope TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value INTEGER NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (scope, kind, key)
+);
+CREATE TABLE IF NOT EXISTS partners (
+    scope TEXT NOT NULL,
+    email TEXT NOT NULL,
+    partner_id INTEGER NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (scope, email)
+);
+"""
+
+# SQLite caps the number of bound parameters per statement
+_MAX_PARAMS = 900
+
+
+class PersistentCache:
+    """SQLite store for reference and partner ids, shared across runs of the same Odoo database."""
+
+    def __init__(self, path: str, *, url: str, db: str, ttl_seconds: int) -> None:
+        self.path = path
+        self.scope = f"{str(url).rstrip('/')}|{db}"
+        self.ttl_seconds = ttl_seconds
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self.prune_expired()
+
+    def _fresh_after(self) -> float:
+        return time.time() - self.ttl_seconds
+
+    def get_reference(self, kind: str, key: str) -> int | bool | None:
+        """Cached id, False for a cached miss, or None when unknown or expired"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM refs WHERE scope = ? AND kind = ? AND key = ? AND updated_at >= ?",
+                (self.scope, kind, key, self._fresh_after()),
+            ).fetchone()
+
+        if row is None:
+            return None
+        return row[0] or False
+
+    def set_reference(self, kind: str, key: str, value: int | bool) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO refs VALUES (?, ?, ?, ?, ?)",
+                (self.scope, kind, key, int(value or 0), time.time()),
+            )
+
+    def get_references(self, kind: str) -> dict[str, int | bool]:
+        """Every fresh entry of one kind, cached misses as False"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, value FROM refs WHERE scope = ? AND kind = ? AND updated_at >= ?",
+                (self.scope, kind, self._fresh_after()),
+            ).fetchall()
+        return {key: value or False for key, value in rows}
+
+    def set_references(self, kind: str, values: dict[str, int | bool]) -> None:
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO refs VALUES (?, ?, ?, ?, ?)",
+                [(self.scope, kind, key, int(value or 0), now) for key, value in values.items()],
+            )
+
+    def get_partner_ids(self, emails: Iterable[str]) -> dict[str, int]:
+        """Known res.partner ids for the given emails, ignoring expired entries"""
+        emails = list(emails)
+        found = {}
+
+        with self._lock:
+            for start in range(0, len(emails), _MAX_PARAMS):
+                chunk = emails[start : start + _MAX_PARAMS]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT email, partner_id FROM partners WHERE scope = ? AND updated_at >= ? AND email IN ({placeholders})",
+                    (self.scope, self._fresh_after(), *chunk),
+                )
+                found.update(rows)
+
+        return found
+
+    def set_partner_ids(self, partner_ids: dict[str, int]) -> None:
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO partners VALUES (?, ?, ?, ?)",
+                [(self.scope, email, pid, now) for email, pid in partner_ids.items()],
+            )
+
+    def prune_expired(self) -> None:
+        with self._lock, self._conn:
+            for table in ("refs", "partners"):
+                self._conn.execute(
+                    f"DELETE FROM {table} WHERE scope = ? AND updated_at < ?",
+                    (self.scope, self._fresh_after()),
+                )
+
+    def invalidate(self, *, all_scopes: bool = False) -> int:
+        """Drop cached entries for this Odoo database (or every database); returns rows removed"""
+        removed = 0
+        with self._lock, self._conn:
+            for table in ("refs", "partners"):
+                if all_scopes:
+                    cursor = self._conn.execute(f"DELETE FROM {table}")
+                else:
+                    cursor = self._conn.execute(
+                        f"DELETE FROM {table} WHERE scope = ?", (self.scope,)
+                    )
+                removed += cursor.rowcount
+        return removed
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
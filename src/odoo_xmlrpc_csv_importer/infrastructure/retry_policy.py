@@ -0,0 +1,69 @@
+import http.client
+import xmlrpc.client
+
+from odoo_xmlrpc_csv_importer.infrastructure.circuit_breaker import CircuitOpenError
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - optional dependency
+    httpx = None
+
+# PostgreSQL errors Odoo surfaces as a Fault although resending succeeds
+_TRANSIENT_FAULTS = (
+    "could not serialize access",
+    "concurrent update",
+    "deadlock detected",
+    "lock not available",
+)
+
+
+def _transient_status(status: int) -> bool:
+    return status >= 500 or status in (408, 429)
+
+
+def is_transient_error(error: BaseException) -> bool:
+    """True for outages worth retrying as is, False for data errors the same payload repeats.
+
+    Network failures, timeouts, 5xx/429 responses and serialization conflicts
+    are transient; any other Fault (constraints, access rights, bad values) and
+    `LoadError` describe the rows themselves. `CircuitOpenError` is not: the
+    breaker already waited its whole budget, so retrying would only wait again.
+    """
+    if isinstance(error, CircuitOpenError):
+        return False
+
+    if isinstance(error, xmlrpc.client.Fault):
+        message = str(error.faultString).lower()
+        return any(marker in message for marker in _TRANSIENT_FAULTS)
+
+    if isinstance(error, xmlrpc.client.ProtocolError):
+        return _transient_status(error.errcode)
+
+    # Covers ConnectionError, TimeoutError and socket errors
+    if isinstance(error, (OSError, http.client.HTTPException)):
+        return True
+
+    if httpx is not None:
+        if isinstance(error, httpx.HTTPStatusError):
+            return _transient_status(error.response.status_code)
+        if isinstance(error, httpx.TransportError):
+            return True
+
+    return False
+
+
+def is_call_error(error: BaseException) -> bool:
+    """The call failed rather than the rows: transient errors and a breaker that gave up.
+
+    Bisection stops on these, since resending halves would fail the same way.
+    """
+    return is_transient_error(error) or isinstance(error, CircuitOpenError)
+
+
+def is_outage_error(error: BaseException) -> bool:
+    """Transient errors where the server did not answer at all.
+
+    A serialization Fault is worth retrying but proves Odoo is up, so only
+    these count towards opening the circuit breaker.
+    """
+    return is_transient_error(error) and not isinstance(error, xmlrpc.client.Fault)
@@ -0,0 +1,74 @@
+import sqlite3
+import threading
+import time
+from typing import Iterable
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS contacts (
+    scope TEXT NOT NULL,
+    email TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    partner_id INTEGER NOT NULL,
+    synced_at REAL NOT NULL,
+    PRIMARY KEY (scope, email)
+);
+"""
+
+# SQLite caps the number of bound parameters per statement
+_MAX_PARAMS = 900
+
+
+class SyncStateStore:
+    """SQLite map of email -> (content hash, res.partner id) for `etl sync`, per Odoo database.
+
+    Unlike the persistent cache, entries never expire: they are the baseline
+    every nightly run is compared against.
+    """
+
+    def __init__(self, path: str, *, url: str, db: str) -> None:
+        self.path = path
+        self.scope = f"{str(url).rstrip('/')}|{db}"
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def get(self, emails: Iterable[str]) -> dict[str, tuple[str, int]]:
+        """(content hash, partner id) of the emails synced before"""
+        emails = list(emails)
+        found = {}
+
+        with self._lock:
+            for start in range(0, len(emails), _MAX_PARAMS):
+                chunk = emails[start : start + _MAX_PARAMS]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT email, content_hash, partner_id FROM contacts WHERE scope = ? AND email IN ({placeholders})",
+                    (self.scope, *chunk),
+                )
+                found.update((email, (content_hash, pid)) for email, content_hash, pid in rows)
+
+        return found
+
+    def set(self, entries: dict[str, tuple[str, int]]) -> None:
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO contacts VALUES (?, ?, ?, ?, ?)",
+                [
+                    (self.scope, email, content_hash, pid, now)
+                    for email, (content_hash, pid) in entries.items()
+                ],
+            )
+
+    def __len__(self) -> int:
+        with self._lock:
+            (count,) = self._conn.execute(
+                "SELECT COUNT(*) FROM contacts WHERE scope = ?", (self.scope,)
+            ).fetchone()
+        return count
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
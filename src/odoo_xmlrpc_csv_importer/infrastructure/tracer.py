@@ -0,0 +1,137 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+
+# Batch number and, for asyncio tasks, virtual track of the code running now
+_current_batch: ContextVar[int | None] = ContextVar("trace_batch", default=None)
+_current_track: ContextVar[int | None] = ContextVar("trace_track", default=None)
+
+# Virtual thread ids of asyncio batches, far from real native thread ids
+_TRACK_BASE = 1 << 40
+
+
+class Tracer:
+    """Collect spans in memory and write them as Chrome trace events (chrome://tracing, Perfetto).
+
+    Spans are complete ("X") events on the thread that ran them, tagged with
+    the batch being processed. Time a batch spent queued before a worker took it
+    is an async event on its own track, since queued batches overlap. Asyncio
+    batches share one thread, so each gets a virtual track of its own.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self.pid = os.getpid()
+        self._origin = time.perf_counter()
+        self._events: deque[dict] = deque()
+        self._tracks: dict[int, str] = {}
+        self._queued: dict[int, float] = {}
+
+    def _us(self, seconds: float) -> float:
+        return round((seconds - self._origin) * 1_000_000, 3)
+
+    def _tid(self) -> int:
+        track = _current_track.get()
+        if track is not None:
+            return track
+        tid = threading.get_native_id()
+        if tid not in self._tracks:
+            self._tracks[tid] = threading.current_thread().name
+        return tid
+
+    def complete(self, name: str, category: str, started: float, ended: float, **args) -> None:
+        """Record a span from perf_counter() timestamps"""
+        batch = _current_batch.get()
+        if batch is not None:
+            args.setdefault("batch", batch)
+        # deque.append is atomic, so recording never takes a lock
+        self._events.append(
+            {
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                "ts": self._us(started),
+                "dur": round((ended - started) * 1_000_000, 3),
+                "pid": self.pid,
+                "tid": self._tid(),
+                "args": args,
+            }
+        )
+
+    @contextmanager
+    def span(self, name: str, category: str, **args):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.complete(name, category, started, time.perf_counter(), **args)
+
+    def mark_queued(self, number: int) -> None:
+        """The batch is ready and waits for a worker"""
+        self._queued[number] = time.perf_counter()
+
+    def _emit_queued(self, number: int, ended: float) -> None:
+        queued_at = self._queued.pop(number, None)
+        if queued_at is None:
+            return
+        for phase, ts in (("b", queued_at), ("e", ended)):
+            self._events.append(
+                {
+                    "name": "queued",
+                    "cat": "queue",
+                    "ph": phase,
+                    "id": number,
+                    "ts": self._us(ts),
+                    "pid": self.pid,
+                    "tid": self._tid(),
+                    "args": {"batch": number},
+                }
+            )
+
+    @contextmanager
+    def batch(self, number: int, rows: int, *, own_track: bool = False):
+        """Span of one batch; spans recorded inside it are tagged with its number"""
+        track_token = None
+        if own_track:
+            track = _TRACK_BASE + number
+            self._tracks[track] = f"lote {number}"
+            track_token = _current_track.set(track)
+        batch_token = _current_batch.set(number)
+        started = time.perf_counter()
+        self._emit_queued(number, started)
+        try:
+            yield
+        finally:
+            self.complete(f"lote {number}", "batch", started, time.perf_counter(), rows=rows)
+            _current_batch.reset(batch_token)
+            if track_token is not None:
+                _current_track.reset(track_token)
+
+    @contextmanager
+    def tagged(self, number: int):
+        """Tag spans with a batch number without opening a batch span (pipeline stages)"""
+        token = _current_batch.set(number)
+        try:
+            yield
+        finally:
+            _current_batch.reset(token)
+
+    def write(self) -> None:
+        metadata = [
+            {"name": "process_name", "ph": "M", "pid": self.pid, "args": {"name": "etl"}},
+            *(
+                {"name": "thread_name", "ph": "M", "pid": self.pid, "tid": tid, "args": {"name": name}}
+                for tid, name in list(self._tracks.items())
+            ),
+        ]
+        tmp = self.path.with_name(f".{self.path.name}.tmp")
+        with tmp.open("w", encoding="utf-8") as file:
+            json.dump(
+                {"traceEvents": metadata + list(self._events), "displayTimeUnit": "ms"}, file
+            )
+        os.replace(tmp, self.path)
@@ -0,0 +1,168 @@
+import threading
+import xmlrpc.client
+from contextlib import contextmanager
+from typing import Iterator
+
+
+class ConnectionStats:
+    """Thread safe counters of opened and reused HTTP connections."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.connections_opened = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+
+    def record(self, *, reused: bool) -> None:
+        with self._lock:
+            self.requests += 1
+            if not reused:
+                self.connections_opened += 1
+
+    def record_bytes(self, *, sent: int = 0, received: int = 0) -> None:
+        """Count request and response bodies as sent on the wire, compressed or not"""
+        with self._lock:
+            self.bytes_sent += sent
+            self.bytes_received += received
+
+    def snapshot(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "connections_opened": self.connections_opened,
+                "connections_reused": self.requests - self.connections_opened,
+                "bytes_sent": self.bytes_sent,
+                "bytes_received": self.bytes_received,
+            }
+
+
+class _CountingResponse:
+    """Expose an HTTP response to `parse_response`, counting the body bytes read"""
+
+    def __init__(self, response, stats: ConnectionStats) -> None:
+        self._response = response
+        self._stats = stats
+
+    def read(self, amt=None) -> bytes:
+        data = self._response.read(amt)
+        self._stats.record_bytes(received=len(data))
+        return data
+
+    def __getattr__(self, name: str):
+        return getattr(self._response, name)
+
+
+class _KeepAliveMixin:
+    """Count whether each request reuses the cached HTTP/1.1 connection, and its bytes"""
+
+    stats: ConnectionStats
+
+    def make_connection(self, host):
+        reused = bool(self._connection[1]) and host == self._connection[0]
+        self.stats.record(reused=reused)
+        return super().make_connection(host)
+
+    def send_content(self, connection, request_body) -> None:
+        # Same as the stdlib, counting the body after the optional gzip encoding
+        if self.encode_threshold is not None and self.encode_threshold < len(request_body):
+            connection.putheader("Content-Encoding", "gzip")
+            request_body = xmlrpc.client.gzip_encode(request_body)
+        connection.putheader("Content-Length", str(len(request_body)))
+        self.stats.record_bytes(sent=len(request_body))
+        connection.endheaders(request_body)
+
+    def parse_response(self, response):
+        return super().parse_response(_CountingResponse(response, self.stats))
+
+
+class KeepAliveTransport(_KeepAliveMixin, xmlrpc.client.Transport):
+    def __init__(self, stats: ConnectionStats, gzip_min_bytes: int | None = None) -> None:
+        super().__init__()
+        self.stats = stats
+        # Requests larger than this are sent gzip-compressed; responses are always
+        # negotiated through Accept-Encoding
+        self.encode_threshold = gzip_min_bytes
+
+
+class KeepAliveSafeTransport(_KeepAliveMixin, xmlrpc.client.SafeTransport):
+    def __init__(self, stats: ConnectionStats, gzip_min_bytes: int | None = None) -> None:
+        super().__init__()
+        self.stats = stats
+        self.encode_threshold = gzip_min_bytes
+
+
+class ConnectionPool:
+    """Bounded pool of keep-alive proxies for a single endpoint.
+
+    Proxies are `ServerProxy` objects for XML-RPC or `JsonRpcProxy` objects for
+    JSON-RPC; both expose the same `execute_kw`/`authenticate` calls, so the
+    rest of the client does not care which protocol is in use.
+    """
+
+    def __init__(
+        self,
+        endpoint: str,
+        *,
+        max_size: int,
+        gzip_min_bytes: int | None = None,
+        stats: ConnectionStats | None = None,
+        protocol: str = "xmlrpc",
+        service: str | None = None,
+    ) -> None:
+        self.endpoint = endpoint
+        self.gzip_min_bytes = gzip_min_bytes
+        self.stats = stats if stats is not None else ConnectionStats()
+        self.protocol = protocol
+        self.service = service
+
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._idle: list = []
+        self._lock = threading.Lock()
+
+    def _new_proxy(self):
+        if self.protocol == "jsonrpc":
+            from odoo_xmlrpc_csv_importer.infrastructure.jsonrpc import JsonRpcProxy
+
+            return JsonRpcProxy(
+                self.endpoint,
+                self.service,
+                stats=self.stats,
+                gzip_min_bytes=self.gzip_min_bytes,
+            )
+
+        transport_cls = (
+            KeepAliveSafeTransport
+            if self.endpoint.startswith("https://")
+            else KeepAliveTransport
+        )
+        transport = transport_cls(self.stats, self.gzip_min_bytes)
+        return xmlrpc.client.ServerProxy(self.endpoint, transport=transport)
+
+    @contextmanager
+    def connection(self) -> Iterator:
+        """Borrow a proxy, blocking while every pooled connection is in use"""
+        self._slots.acquire()
+        try:
+            with self._lock:
+                proxy = self._idle.pop() if self._idle else None
+            if proxy is None:
+                proxy = self._new_proxy()
+
+            try:
+                yield proxy
+            finally:
+                # Most recently used first, so warm connections are picked again
+                with self._lock:
+                    self._idle.append(proxy)
+        finally:
+            self._slots.release()
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for proxy in idle:
+            if isinstance(proxy, xmlrpc.client.ServerProxy):
+                proxy("close")()
+            else:
+                proxy.close()
@@ -1,3 +1,4 @@
+from enum import Enum
 from pathlib import Path
 from typing import Annotated
 
@@ -5,21 +6,109 @@ import typer
 from rich.console import Console
 from rich.panel import Panel
 from rich.text import Text
+from typer.core import TyperGroup
 
 from odoo_xmlrpc_csv_importer.application.import_contacts import import_contacts
-from odoo_xmlrpc_csv_importer.infrastructure.config import get_settings
+from odoo_xmlrpc_csv_importer.application.replay_dlq import is_replayable, set_aside_dlq
+from odoo_xmlrpc_csv_importer.application.sync_contacts import sync_contacts
+from odoo_xmlrpc_csv_importer.core.adaptive import AdaptiveController
+from odoo_xmlrpc_csv_importer.infrastructure.checkpoint_journal import CheckpointJournal
+from odoo_xmlrpc_csv_importer.infrastructure.circuit_breaker import CircuitBreaker
+from odoo_xmlrpc_csv_importer.infrastructure.config import Settings, get_settings
 from odoo_xmlrpc_csv_importer.infrastructure.csv_manager import CsvManager
 from odoo_xmlrpc_csv_importer.infrastructure.import_stats import ImportStats
+from odoo_xmlrpc_csv_importer.infrastructure.metrics_exporter import MetricsExporter
 from odoo_xmlrpc_csv_importer.infrastructure.odoo_client import OdooClient
+from odoo_xmlrpc_csv_importer.infrastructure.persistent_cache import PersistentCache
+from odoo_xmlrpc_csv_importer.infrastructure.retry_policy import is_call_error
+from odoo_xmlrpc_csv_importer.infrastructure.sync_state import SyncStateStore
+from odoo_xmlrpc_csv_importer.infrastructure.tracer import Tracer
+from odoo_xmlrpc_csv_importer.services.partner_index import PartnerIndex
 from odoo_xmlrpc_csv_importer.services.reference_cache import ReferenceCache
 
-app = typer.Typer()
 
-COUNTRY_CACHE = {}
-STATE_CACHE = {}
+class _DefaultToImport(TyperGroup):
+    """`etl FILE [OPTIONS]`, the usage from before subcommands, still runs `etl import`"""
 
+    def parse_args(self, ctx: typer.Context, args: list[str]) -> list[str]:
+        group_options = {name for param in self.get_params(ctx) for name in param.opts}
+        if args and args[0] not in self.commands and args[0] not in group_options:
+            args = ["import", *args]
+        return super().parse_args(ctx, args)
 
-@app.command()
+
+app = typer.Typer(cls=_DefaultToImport)
+
+
+class Engine(str, Enum):
+    threads = "threads"
+    pipeline = "pipeline"
+    asyncio = "asyncio"
+
+
+class WriteMethod(str, Enum):
+    create = "create"
+    load = "load"
+
+
+class OnConflict(str, Enum):
+    skip = "skip"
+    update = "update"
+
+
+class InputFormat(str, Enum):
+    auto = "auto"
+    csv = "csv"
+    jsonl = "jsonl"
+    parquet = "parquet"
+
+
+def open_persistent_cache(settings: Settings) -> PersistentCache | None:
+    if not settings.cache_file:
+        return None
+
+    return PersistentCache(
+        settings.cache_file,
+        url=str(settings.url),
+        db=settings.db,
+        ttl_seconds=settings.cache_ttl_seconds,
+    )
+
+
+def build_circuit_breaker(settings: Settings) -> CircuitBreaker | None:
+    if settings.circuit_breaker_threshold <= 0:
+        return None
+
+    return CircuitBreaker(
+        failure_threshold=settings.circuit_breaker_threshold,
+        max_open_seconds=settings.circuit_breaker_max_wait_seconds,
+    )
+
+
+def start_metrics(
+    import_stats: ImportStats, odoo_client: OdooClient, port: int | None, textfile: Path | None
+) -> MetricsExporter:
+    return MetricsExporter(
+        import_stats, odoo_client.connection_stats, port=port, textfile=textfile
+    ).start()
+
+
+def stop_metrics(metrics: MetricsExporter | None, report: Path | None) -> None:
+    # The report is written for failed runs too: that is when it is needed most
+    if metrics is None:
+        return
+    metrics.stop()
+    if report is not None:
+        metrics.write_report(report)
+
+
+def write_trace(tracer: Tracer | None) -> None:
+    # Like the report, the trace of a failed run is kept
+    if tracer is not None:
+        tracer.write()
+
+
+@app.command("import")
 def main(
     file_name: Annotated[
         Path,
@@ -28,7 +117,7 @@ def main(
             file_okay=True,
             dir_okay=False,
             readable=True,
-            help=".CSV file to import.",
+            help="File to import: CSV or JSONL, plain, .gz or .zst, or Parquet.",
         ),
     ],
     batch_size: Annotated[
@@ -38,34 +127,170 @@ def main(
         int,
         typer.Option(help="Total of threads to perform in contacts creation."),
     ] = 4,
+    prefetch_references: Annotated[
+        bool,
+        typer.Option(
+            help="Load every country and state before the first batch, so enrichment needs no RPC."
+        ),
+    ] = True,
+    max_in_flight: Annotated[
+        int | None,
+        typer.Option(help="Maximum batches read ahead of the workers. [default: 2 x max-workers]"),
+    ] = None,
+    max_in_flight_mb: Annotated[
+        int | None,
+        typer.Option(help="Memory budget, in MB, for batches read ahead of the workers."),
+    ] = None,
+    engine: Annotated[
+        Engine,
+        typer.Option(help="threads: each worker runs a whole batch; pipeline: search, enrich and create run as separate stages; asyncio: one event loop with max-workers concurrent RPCs (requires the 'async' extra)."),
+    ] = Engine.threads,
+    validation_workers: Annotated[
+        int,
+        typer.Option(help="Processes validating CSV rows in parallel chunks; 1 validates inline."),
+    ] = 1,
+    compact_rows: Annotated[
+        bool,
+        typer.Option(help="Keep rows as compact records sharing the CSV header, converting to dicts only for the RPC payload."),
+    ] = False,
+    input_format: Annotated[
+        InputFormat,
+        typer.Option(help="Input reader; auto picks it from the extension. gzip and zstd compression are detected from the content."),
+    ] = InputFormat.auto,
+    dedup_memory_mb: Annotated[
+        int | None,
+        typer.Option(help="Cap, in MB, for email deduplication: a Bloom filter backed by an on-disk exact check."),
+    ] = None,
+    partner_index: Annotated[
+        bool,
+        typer.Option(help="Scan every res.partner email once before importing, so existence checks are local lookups."),
+    ] = False,
+    partner_index_refresh: Annotated[
+        float | None,
+        typer.Option(help="Seconds between incremental refreshes of the partner index, by write_date."),
+    ] = None,
+    journal: Annotated[
+        Path | None,
+        typer.Option(help="Checkpoint journal recording the byte range of every finished batch."),
+    ] = None,
+    resume: Annotated[
+        bool,
+        typer.Option(help="Continue from the journal, skipping batches a previous run finished."),
+    ] = False,
+    write_method: Annotated[
+        WriteMethod,
+        typer.Option(help="create: search existing emails and create only new contacts; load: upsert each batch with res.partner.load in a single RPC, keyed by an external id derived from the email."),
+    ] = WriteMethod.create,
+    on_conflict: Annotated[
+        OnConflict,
+        typer.Option(help="skip: ignore contacts whose email already exists; update: write the changed fields, one multi-id write per group of identical changes."),
+    ] = OnConflict.skip,
+    adaptive: Annotated[
+        bool,
+        typer.Option(help="Adjust in-flight batches and batch size from observed RPC latency (AIMD); --max-workers becomes the ceiling and --batch-size the starting size."),
+    ] = False,
+    metrics_port: Annotated[
+        int | None,
+        typer.Option(help="Serve OpenMetrics/Prometheus metrics on http://0.0.0.0:PORT/metrics while the run lasts."),
+    ] = None,
+    metrics_textfile: Annotated[
+        Path | None,
+        typer.Option(help="Rewrite metrics in the Prometheus text format to this file every 15 s, for the node_exporter textfile collector."),
+    ] = None,
+    metrics_report: Annotated[
+        Path | None,
+        typer.Option(help="Write a JSON report with counters, RPC bytes and p50/p95/p99 per stage at the end of the run."),
+    ] = None,
+    trace: Annotated[
+        Path | None,
+        typer.Option(help="Write a Chrome trace-event JSON of every batch, stage and RPC (open in chrome://tracing or ui.perfetto.dev)."),
+    ] = None,
+    search_workers: Annotated[
+        int | None,
+        typer.Option(help="Pipeline engine: threads checking existing emails. [default: max-workers / 2]"),
+    ] = None,
+    enrich_workers: Annotated[
+        int | None,
+        typer.Option(help="Pipeline engine: threads resolving countries and states. [default: 1]"),
+    ] = None,
+    create_workers: Annotated[
+        int | None,
+        typer.Option(help="Pipeline engine: threads creating contacts. [default: max-workers]"),
+    ] = None,
 ) -> None:
     console = Console(stderr=True)
+    persistent_cache = None
+    odoo_client = None
+    checkpoint_journal = None
+    csv_manager = None
+    metrics = None
+    tracer = Tracer(trace) if trace else None
     try:
+        if resume and journal is None:
+            raise ValueError("--resume requer --journal apontando para o journal da execução anterior.")
+        if on_conflict is OnConflict.update and write_method is WriteMethod.load:
+            raise ValueError("--on-conflict update não se aplica a --write-method load, que já atualiza por external id.")
+
         settings = get_settings()
+        persistent_cache = open_persistent_cache(settings)
+
+        stage_workers = None
+        if engine is Engine.pipeline:
+            stage_workers = (
+                search_workers or max(1, max_workers // 2),
+                enrich_workers or 1,
+                create_workers or max_workers,
+            )
+        total_workers = sum(stage_workers) if stage_workers else max_workers
+        if stage_workers and write_method is WriteMethod.load:
+            # The load pipeline has a single stage, sized like the create one
+            total_workers = stage_workers[2]
 
         odoo_client = OdooClient(
             url=settings.url,
             db=settings.db,
             username=settings.username,
             password=settings.password.get_secret_value(),
+            pool_size=total_workers,
+            gzip_min_bytes=settings.gzip_min_bytes,
+            protocol=settings.protocol,
+            breaker=build_circuit_breaker(settings),
+            tracer=tracer,
         )
         odoo_client.authenticate()
 
-        reference_cache = ReferenceCache(COUNTRY_CACHE, STATE_CACHE)
+        reference_cache = ReferenceCache(store=persistent_cache)
 
-        import_stats = ImportStats(max_workers=max_workers)
+        import_stats = ImportStats(max_workers=total_workers, tracer=tracer)
+        metrics = start_metrics(import_stats, odoo_client, metrics_port, metrics_textfile)
 
         csv_manager = CsvManager(
-            file_name, settings.dlq_file, import_stats=import_stats
+            file_name,
+            settings.dlq_file,
+            import_stats=import_stats,
+            validation_workers=validation_workers,
+            compact_rows=compact_rows,
+            dedup_memory_mb=dedup_memory_mb,
+            input_format=input_format.value,
         )
 
+        resume_point = None
+        if journal is not None:
+            checkpoint_journal = CheckpointJournal(journal)
+            checkpoint_journal.open(file_name, resume=resume)
+            if resume:
+                resume_point = checkpoint_journal.resume_point()
+
         console.print(
             Panel.fit(
                 Text.assemble(
                     ("etl ", "bold cyan"),
-                    ("· importação de contatos Odoo (XML-RPC)", "bold white"),
+                    (
+                        f"· importação de contatos Odoo ({'JSON-RPC' if settings.protocol == 'jsonrpc' else 'XML-RPC'})",
+                        "bold white",
+                    ),
                 ),
-                subtitle=f"{file_name.name}  ·  {max_workers} threads  ·  lote {batch_size}",
+                subtitle=f"{file_name.name}  ·  {engine.value}  ·  {write_method.value}  ·  {total_workers} threads  ·  lote {batch_size}",
                 border_style="cyan",
             )
         )
@@ -79,9 +304,293 @@ def main(
             reference_cache=reference_cache,
             import_stats=import_stats,
             console=console,
+            prefetch_references=prefetch_references,
+            persistent_cache=persistent_cache,
+            max_in_flight=max_in_flight,
+            max_in_flight_bytes=max_in_flight_mb * 1024 * 1024 if max_in_flight_mb else None,
+            engine=engine.value,
+            stage_workers=stage_workers,
+            write_method=write_method.value,
+            partner_index=(
+                PartnerIndex(refresh_seconds=partner_index_refresh) if partner_index else None
+            ),
+            journal=checkpoint_journal,
+            resume_point=resume_point,
+            on_conflict=on_conflict.value,
+            controller=(
+                AdaptiveController(
+                    max_concurrency=max_workers,
+                    batch_size=batch_size,
+                    is_transient=is_call_error,
+                )
+                if adaptive
+                else None
+            ),
         )
     except Exception as e:
         console.print(f"\n[bold red]Erro fatal:[/] {e}")
+    finally:
+        if csv_manager is not None:
+            csv_manager.close_dlq()
+        stop_metrics(metrics, metrics_report)
+        write_trace(tracer)
+        if checkpoint_journal is not None:
+            checkpoint_journal.close()
+        if odoo_client is not None:
+            odoo_client.close()
+        if persistent_cache is not None:
+            persistent_cache.close()
+
+
+@app.command("sync")
+def sync(
+    file_name: Annotated[
+        Path,
+        typer.Argument(
+            exists=True,
+            file_okay=True,
+            dir_okay=False,
+            readable=True,
+            help="File with the full export to synchronize: CSV or JSONL, plain, .gz or .zst, or Parquet.",
+        ),
+    ],
+    batch_size: Annotated[
+        int, typer.Option(help="Total of contacts to compare in each batch")
+    ] = 1000,
+    max_workers: Annotated[
+        int,
+        typer.Option(help="Total of threads sending creates and writes."),
+    ] = 4,
+    max_in_flight: Annotated[
+        int | None,
+        typer.Option(help="Maximum batches read ahead of the workers. [default: 2 x max-workers]"),
+    ] = None,
+    validation_workers: Annotated[
+        int,
+        typer.Option(help="Processes validating CSV rows in parallel chunks; 1 validates inline."),
+    ] = 1,
+    compact_rows: Annotated[
+        bool,
+        typer.Option(help="Keep rows as compact records sharing the CSV header, converting to dicts only for the RPC payload."),
+    ] = False,
+    input_format: Annotated[
+        InputFormat,
+        typer.Option(help="Input reader; auto picks it from the extension. gzip and zstd compression are detected from the content."),
+    ] = InputFormat.auto,
+    state_file: Annotated[
+        str | None,
+        typer.Option(help="SQLite state store (email -> content hash -> partner id). [default: ODOO_SYNC_STATE_FILE]"),
+    ] = None,
+    metrics_port: Annotated[
+        int | None,
+        typer.Option(help="Serve OpenMetrics/Prometheus metrics on http://0.0.0.0:PORT/metrics while the run lasts."),
+    ] = None,
+    metrics_textfile: Annotated[
+        Path | None,
+        typer.Option(help="Rewrite metrics in the Prometheus text format to this file every 15 s, for the node_exporter textfile collector."),
+    ] = None,
+    metrics_report: Annotated[
+        Path | None,
+        typer.Option(help="Write a JSON report with counters, RPC bytes and p50/p95/p99 per stage at the end of the run."),
+    ] = None,
+    trace: Annotated[
+        Path | None,
+        typer.Option(help="Write a Chrome trace-event JSON of every batch, stage and RPC (open in chrome://tracing or ui.perfetto.dev)."),
+    ] = None,
+) -> None:
+    """Create new contacts, write changed ones and skip unchanged ones, using a local state store."""
+    console = Console(stderr=True)
+    odoo_client = None
+    state_store = None
+    csv_manager = None
+    metrics = None
+    tracer = Tracer(trace) if trace else None
+    try:
+        settings = get_settings()
+        state_store = SyncStateStore(
+            state_file or settings.sync_state_file, url=str(settings.url), db=settings.db
+        )
+
+        odoo_client = OdooClient(
+            url=settings.url,
+            db=settings.db,
+            username=settings.username,
+            password=settings.password.get_secret_value(),
+            pool_size=max_workers,
+            gzip_min_bytes=settings.gzip_min_bytes,
+            protocol=settings.protocol,
+            breaker=build_circuit_breaker(settings),
+            tracer=tracer,
+        )
+        odoo_client.authenticate()
+
+        import_stats = ImportStats(max_workers=max_workers, tracer=tracer)
+        metrics = start_metrics(import_stats, odoo_client, metrics_port, metrics_textfile)
+        csv_manager = CsvManager(
+            file_name,
+            settings.dlq_file,
+            import_stats=import_stats,
+            validation_workers=validation_workers,
+            compact_rows=compact_rows,
+            input_format=input_format.value,
+        )
+
+        console.print(
+            Panel.fit(
+                Text.assemble(
+                    ("etl ", "bold cyan"),
+                    ("· sincronização de contatos Odoo", "bold white"),
+                ),
+                subtitle=f"{file_name.name}  ·  {len(state_store):,} no estado  ·  lote {batch_size}",
+                border_style="cyan",
+            )
+        )
+
+        sync_contacts(
+            file_name=file_name,
+            max_workers=max_workers,
+            batch_size=batch_size,
+            odoo_client=odoo_client,
+            csv_manager=csv_manager,
+            reference_cache=ReferenceCache(),
+            import_stats=import_stats,
+            console=console,
+            state_store=state_store,
+            max_in_flight=max_in_flight,
+        )
+    except Exception as e:
+        console.print(f"\n[bold red]Erro fatal:[/] {e}")
+    finally:
+        if csv_manager is not None:
+            csv_manager.close_dlq()
+        stop_metrics(metrics, metrics_report)
+        write_trace(tracer)
+        if odoo_client is not None:
+            odoo_client.close()
+        if state_store is not None:
+            state_store.close()
+
+
+@app.command("replay-dlq")
+def replay_dlq(
+    dlq_file: Annotated[
+        Path | None,
+        typer.Argument(
+            dir_okay=False,
+            help="DLQ to replay. [default: ODOO_DLQ_FILE]",
+        ),
+    ] = None,
+    skip_validation_errors: Annotated[
+        bool,
+        typer.Option(help="Skip rows that failed validation; only rows rejected by Odoo or by an outage are resent."),
+    ] = False,
+    batch_size: Annotated[
+        int, typer.Option(help="Total of contacts to create in each batch")
+    ] = 1000,
+    max_workers: Annotated[
+        int,
+        typer.Option(help="Total of threads to perform in contacts creation."),
+    ] = 4,
+    write_method: Annotated[
+        WriteMethod,
+        typer.Option(help="create: search existing emails and create only new contacts; load: upsert each batch with res.partner.load."),
+    ] = WriteMethod.create,
+    on_conflict: Annotated[
+        OnConflict,
+        typer.Option(help="skip: ignore contacts whose email already exists; update: write the changed fields."),
+    ] = OnConflict.skip,
+) -> None:
+    """Re-import the DLQ through the normal pipeline; rows failing again go to a fresh DLQ."""
+    console = Console(stderr=True)
+    odoo_client = None
+    csv_manager = None
+    try:
+        if on_conflict is OnConflict.update and write_method is WriteMethod.load:
+            raise ValueError("--on-conflict update não se aplica a --write-method load, que já atualiza por external id.")
+
+        settings = get_settings()
+        dlq_file = dlq_file or Path(settings.dlq_file)
+        if not dlq_file.is_file():
+            raise ValueError(f"DLQ não encontrado: {dlq_file}")
+
+        odoo_client = OdooClient(
+            url=settings.url,
+            db=settings.db,
+            username=settings.username,
+            password=settings.password.get_secret_value(),
+            pool_size=max_workers,
+            gzip_min_bytes=settings.gzip_min_bytes,
+            protocol=settings.protocol,
+            breaker=build_circuit_breaker(settings),
+        )
+        odoo_client.authenticate()
+
+        # Moved only once the client is authenticated, so a bad setup leaves the DLQ in place
+        replay_file = set_aside_dlq(dlq_file)
+        import_stats = ImportStats(max_workers=max_workers)
+        csv_manager = CsvManager(
+            replay_file,
+            str(dlq_file),
+            import_stats=import_stats,
+            row_filter=is_replayable if skip_validation_errors else None,
+            input_format="csv",
+        )
+
+        console.print(
+            Panel.fit(
+                Text.assemble(
+                    ("etl ", "bold cyan"),
+                    ("· reprocessamento do DLQ", "bold white"),
+                ),
+                subtitle=f"{replay_file.name}  ·  {write_method.value}  ·  {max_workers} threads  ·  lote {batch_size}",
+                border_style="cyan",
+            )
+        )
+
+        import_contacts(
+            file_name=replay_file,
+            max_workers=max_workers,
+            batch_size=batch_size,
+            odoo_client=odoo_client,
+            csv_manager=csv_manager,
+            reference_cache=ReferenceCache(),
+            import_stats=import_stats,
+            console=console,
+            prefetch_references=True,
+            write_method=write_method.value,
+            on_conflict=on_conflict.value,
+        )
+    except Exception as e:
+        console.print(f"\n[bold red]Erro fatal:[/] {e}")
+    finally:
+        if csv_manager is not None:
+            csv_manager.close_dlq()
+        if odoo_client is not None:
+            odoo_client.close()
+
+
+@app.command("cache-clear")
+def cache_clear(
+    all_databases: Annotated[
+        bool,
+        typer.Option("--all", help="Clear entries of every Odoo URL/db, not only the configured one."),
+    ] = False,
+) -> None:
+    """Invalidate the persistent reference and partner-id cache."""
+    console = Console(stderr=True)
+    settings = get_settings()
+    persistent_cache = open_persistent_cache(settings)
+
+    if persistent_cache is None:
+        console.print("[yellow]Nenhum cache configurado (ODOO_CACHE_FILE).[/]")
+        return
+
+    try:
+        removed = persistent_cache.invalidate(all_scopes=all_databases)
+    finally:
+        persistent_cache.close()
+
+    console.print(f"[green]{removed:,} entradas removidas de {settings.cache_file}[/]")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,94 @@
+import threading
+import time
+
+from odoo_xmlrpc_csv_importer.infrastructure.logger import logger
+
+
+def normalize_email(email: str) -> str:
+    return email.strip().lower()
+
+
+class PartnerIndex:
+    """In-memory email -> res.partner id index, loaded once by a paginated scan.
+
+    Once loaded, the existence check of a batch is a local lookup instead of a
+    `search_read` with a large `email in [...]` domain. The index only grows:
+    partners created by this run are added, and `refresh` picks up records
+    written in Odoo since the last scan (by `write_date`). Deleted partners and
+    changed emails are not removed.
+    """
+
+    def __init__(self, refresh_seconds: float | None = None, page_size: int = 5000) -> None:
+        self.refresh_seconds = refresh_seconds
+        self.page_size = page_size
+
+        self._emails: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._last_write_date: str | None = None
+        self._scanned_at = 0.0
+        self.loaded = False
+
+    def __len__(self) -> int:
+        return len(self._emails)
+
+    def _scan(self, *, models, odoo_client, domain: list) -> int:
+        records = odoo_client.search_read_all(
+            models,
+            "res.partner",
+            [["email", "!=", False], *domain],
+            ["email", "write_date"],
+            page_size=self.page_size,
+        )
+        scanned = 0
+        last_write_date = self._last_write_date
+        for record in records:
+            scanned += 1
+            email = record.get("email")
+            if email:
+                with self._lock:
+                    self._emails.setdefault(normalize_email(email), record["id"])
+            write_date = record.get("write_date")
+            if write_date and (last_write_date is None or write_date > last_write_date):
+                last_write_date = write_date
+
+        self._last_write_date = last_write_date
+        self._scanned_at = time.monotonic()
+        return scanned
+
+    def load(self, *, models, odoo_client) -> None:
+        """Read every partner email once, ordered by id, one page per RPC"""
+        self._scan(models=models, odoo_client=odoo_client, domain=[])
+        self.loaded = True
+        logger.info("partner_index_loaded", emails=len(self._emails))
+
+    def refresh(self, *, models, odoo_client) -> None:
+        """Merge partners written since the previous scan"""
+        # `>=` because write_date has second resolution; the merge is idempotent
+        domain = [["write_date", ">=", self._last_write_date]] if self._last_write_date else []
+        scanned = self._scan(models=models, odoo_client=odoo_client, domain=domain)
+        logger.debug("partner_index_refreshed", scanned=scanned, emails=len(self._emails))
+
+    def maybe_refresh(self, *, models, odoo_client) -> None:
+        """Refresh when the index is older than `refresh_seconds`; one thread at a time"""
+        if self.refresh_seconds is None:
+            return
+        if time.monotonic() - self._scanned_at < self.refresh_seconds:
+            return
+        # Other workers keep using the current index instead of queueing up
+        if not self._refresh_lock.acquire(blocking=False):
+            return
+        try:
+            if time.monotonic() - self._scanned_at >= self.refresh_seconds:
+                self.refresh(models=models, odoo_client=odoo_client)
+        finally:
+            self._refresh_lock.release()
+
+    def get_partner_ids(self, emails) -> dict[str, int]:
+        emails_index = self._emails
+        return {email: emails_index[email] for email in emails if email in emails_index}
+
+    def set_partner_ids(self, partner_ids: dict[str, int]) -> None:
+        with self._lock:
+            for email, partner_id in partner_ids.items():
+                self._emails[normalize_email(email)] = partner_id
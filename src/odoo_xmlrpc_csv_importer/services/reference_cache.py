@@ -1,33 +1,167 @@
+import unicodedata
+
+from odoo_xmlrpc_csv_importer.core.concurrent_cache import ConcurrentCache
+from odoo_xmlrpc_csv_importer.infrastructure.logger import logger
+
+# Refs entry marking that the prefetched tables in the persistent store are complete
+_PREFETCH_MARKER = ("prefetched", "complete")
+
+
+def normalize_reference_name(name: str | None) -> str:
+    """Case and accent insensitive key for country and state names"""
+    if not name:
+        return ""
+
+    decomposed = unicodedata.normalize("NFKD", name)
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(stripped.casefold().split())
+
+
 class ReferenceCache:
-    def __init__(self, country_cache, state_cache):
-        self.country_cache = country_cache
-        self.state_cache = state_cache
+    def __init__(
+        self,
+        country_cache: ConcurrentCache | None = None,
+        state_cache: ConcurrentCache | None = None,
+        store=None,
+    ):
+        self.country_cache = country_cache if country_cache is not None else ConcurrentCache()
+        self.state_cache = state_cache if state_cache is not None else ConcurrentCache()
+        self.store = store
+        self.prefetched = False
+
+    def _load(self, kind: str, store_key: str, fetch):
+        """Resolve a cache miss from the persistent store first, then from Odoo"""
+        # Prefetched tables are complete, so a miss is a known negative
+        if self.prefetched:
+            return False
+
+        if self.store is not None:
+            cached = self.store.get_reference(kind, store_key)
+            if cached is not None:
+                return cached
+
+        value = fetch()
+        if self.store is not None:
+            self.store.set_reference(kind, store_key, value)
+
+        return value
+
+    def _lookup_name(self, name: str, normalized_name: str) -> str:
+        """Cache key of a name: normalized once prefetched, as written otherwise.
+
+        Without a prefetch the RPC matches the exact spelling, so a miss for
+        "brazil" says nothing about "Brazil" and each spelling is kept apart.
+        """
+        return normalized_name if self.prefetched else name
+
+    def prefetch(self, *, models, odoo_client, page_size: int = 1000) -> None:
+        """Load every country and state with one paginated search_read per table.
+
+        With a persistent store, a fresh copy of both tables is read from it
+        instead, and tables read from Odoo are saved for the next runs.
+        """
+        tables = self._stored_tables()
+        source = "store"
+        if tables is None:
+            tables = self._fetch_tables(models, odoo_client, page_size)
+            source = "odoo"
+            self._store_tables(*tables)
+
+        countries, states = tables
+        for name, country_id in countries.items():
+            self.country_cache.setdefault(name, country_id)
+        for state_cache_key, state_id in states.items():
+            self.state_cache.setdefault(state_cache_key, state_id)
+
+        self.prefetched = True
+        logger.info(
+            "references_prefetched",
+            countries=len(self.country_cache),
+            states=len(self.state_cache),
+            source=source,
+        )
+
+    def _fetch_tables(self, models, odoo_client, page_size: int) -> tuple[dict, dict]:
+        countries = {}
+        for country in odoo_client.search_read_all(
+            models, "res.country", [], ["name"], page_size=page_size
+        ):
+            countries.setdefault(normalize_reference_name(country["name"]), country["id"])
+
+        states = {}
+        for state in odoo_client.search_read_all(
+            models, "res.country.state", [], ["name", "country_id"], page_size=page_size
+        ):
+            # many2one fields are read as [id, display_name]
+            country_id = state["country_id"][0] if state["country_id"] else False
+            state_cache_key = (country_id, normalize_reference_name(state["name"]))
+            states.setdefault(state_cache_key, state["id"])
+
+        return countries, states
+
+    def _stored_tables(self) -> tuple[dict, dict] | None:
+        # The marker is written last, so it is only there when both tables are complete
+        if self.store is None or not self.store.get_reference(*_PREFETCH_MARKER):
+            return None
+
+        countries = self.store.get_references("prefetched_country")
+        states = {}
+        for key, state_id in self.store.get_references("prefetched_state").items():
+            country_id, _, name = key.partition("|")
+            states[(int(country_id) or False, name)] = state_id
+        return countries, states
+
+    def _store_tables(self, countries: dict, states: dict) -> None:
+        if self.store is None:
+            return
+        self.store.set_references("prefetched_country", countries)
+        self.store.set_references(
+            "prefetched_state",
+            {
+                f"{int(country_id or 0)}|{name}": state_id
+                for (country_id, name), state_id in states.items()
+            },
+        )
+        self.store.set_reference(*_PREFETCH_MARKER, True)
 
     def get_state_id_cached(self, *, models, country_id, state_name, get_state_id):
         """Check if the state_id already exists or search and save in the cache"""
+        normalized_name = normalize_reference_name(state_name)
+        if not normalized_name:
+            return False
 
+        lookup_name = self._lookup_name(state_name, normalized_name)
         # Creates a unique key using the country and state, making sure states with the same name in different countries are treated separately
-        state_cache_key = (country_id, state_name)
-
-        if state_cache_key in self.state_cache:
-            return self.state_cache[state_cache_key]
+        state_cache_key = (country_id, lookup_name)
 
-        state_id = get_state_id(models, country_id, state_name)
-        if state_id:
-            self.state_cache[state_cache_key] = state_id
-
-        return state_id
+        # Misses are cached too, so unknown names cost at most one RPC
+        return self.state_cache.get_or_load(
+            state_cache_key,
+            lambda: self._load(
+                "state",
+                f"{country_id}|{lookup_name}",
+                lambda: get_state_id(models, country_id, state_name),
+            ),
+        )
 
     def get_country_id_cached(self, *, models, country_name, get_country_id):
         """Check if the country_id already exists or search and save in the cache"""
-        if country_name in self.country_cache:
-            return self.country_cache[country_name]
+        normalized_name = normalize_reference_name(country_name)
+        if not normalized_name:
+            return False
 
-        country_id = get_country_id(models, country_name)
-        if country_id:
-            self.country_cache[country_name] = country_id
+        lookup_name = self._lookup_name(country_name, normalized_name)
+        return self.country_cache.get_or_load(
+            lookup_name,
+            lambda: self._load(
+                "country", lookup_name, lambda: get_country_id(models, country_name)
+            ),
+        )
 
-        return country_id
+    def stats(self) -> dict[str, int]:
+        """Hit, miss and coalesced lookup counters across both tables"""
+        country, state = self.country_cache.stats(), self.state_cache.stats()
+        return {key: country[key] + state[key] for key in country}
 
     def get_contact_reference_ids(
         self, *, models, country_name: str, state_name: str, odoo_client
@@ -14,3 +14,11 @@ def base_contact() -> dict:
         "street": None,
         "website": None,
     }
+
+
+@pytest.fixture
+def fake_odoo():
+    from benchmarks.fake_odoo import FakeOdoo, FakeOdooServer
+
+    with FakeOdooServer(FakeOdoo(seed=0)) as server:
+        yield server
@@ -0,0 +1,77 @@
+import pytest
+
+from src.odoo_xmlrpc_csv_importer.core.adaptive import AdaptiveController
+
+
+def controller(**options) -> AdaptiveController:
+    options.setdefault("max_concurrency", 8)
+    options.setdefault("batch_size", 500)
+    return AdaptiveController(**options)
+
+
+def steady_rounds(ctrl: AdaptiveController, rounds: int, seconds: float = 0.5) -> None:
+    for _ in range(rounds):
+        for _ in range(ctrl.concurrency):
+            ctrl.record("create", seconds, ctrl.batch_size)
+
+
+def test_concurrency_grows_by_one_per_healthy_round_up_to_the_ceiling():
+    ctrl = controller(max_concurrency=5)
+    limits = []
+    ctrl.subscribe(limits.append)
+
+    steady_rounds(ctrl, 10)
+
+    assert ctrl.concurrency == 5
+    assert sorted(set(limits)) == [2, 3, 4, 5]
+
+
+def test_latency_rise_backs_off_once_per_round():
+    ctrl = controller()
+    steady_rounds(ctrl, 4, seconds=0.5)
+    before = ctrl.concurrency
+
+    # Every call of the round is slow, yet the window is only cut once
+    for _ in range(before):
+        ctrl.record("create", 5.0, ctrl.batch_size)
+
+    assert ctrl.concurrency == int(before * 0.7)
+    assert ctrl.decreases == 1
+
+
+def test_sustained_overload_keeps_backing_off_every_round():
+    ctrl = controller(max_concurrency=10, initial_concurrency=10)
+    steady_rounds(ctrl, 3, seconds=0.5)
+
+    for _ in range(200):
+        ctrl.record("create", 5.0, ctrl.batch_size)
+
+    assert ctrl.concurrency == 1
+    assert ctrl.decreases >= 4
+
+
+def test_batch_size_follows_the_target_call_duration():
+    ctrl = controller(target_seconds=2.0)
+    ctrl.record("create", 0.2, 500)
+    assert ctrl.batch_size > 500
+
+    grown = ctrl.batch_size
+    ctrl.record("create", 3.0, grown)
+    assert ctrl.batch_size < grown
+
+
+def test_batch_size_respects_the_payload_cap():
+    ctrl = controller(max_payload_bytes=100_000)
+    ctrl.record("create", 0.1, 500, payload_bytes=500 * 1000)
+    assert ctrl.batch_size == 100
+
+
+@pytest.mark.parametrize(
+    "transient, expected", [(True, 1), (False, 2)]
+)
+def test_only_transient_errors_back_off(transient, expected):
+    ctrl = controller(is_transient=lambda error: transient)
+    with pytest.raises(RuntimeError):
+        with ctrl.track("create", 500):
+            raise RuntimeError("boom")
+    assert ctrl.concurrency == expected
@@ -0,0 +1,112 @@
+import asyncio
+
+import pytest
+
+from src.odoo_xmlrpc_csv_importer.core.bisection import (
+    BisectionInterrupted,
+    bisect_failures,
+    bisect_failures_async,
+)
+
+
+class Rejected(Exception):
+    pass
+
+
+class Outage(Exception):
+    pass
+
+
+def make_sender(bad: set, calls: list):
+    def send(items: list) -> list:
+        calls.append(list(items))
+        if bad & set(items):
+            raise Rejected(f"bad: {sorted(bad & set(items))}")
+        return [item * 10 for item in items]
+
+    return send
+
+
+def is_outage(error: BaseException) -> bool:
+    return isinstance(error, Outage)
+
+
+def test_bisection_isolates_each_bad_item():
+    items = list(range(64))
+    calls = []
+    send = make_sender({5, 40}, calls)
+
+    sent, failed = bisect_failures(items, send, Rejected("batch"), is_transient=is_outage)
+
+    assert [item for item, _ in failed] == [5, 40]
+    assert all(isinstance(error, Rejected) for _, error in failed)
+    accepted = sorted(item for chunk, _ in sent for item in chunk)
+    assert accepted == [i for i in items if i not in (5, 40)]
+    assert all(result == [i * 10 for i in chunk] for chunk, result in sent)
+    # Two halves per level for each bad item: O(k log n), far below n calls
+    assert len(calls) <= 2 * 2 * 6
+
+
+def test_single_item_fails_without_resending():
+    calls = []
+    sent, failed = bisect_failures(
+        [7], make_sender({7}, calls), Rejected("row"), is_transient=is_outage
+    )
+
+    assert sent == [] and calls == []
+    assert failed[0][0] == 7
+
+
+def test_transient_error_stops_the_bisection():
+    calls = []
+
+    def send(items):
+        calls.append(items)
+        raise Outage("connection refused")
+
+    with pytest.raises(BisectionInterrupted) as interrupted:
+        bisect_failures(list(range(8)), send, Rejected("batch"), is_transient=is_outage)
+    assert len(calls) == 1
+    assert isinstance(interrupted.value.error, Outage)
+    assert interrupted.value.sent == interrupted.value.failed == []
+    assert interrupted.value.unsent == list(range(8))
+
+
+def test_an_outage_keeps_apart_the_chunks_already_sent():
+    items = list(range(16))
+    calls = []
+    rejecting = make_sender({3}, calls)
+
+    def send(chunk):
+        if len(calls) == 4:
+            raise Outage("connection refused")
+        return rejecting(chunk)
+
+    with pytest.raises(BisectionInterrupted) as interrupted:
+        bisect_failures(items, send, Rejected("batch"), is_transient=is_outage)
+
+    sent = [item for chunk, _ in interrupted.value.sent for item in chunk]
+    failed = [item for item, _ in interrupted.value.failed]
+    assert sent and interrupted.value.unsent
+    assert 3 not in sent
+    assert sorted(sent + failed + interrupted.value.unsent) == items
+
+
+def test_async_bisection_sends_the_same_halves():
+    items = list(range(64))
+    calls, async_calls = [], []
+    expected = bisect_failures(
+        items, make_sender({5, 40}, calls), Rejected("batch"), is_transient=is_outage
+    )
+    send = make_sender({5, 40}, async_calls)
+
+    async def send_async(chunk):
+        return send(chunk)
+
+    sent, failed = asyncio.run(
+        bisect_failures_async(items, send_async, Rejected("batch"), is_transient=is_outage)
+    )
+
+    assert async_calls == calls
+    assert sent == expected[0]
+    assert [item for item, _ in failed] == [item for item, _ in expected[1]] == [5, 40]
@@ -0,0 +1,48 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from src.odoo_xmlrpc_csv_importer.core.bounded_submitter import (
+    BoundedSubmitter,
+    estimate_batch_bytes,
+)
+
+
+def run_window(submitter_kwargs, weights, work_seconds=0.01) -> int:
+    """Submit one task per weight and return the largest window observed"""
+    lock = threading.Lock()
+    observed = []
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        submitter = BoundedSubmitter(executor, **submitter_kwargs)
+
+        def task():
+            with lock:
+                observed.append(submitter.in_flight)
+            time.sleep(work_seconds)
+
+        for weight in weights:
+            submitter.submit(task, weight=weight)
+        submitter.wait_all()
+
+        assert submitter.in_flight == submitter.bytes_in_flight == 0
+
+    return max(observed)
+
+
+def test_in_flight_count_is_bounded():
+    assert run_window({"max_in_flight": 3}, [0] * 20) <= 3
+
+
+def test_byte_budget_is_bounded():
+    assert run_window({"max_in_flight": 8, "max_bytes": 250}, [100] * 20) <= 2
+
+
+def test_oversized_item_runs_alone():
+    assert run_window({"max_in_flight": 8, "max_bytes": 50}, [100] * 5) == 1
+
+
+def test_estimate_batch_bytes_grows_with_payload():
+    small = [{"name": "a", "email": "a@a.com"}]
+    large = [{"name": "a" * 1000, "email": "a@a.com"}] * 2
+    assert 0 < estimate_batch_bytes(small) < estimate_batch_bytes(large)
@@ -0,0 +1,123 @@
+import json
+from pathlib import Path
+
+from src.odoo_xmlrpc_csv_importer.infrastructure.checkpoint_journal import CheckpointJournal
+from src.odoo_xmlrpc_csv_importer.infrastructure.csv_manager import CsvManager
+from src.odoo_xmlrpc_csv_importer.infrastructure.import_stats import ImportStats
+
+DATA_FILE = Path(__file__).parent.parent / "data" / "100.csv"
+
+
+def csv_manager(tmp_path, contacts_file=DATA_FILE, **options) -> CsvManager:
+    return CsvManager(
+        contacts_file,
+        str(tmp_path / "failed_records.csv"),
+        import_stats=ImportStats(max_workers=1),
+        **options,
+    )
+
+
+def test_batches_tile_the_file(tmp_path):
+    batches = list(csv_manager(tmp_path).stream_batches(10))
+
+    assert [b.number for b in batches] == list(range(1, len(batches) + 1))
+    assert batches[0].start_offset == 0
+    for previous, batch in zip(batches, batches[1:]):
+        assert batch.start_offset == previous.end_offset < batch.end_offset
+
+
+def write_with_trailing_rejects(tmp_path) -> Path:
+    """data/100.csv followed by an invalid row and a duplicate of its first row"""
+    lines = DATA_FILE.read_text(encoding="utf-8").splitlines()
+    target = tmp_path / "contacts.csv"
+    target.write_text("\n".join([*lines, "Sem Email,,,,,,,,", lines[1]]) + "\n", encoding="utf-8")
+    return target
+
+
+def test_rows_after_the_last_valid_one_belong_to_the_last_batch(tmp_path):
+    file_name = write_with_trailing_rejects(tmp_path)
+
+    batches = list(csv_manager(tmp_path, contacts_file=file_name).stream_batches(10))
+
+    assert batches[-1].end_offset == file_name.stat().st_size
+    assert batches == list(csv_manager(tmp_path).stream_batches(10))
+
+
+def test_a_file_without_valid_rows_still_covers_its_range(tmp_path):
+    file_name = tmp_path / "invalid.csv"
+    file_name.write_text("name,email\nAna,\nBia,not-an-email\n", encoding="utf-8")
+
+    batches = list(csv_manager(tmp_path, contacts_file=file_name).stream_batches(10))
+
+    assert [(len(b), b.start_offset, b.end_offset) for b in batches] == [
+        (0, 0, file_name.stat().st_size)
+    ]
+
+
+def test_resume_skips_finished_batches_and_retries_in_flight_ones(tmp_path):
+    batches = list(csv_manager(tmp_path).stream_batches(10))
+    journal = CheckpointJournal(tmp_path / "import.journal")
+    journal.open(DATA_FILE)
+    # Batches 4 and 5 were in flight and 6 finished out of order when the process died
+    for batch in batches[:3] + batches[5:6]:
+        journal.record(batch, "done")
+    journal.close()
+
+    journal.open(DATA_FILE, resume=True)
+    resume_point = journal.resume_point()
+    assert resume_point.offset == batches[2].end_offset
+    assert resume_point.next_batch == 7
+
+    resumed = list(csv_manager(tmp_path).stream_batches(10, resume_point))
+
+    # Dedup restarts empty, so repeats of already-finished emails come back;
+    # the existence check in Odoo skips them
+    finished = {c["email"] for b in batches[:3] + batches[5:6] for c in b}
+    emails = [c["email"] for b in resumed for c in b if c["email"] not in finished]
+    assert emails == [c["email"] for b in batches[3:5] + batches[6:] for c in b]
+    assert resumed[0].start_offset == batches[2].end_offset
+
+
+def test_resume_works_with_compact_rows_and_process_pool(tmp_path):
+    batches = list(csv_manager(tmp_path).stream_batches(7))
+    journal = CheckpointJournal(tmp_path / "import.journal")
+    journal.open(DATA_FILE)
+    for batch in batches[:5]:
+        journal.record(batch, "done")
+    journal.close()
+    journal.open(DATA_FILE, resume=True)
+
+    resumed = csv_manager(
+        tmp_path, compact_rows=True, validation_workers=2, validation_chunk_size=9
+    ).stream_batches(7, journal.resume_point())
+
+    finished = {c["email"] for b in batches[:5] for c in b}
+    assert [c["email"] for b in resumed for c in b if c["email"] not in finished] == [
+        c["email"] for b in batches[5:] for c in b
+    ]
+
+
+def test_journal_refuses_a_different_file(tmp_path):
+    other = tmp_path / "other.csv"
+    other.write_text("name,email\n", encoding="utf-8")
+    journal = CheckpointJournal(tmp_path / "import.journal")
+    journal.open(other)
+    journal.close()
+
+    try:
+        journal.open(DATA_FILE, resume=True)
+    except RuntimeError as e:
+        assert "outro arquivo" in str(e)
+    else:
+        raise AssertionError("resume with a foreign journal must fail")
+
+
+def test_journal_lines_are_json(tmp_path):
+    journal = CheckpointJournal(tmp_path / "import.journal")
+    journal.open(DATA_FILE)
+    journal.record(next(csv_manager(tmp_path).stream_batches(10)), "failed")
+    journal.close()
+
+    header, entry = [json.loads(line) for line in journal.path.read_text().splitlines()]
+    assert header["file"] == str(DATA_FILE.resolve())
+    assert entry["status"] == "failed" and entry["rows"] == 10
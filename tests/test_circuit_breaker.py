@@ -0,0 +1,125 @@
+import threading
+import time
+
+import pytest
+
+# The class the engine checks against, as imported by the application package
+from src.odoo_xmlrpc_csv_importer.application.import_contacts import (
+    CircuitOpenError,
+    run_requeuing,
+)
+from src.odoo_xmlrpc_csv_importer.infrastructure.circuit_breaker import CircuitBreaker
+from src.odoo_xmlrpc_csv_importer.infrastructure.import_stats import ImportStats
+
+
+def breaker(**options) -> CircuitBreaker:
+    options.setdefault("failure_threshold", 3)
+    options.setdefault("probe_interval", 0.01)
+    return CircuitBreaker(**options)
+
+
+def test_opens_after_consecutive_failures_only():
+    cb = breaker()
+    cb.record_failure()
+    cb.record_failure()
+    cb.record_success()
+    cb.record_failure()
+    cb.record_failure()
+    assert not cb.is_open
+
+    cb.record_failure()
+    assert cb.is_open and cb.trips == 1
+
+
+def test_waiting_workers_resume_together_after_a_single_probe_succeeds():
+    cb = breaker(failure_threshold=1)
+    probing = 0
+    overlaps = []
+    outcomes = iter([False, False, True])
+
+    def probe():
+        nonlocal probing
+        probing += 1
+        overlaps.append(probing)
+        time.sleep(0.02)
+        probing -= 1
+        if not next(outcomes):
+            raise ConnectionRefusedError
+
+    cb.probe = probe
+    cb.record_failure()
+
+    released = []
+    workers = [
+        threading.Thread(target=lambda: (cb.wait_closed(), released.append(1)))
+        for _ in range(4)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(timeout=5)
+
+    assert len(released) == 4
+    assert max(overlaps) == 1
+    assert cb.probes == 3 and not cb.is_open
+
+
+def test_waiting_gives_up_after_max_open_seconds():
+    cb = breaker(failure_threshold=1, max_open_seconds=0.05)
+    cb.probe = lambda: (_ for _ in ()).throw(ConnectionRefusedError())
+    cb.record_failure()
+
+    with pytest.raises(ConnectionError, match="indisponível"):
+        cb.wait_closed()
+
+
+def test_circuit_closes_when_odoo_recovers_after_callers_gave_up():
+    cb = breaker(failure_threshold=1, max_open_seconds=0.05, max_probe_interval=0.01)
+    healthy = False
+
+    def probe():
+        if not healthy:
+            raise ConnectionRefusedError
+
+    cb.probe = probe
+    cb.record_failure()
+    with pytest.raises(ConnectionError, match="indisponível"):
+        cb.wait_closed()
+    probes = cb.probes
+
+    healthy = True
+    cb.wait_closed()
+
+    assert not cb.is_open
+    assert cb.probes > probes
+
+
+def test_batch_caught_by_an_outage_is_requeued_instead_of_failing():
+    cb = breaker(failure_threshold=1)
+    stats = ImportStats(max_workers=1)
+    attempts = []
+
+    def attempt():
+        attempts.append(1)
+        if len(attempts) == 1:
+            cb.record_failure()
+            raise ConnectionRefusedError("Odoo fora do ar")
+        return "done"
+
+    assert run_requeuing(attempt, cb, stats, rows=10) == "done"
+    assert len(attempts) == 2
+    assert stats.batches_requeued == 1
+
+
+@pytest.mark.parametrize("error", [ValueError("dado inválido"), CircuitOpenError("desisti")])
+def test_data_errors_and_giving_up_are_not_requeued(error):
+    cb = breaker(failure_threshold=1)
+    stats = ImportStats(max_workers=1)
+
+    def attempt():
+        cb.record_failure()
+        raise error
+
+    with pytest.raises(type(error)):
+        run_requeuing(attempt, cb, stats, rows=10)
+    assert stats.batches_requeued == 0
@@ -0,0 +1,54 @@
+import threading
+import time
+
+import pytest
+
+from src.odoo_xmlrpc_csv_importer.core.concurrent_cache import ConcurrentCache
+
+
+def test_concurrent_misses_share_a_single_load():
+    cache = ConcurrentCache()
+    calls = []
+    barrier = threading.Barrier(8)
+
+    def loader():
+        calls.append(1)
+        time.sleep(0.05)
+        return 42
+
+    def worker(results):
+        barrier.wait()
+        results.append(cache.get_or_load("United States", loader))
+
+    results = []
+    threads = [threading.Thread(target=worker, args=(results,)) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert results == [42] * 8
+    assert len(calls) == 1
+    stats = cache.stats()
+    assert stats["misses"] == 1
+    assert stats["coalesced"] + stats["hits"] == 7
+
+
+def test_hits_after_first_load():
+    cache = ConcurrentCache()
+    cache.get_or_load("a", lambda: 1)
+    assert cache.get_or_load("a", lambda: 2) == 1
+    assert cache.stats() == {"hits": 1, "misses": 1, "coalesced": 0}
+
+
+def test_failed_load_is_not_cached():
+    cache = ConcurrentCache()
+
+    def failing():
+        raise ConnectionError("odoo down")
+
+    with pytest.raises(ConnectionError):
+        cache.get_or_load("a", failing)
+
+    assert "a" not in cache
+    assert cache.get_or_load("a", lambda: 7) == 7
@@ -0,0 +1,65 @@
+import csv
+from pathlib import Path
+from uuid import uuid4
+
+import pytest
+
+from src.odoo_xmlrpc_csv_importer.infrastructure.csv_manager import CsvManager
+from src.odoo_xmlrpc_csv_importer.infrastructure.import_stats import ImportStats
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+
+
+def stream(tmp_path, file_name, **options):
+    import_stats = ImportStats(max_workers=1)
+    # Each call gets its own DLQ, even when several share tmp_path
+    dlq_file = tmp_path / f"dlq-{uuid4().hex}.csv"
+    manager = CsvManager(file_name, str(dlq_file), import_stats=import_stats, **options)
+
+    contacts = list(manager.stream_csv_contacts())
+    manager.close_dlq()
+    rejected = []
+    if dlq_file.exists():
+        with open(dlq_file, newline="", encoding="utf-8") as file:
+            rejected = [row["email"] for row in csv.DictReader(file)]
+    return contacts, rejected, import_stats.validation_errors
+
+
+@pytest.mark.parametrize("file_name", ["100.csv", "10000.csv"])
+def test_parallel_validation_matches_inline(tmp_path, file_name):
+    inline = stream(tmp_path, DATA_DIR / file_name)
+    parallel = stream(
+        tmp_path, DATA_DIR / file_name, validation_workers=3, validation_chunk_size=37
+    )
+
+    assert parallel == inline
+
+
+def test_deduplication_is_global_across_chunks(tmp_path):
+    csv_file = tmp_path / "contacts.csv"
+    csv_file.write_text(
+        "name,email\nAna,ana@example.com\nBia,bia@example.com\nAna 2,ANA@example.com\n",
+        encoding="utf-8",
+    )
+
+    contacts, _, _ = stream(tmp_path, csv_file, validation_workers=2, validation_chunk_size=1)
+
+    assert [c["name"] for c in contacts] == ["Ana", "Bia"]
+
+
+@pytest.mark.parametrize("validation_workers", [1, 2])
+def test_compact_rows_match_dict_rows(tmp_path, validation_workers):
+    file_name = DATA_DIR / "10000.csv"
+    contacts, rejected, errors = stream(tmp_path, file_name)
+    compact, compact_rejected, compact_errors = stream(
+        tmp_path, file_name, compact_rows=True, validation_workers=validation_workers
+    )
+
+    assert [dict(c) for c in compact] == contacts
+    assert (compact_rejected, compact_errors) == (rejected, errors)
+
+
+def test_memory_capped_dedup_matches_exact_dedup(tmp_path):
+    file_name = DATA_DIR / "10000.csv"
+
+    assert stream(tmp_path, file_name, dedup_memory_mb=1) == stream(tmp_path, file_name)
@@ -0,0 +1,46 @@
+import os
+import random
+
+from src.odoo_xmlrpc_csv_importer.core.dedup import BloomEmailSet, ExactEmailSet
+
+
+def emails_with_duplicates(n: int) -> list[str]:
+    rng = random.Random(3)
+    return [f"user{rng.randrange(n // 2)}@example.com" for _ in range(n)]
+
+
+def test_bloom_set_matches_exact_set_even_when_saturated(tmp_path):
+    emails = emails_with_duplicates(20_000)
+    exact = ExactEmailSet()
+    # 256 bytes for ~9k distinct emails: the filter answers "maybe" almost always
+    bloom = BloomEmailSet(256, directory=str(tmp_path))
+
+    assert [bloom.add(e) for e in emails] == [exact.add(e) for e in emails]
+
+    stats = bloom.stats()
+    assert stats["emails"] == exact.stats()["emails"]
+    assert stats["duplicates"] == exact.stats()["duplicates"]
+    assert stats["false_positives"] > 0
+    assert stats["filter_positives"] == stats["duplicates"] + stats["false_positives"]
+    bloom.close()
+
+
+def test_bloom_set_with_room_rarely_touches_the_disk(tmp_path):
+    bloom = BloomEmailSet(1024 * 1024, directory=str(tmp_path))
+
+    for n in range(10_000):
+        assert bloom.add(f"user{n}@example.com")
+
+    assert bloom.false_positives < 5
+    assert bloom.expected_false_positive_rate() < 0.001
+    bloom.close()
+
+
+def test_bloom_set_removes_its_spill_file(tmp_path):
+    bloom = BloomEmailSet(64, directory=str(tmp_path))
+    bloom.add("a@a.com")
+    assert os.listdir(tmp_path)
+
+    bloom.close()
+
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,68 @@
+import csv
+import threading
+
+from src.odoo_xmlrpc_csv_importer.infrastructure.dlq_writer import DlqWriter
+
+
+def read_dlq(path) -> list[dict]:
+    with open(path, newline="", encoding="utf-8") as file:
+        return list(csv.DictReader(file))
+
+
+def test_concurrent_writes_share_one_header(tmp_path):
+    path = tmp_path / "dlq.csv"
+    writer = DlqWriter(str(path), flush_interval=0.01)
+
+    def log(worker: int) -> None:
+        for n in range(200):
+            writer.write([{"name": f"w{worker}", "email": f"{worker}-{n}@x.com"}], f"erro {n}")
+
+    threads = [threading.Thread(target=log, args=(w,)) for w in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    writer.close()
+
+    rows = read_dlq(path)
+    assert len(rows) == 800
+    assert len({row["email"] for row in rows}) == 800
+    assert path.read_text(encoding="utf-8").count("error_log") == 1
+
+
+def test_sync_makes_queued_rows_visible(tmp_path):
+    path = tmp_path / "dlq.csv"
+    writer = DlqWriter(str(path), flush_interval=60)
+
+    writer.write([{"name": "Ana", "email": "ana@x.com"}], "falhou")
+    writer.sync()
+
+    assert read_dlq(path) == [{"name": "Ana", "email": "ana@x.com", "error_log": "falhou"}]
+    writer.close()
+
+
+def test_appending_reuses_the_existing_header(tmp_path):
+    path = tmp_path / "dlq.csv"
+    path.write_text("email,name,error_log\nbia@x.com,Bia,antigo\n", encoding="utf-8")
+
+    writer = DlqWriter(str(path))
+    writer.write([{"name": "Ana", "email": "ana@x.com", "error_log": "velho"}], "novo")
+    writer.close()
+
+    assert path.read_text(encoding="utf-8").splitlines() == [
+        "email,name,error_log",
+        "bia@x.com,Bia,antigo",
+        "ana@x.com,Ana,novo",
+    ]
+
+
+def test_write_durations_are_reported(tmp_path):
+    durations = []
+    writer = DlqWriter(str(tmp_path / "dlq.csv"), flush_interval=60, on_write=durations.append)
+
+    writer.write([{"name": "Ana", "email": "ana@x.com"}], "falhou")
+    writer.sync()
+    writer.close()
+
+    # One append, one flush + fsync
+    assert len(durations) == 2 and all(d >= 0 for d in durations)
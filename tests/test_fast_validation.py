@@ -0,0 +1,117 @@
+import csv
+import random
+from pathlib import Path
+
+import pytest
+from pydantic import ValidationError
+
+from src.odoo_xmlrpc_csv_importer.domain.contact import (
+    _fast_validate,
+    format_validation_error,
+    validate_chunk,
+    validate_contact,
+)
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+
+LOCAL_PARTS = ["ana", "Ana.Silva", "a+tag", "x_y", "a%b", "a..b", ".ana", "ana.", "ção", "a b", "x" * 70, ""]
+DOMAIN_PARTS = [
+    "example.com", "EXAMPLE.COM", "sub.example.org", "c.d", "example", "b-.com", "a--b.com",
+    "xn--bcher-kva.com", "site.test", "host.local", "b.co1", "1.2.3.4", "[1.2.3.4]", "",
+]
+EMAIL_NOISE = [" ", "\t", "\xa0", "@", "<", ">", "John <ana@example.com>"]
+URL_PARTS = [
+    "http://", "https://", "HTTP://", "ftp://", "", "example.com", "Example.COM", "localhost",
+    "1.2.3.4", "exa_mple.com", "a.0x1", "xn--bcher-kva.com", ":80", ":8080", "/", "/a/b",
+    "/a/../b", "/./x", "//x", "/a.html", "/~u", "/%7e", "/a b", "?q=1", "#frag", " ",
+]
+TEXT_PARTS = ["", " ", "São Paulo", "New York", "x" * 60, "\t", "\xa0", "\x1c", "ação", "A/B"]
+
+
+def fuzz_contact(rng: random.Random) -> dict:
+    def pick(parts, n):
+        if rng.random() < 0.7:
+            return rng.choice(parts)
+        return "".join(rng.choice(parts) for _ in range(rng.randint(0, n)))
+
+    def noisy(value, noise):
+        # Most values stay well-formed, so both paths get exercised
+        if rng.random() < 0.8:
+            return value
+        position = rng.randint(0, len(value))
+        return value[:position] + rng.choice(noise) + value[position:]
+
+    def biased(parts, good):
+        return rng.choice(parts[:good] if rng.random() < 0.7 else parts)
+
+    contact = {
+        "name": noisy(biased(TEXT_PARTS, 4)[:50] or "Ana", TEXT_PARTS),
+        "email": noisy(f"{biased(LOCAL_PARTS, 5)}@{biased(DOMAIN_PARTS, 4)}", EMAIL_NOISE),
+        "function": pick(TEXT_PARTS, 3),
+        "company_name": pick(TEXT_PARTS, 5),
+        "city": pick(TEXT_PARTS, 3),
+        "country_id": pick(TEXT_PARTS, 2),
+        "state_id": pick(TEXT_PARTS, 2),
+        "street": pick(TEXT_PARTS, 6),
+        "website": "https://example.com/in/x" if rng.random() < 0.6 else pick(URL_PARTS, 4),
+    }
+    # Missing columns, None values (short CSV rows) and extra columns
+    for field in rng.sample(list(contact), rng.randint(0, 3)):
+        if rng.random() < 0.5:
+            del contact[field]
+        else:
+            contact[field] = None
+    if rng.random() < 0.1:
+        contact["extra"] = "ignored"
+    return contact
+
+
+def reference(contact: dict) -> tuple[dict, str | None]:
+    try:
+        return validate_contact(contact), None
+    except ValidationError as e:
+        return contact, format_validation_error(e)
+
+
+def assert_same_as_pydantic(contact: dict) -> None:
+    fast = _fast_validate(dict(contact))
+    if fast is not None:
+        assert list(fast.items()) == list(validate_contact(contact).items())
+    assert validate_chunk([contact]) == [reference(contact)]
+
+
+@pytest.mark.parametrize("file_name", sorted(p.name for p in DATA_DIR.glob("*.csv")))
+def test_fast_path_matches_pydantic_on_data_files(file_name):
+    with open(DATA_DIR / file_name, newline="", encoding="utf-8") as file:
+        rows = list(csv.DictReader(file))
+
+    assert validate_chunk(rows) == [reference(row) for row in rows]
+
+
+def test_fast_path_matches_pydantic_on_fuzzed_rows():
+    rng = random.Random(12)
+    fast_hits = 0
+    for _ in range(5000):
+        contact = fuzz_contact(rng)
+        assert_same_as_pydantic(contact)
+        fast_hits += _fast_validate(contact) is not None
+
+    # The generator must exercise the fast path, not only the fallback
+    assert fast_hits > 100
+
+
+@pytest.mark.parametrize(
+    "patch",
+    [
+        {"email": " Ana@Example.COM "},
+        {"website": "https://example.com"},
+        {"website": "https://example.com/a/../b"},
+        {"website": "HTTP://Example.com"},
+        {"name": " Ana "},
+        {"city": "x\x1c"},
+        {"email": "ana@xn--bcher-kva.com"},
+        {"email": "ana@example.test"},
+    ],
+)
+def test_fast_path_edge_cases(base_contact, patch):
+    assert_same_as_pydantic(base_contact | patch)
@@ -0,0 +1,638 @@
+import asyncio
+import csv
+import io
+import json
+import threading
+import time
+import warnings
+import xmlrpc.client
+from pathlib import Path
+
+import pytest
+from rich.console import Console
+
+from src.odoo_xmlrpc_csv_importer.application.import_contacts import (
+    BatchJob,
+    import_contacts,
+    plan_writes,
+    send_or_bisect,
+)
+from src.odoo_xmlrpc_csv_importer.application.replay_dlq import is_replayable, set_aside_dlq
+from src.odoo_xmlrpc_csv_importer.core.adaptive import AdaptiveController
+from src.odoo_xmlrpc_csv_importer.infrastructure.checkpoint_journal import CheckpointJournal
+from src.odoo_xmlrpc_csv_importer.infrastructure.circuit_breaker import CircuitBreaker
+from src.odoo_xmlrpc_csv_importer.infrastructure.csv_manager import CsvManager
+from src.odoo_xmlrpc_csv_importer.infrastructure.import_stats import ImportStats
+from src.odoo_xmlrpc_csv_importer.infrastructure.odoo_client import OdooClient
+from src.odoo_xmlrpc_csv_importer.infrastructure.persistent_cache import PersistentCache
+from src.odoo_xmlrpc_csv_importer.infrastructure.tracer import Tracer
+from src.odoo_xmlrpc_csv_importer.services.partner_index import PartnerIndex
+from src.odoo_xmlrpc_csv_importer.services.reference_cache import ReferenceCache
+
+DATA_FILE = Path(__file__).parent.parent / "data" / "100.csv"
+
+
+def rewrite_csv(source: Path, target: Path, change) -> None:
+    with source.open(newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    change(rows)
+    with target.open("w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def run_import(
+    server,
+    tmp_path,
+    *,
+    file_name=DATA_FILE,
+    batch_size=10,
+    max_workers=2,
+    protocol="xmlrpc",
+    compact_rows=False,
+    validation_workers=1,
+    row_filter=None,
+    breaker=None,
+    tracer=None,
+    **options,
+) -> ImportStats:
+    odoo = server.odoo
+    odoo_client = OdooClient(
+        url=server.url,
+        db=odoo.db,
+        username=odoo.username,
+        password=odoo.password,
+        protocol=protocol,
+        breaker=breaker,
+        tracer=tracer,
+    )
+    odoo_client.authenticate()
+
+    import_stats = ImportStats(max_workers=max_workers, tracer=tracer)
+    csv_manager = CsvManager(
+        file_name,
+        str(tmp_path / "failed_records.csv"),
+        import_stats=import_stats,
+        compact_rows=compact_rows,
+        validation_workers=validation_workers,
+        row_filter=row_filter,
+    )
+    import_contacts(
+        file_name=file_name,
+        max_workers=max_workers,
+        batch_size=batch_size,
+        odoo_client=odoo_client,
+        csv_manager=csv_manager,
+        reference_cache=ReferenceCache(),
+        import_stats=import_stats,
+        console=Console(file=io.StringIO()),
+        **options,
+    )
+    return import_stats
+
+
+def test_import_creates_every_unique_contact(fake_odoo, tmp_path):
+    stats = run_import(fake_odoo, tmp_path).snapshot()
+
+    partners = fake_odoo.odoo.partners()
+    assert stats["contacts_created"] == len(partners) > 0
+    assert stats["batch_errors"] == 0
+    assert len({p["email"] for p in partners}) == len(partners)
+    assert all(p["country_id"] for p in partners)
+
+
+def test_import_is_idempotent(fake_odoo, tmp_path):
+    first = run_import(fake_odoo, tmp_path).snapshot()
+    second = run_import(fake_odoo, tmp_path).snapshot()
+
+    assert second["contacts_created"] == 0
+    assert second["contacts_skipped_odoo"] == first["contacts_created"]
+
+
+@pytest.mark.parametrize("batch_size", [1, 7, 1000])
+def test_import_batch_size_does_not_change_result(fake_odoo, tmp_path, batch_size):
+    stats = run_import(fake_odoo, tmp_path, batch_size=batch_size).snapshot()
+    assert stats["contacts_created"] == len(fake_odoo.odoo.partners())
+
+
+def test_prefetch_references_skips_per_row_lookups(fake_odoo, tmp_path):
+    # Prefetching is the default, as in the CLI
+    run_import(fake_odoo, tmp_path)
+
+    counts = fake_odoo.odoo.rpc_counts
+    assert counts["res.country.search"] == counts["res.country.state.search"] == 0
+    assert counts["res.country.search_read"] == counts["res.country.state.search_read"] == 1
+    assert all(p["state_id"] for p in fake_odoo.odoo.partners())
+
+
+def test_without_prefetch_references_are_looked_up_on_demand(fake_odoo, tmp_path):
+    run_import(fake_odoo, tmp_path, prefetch_references=False)
+
+    counts = fake_odoo.odoo.rpc_counts
+    assert counts["res.country.search_read"] == counts["res.country.state.search_read"] == 0
+    assert counts["res.country.search"] > 0 and counts["res.country.state.search"] > 0
+    assert all(p["state_id"] for p in fake_odoo.odoo.partners())
+
+
+def test_persistent_cache_skips_existence_search_on_rerun(fake_odoo, tmp_path):
+    persistent_cache = PersistentCache(
+        str(tmp_path / "cache.sqlite"), url=fake_odoo.url, db="test", ttl_seconds=3600
+    )
+    run_import(fake_odoo, tmp_path, persistent_cache=persistent_cache)
+    fake_odoo.odoo.rpc_counts.clear()
+
+    stats = run_import(fake_odoo, tmp_path, persistent_cache=persistent_cache).snapshot()
+
+    assert stats["contacts_created"] == 0
+    assert fake_odoo.odoo.rpc_counts["res.partner.search_read"] == 0
+
+
+def test_batches_reuse_keep_alive_connections(fake_odoo, tmp_path):
+    odoo = fake_odoo.odoo
+    odoo_client = OdooClient(
+        url=fake_odoo.url,
+        db=odoo.db,
+        username=odoo.username,
+        password=odoo.password,
+        pool_size=2,
+        gzip_min_bytes=512,
+    )
+    odoo_client.authenticate()
+
+    for _ in range(5):
+        with odoo_client.models() as models:
+            odoo_client.create_contacts(models, [{"name": "x" * 600, "email": "a@a.com"}])
+
+    stats = odoo_client.connection_stats.snapshot()
+    assert stats["requests"] == 6
+    # One connection per endpoint, every other request rides on it
+    assert stats["connections_opened"] == 2
+    # Request bodies above 512 bytes went out gzip-compressed
+    assert 0 < stats["bytes_sent"] < 5 * 600
+    assert stats["bytes_received"] > 0
+    assert len(odoo.partners()) == 5
+
+
+def test_pipeline_engine_matches_threads_engine(fake_odoo, tmp_path):
+    stats = run_import(
+        fake_odoo, tmp_path, engine="pipeline", stage_workers=(2, 1, 2)
+    ).snapshot()
+
+    assert stats["contacts_created"] == len(fake_odoo.odoo.partners()) > 0
+    assert stats["batches_completed"] == 10
+    assert stats["active_workers"] == 0
+
+
+def test_asyncio_engine_matches_threads_engine(fake_odoo, tmp_path):
+    pytest.importorskip("httpx")
+    stats = run_import(fake_odoo, tmp_path, engine="asyncio", max_workers=8).snapshot()
+
+    assert stats["contacts_created"] == len(fake_odoo.odoo.partners()) > 0
+    assert stats["batches_completed"] == 10
+    assert fake_odoo.odoo.rpc_counts["res.country.search"] == 0
+
+
+@pytest.mark.parametrize("engine", ["threads", "asyncio"])
+def test_jsonrpc_protocol_matches_xmlrpc(fake_odoo, tmp_path, engine):
+    if engine == "asyncio":
+        pytest.importorskip("httpx")
+    stats = run_import(fake_odoo, tmp_path, protocol="jsonrpc", engine=engine).snapshot()
+
+    assert stats["contacts_created"] == len(fake_odoo.odoo.partners()) > 0
+    assert stats["batch_errors"] == 0
+
+
+def test_jsonrpc_errors_raise_faults(fake_odoo):
+    odoo = fake_odoo.odoo
+    odoo_client = OdooClient(
+        url=fake_odoo.url,
+        db=odoo.db,
+        username=odoo.username,
+        password="wrong",
+        protocol="jsonrpc",
+    )
+    odoo_client.uid = odoo.uid
+
+    with odoo_client.models() as models, pytest.raises(xmlrpc.client.Fault, match="Access Denied"):
+        models.execute_kw(odoo.db, odoo.uid, "wrong", "res.partner", "search", [[]])
+
+
+@pytest.mark.parametrize("engine", ["threads", "pipeline", "asyncio"])
+def test_load_write_method_upserts_in_one_rpc_per_batch(fake_odoo, tmp_path, engine):
+    if engine == "asyncio":
+        pytest.importorskip("httpx")
+    first = run_import(fake_odoo, tmp_path, engine=engine, write_method="load").snapshot()
+    partners = fake_odoo.odoo.partners()
+
+    counts = fake_odoo.odoo.rpc_counts
+    assert counts["res.partner.load"] == first["batches_completed"] == 10
+    assert counts["res.partner.search_read"] == counts["res.country.search"] == 0
+    assert first["contacts_loaded"] == len(partners) > 0
+    assert first["contacts_created"] == 0
+    assert all(p["country_id"] and p["state_id"] for p in partners)
+
+    # Re-running updates the same records through their external ids, not counted as created
+    second = run_import(fake_odoo, tmp_path, engine=engine, write_method="load").snapshot()
+    assert len(fake_odoo.odoo.partners()) == len(partners)
+    assert second["contacts_loaded"] == len(partners)
+    assert second["contacts_created"] == 0
+
+
+def test_load_errors_send_only_the_bad_rows_to_the_dlq(fake_odoo, tmp_path):
+    csv_file = tmp_path / "contacts.csv"
+    csv_file.write_text(
+        "name,email,country_id,state_id\n"
+        "Ana,ana@example.com,Brazil,Bahia\n"
+        "Bia,bia@example.com,Atlantis,\n",
+        encoding="utf-8",
+    )
+
+    stats = run_import(
+        fake_odoo, tmp_path, file_name=csv_file, write_method="load"
+    ).snapshot()
+
+    assert stats["batch_errors"] == 0
+    assert stats["contacts_loaded"] == stats["contacts_rejected"] == 1
+    assert [p["email"] for p in fake_odoo.odoo.partners()] == ["ana@example.com"]
+    dlq = (tmp_path / "failed_records.csv").read_text(encoding="utf-8")
+    assert "Atlantis" in dlq and "ana@example.com" not in dlq
+
+
+@pytest.mark.parametrize("write_method", ["create", "load"])
+def test_compact_rows_import_matches_dict_rows(fake_odoo, tmp_path, write_method):
+    stats = run_import(
+        fake_odoo, tmp_path, compact_rows=True, write_method=write_method
+    ).snapshot()
+
+    partners = fake_odoo.odoo.partners()
+    assert stats["contacts_created"] + stats["contacts_loaded"] == len(partners) > 0
+    assert stats["batch_errors"] == 0
+    assert all(p["country_id"] and p["state_id"] for p in partners)
+
+
+@pytest.mark.parametrize("engine", ["threads", "pipeline", "asyncio"])
+def test_partner_index_replaces_per_batch_searches(fake_odoo, tmp_path, engine):
+    if engine == "asyncio":
+        pytest.importorskip("httpx")
+    first = run_import(fake_odoo, tmp_path).snapshot()
+    fake_odoo.odoo.rpc_counts.clear()
+
+    second = run_import(
+        fake_odoo,
+        tmp_path,
+        engine=engine,
+        partner_index=PartnerIndex(page_size=7),
+    ).snapshot()
+
+    assert second["contacts_created"] == 0
+    assert second["contacts_skipped_odoo"] == first["contacts_created"]
+    # One paginated scan instead of one `email in [...]` search per batch
+    pages = first["contacts_created"] // 7 + 1
+    assert fake_odoo.odoo.rpc_counts["res.partner.search_read"] == pages
+
+
+def test_partner_index_refresh_picks_up_new_partners(fake_odoo):
+    odoo = fake_odoo.odoo
+    odoo_client = OdooClient(
+        url=fake_odoo.url, db=odoo.db, username=odoo.username, password=odoo.password
+    )
+    odoo_client.authenticate()
+    index = PartnerIndex(refresh_seconds=0)
+
+    with odoo_client.models() as models:
+        odoo_client.create_contacts(models, [{"name": "Ana", "email": "Ana@Example.com"}])
+        index.load(models=models, odoo_client=odoo_client)
+        odoo_client.create_contacts(models, [{"name": "Bia", "email": "bia@example.com"}])
+        index.maybe_refresh(models=models, odoo_client=odoo_client)
+
+    assert set(index.get_partner_ids(["ana@example.com", "bia@example.com", "x@y.com"])) == {
+        "ana@example.com",
+        "bia@example.com",
+    }
+
+
+@pytest.mark.parametrize("engine", ["threads", "pipeline", "asyncio"])
+def test_resume_from_a_finished_journal_sends_nothing(fake_odoo, tmp_path, engine):
+    if engine == "asyncio":
+        pytest.importorskip("httpx")
+    journal = CheckpointJournal(tmp_path / "import.journal")
+    journal.open(DATA_FILE)
+    run_import(fake_odoo, tmp_path, engine=engine, journal=journal)
+    journal.close()
+    assert len(journal.path.read_text().splitlines()) == 1 + 10
+
+    fake_odoo.odoo.rpc_counts.clear()
+    journal.open(DATA_FILE, resume=True)
+    stats = run_import(
+        fake_odoo, tmp_path, engine=engine, journal=journal, resume_point=journal.resume_point()
+    ).snapshot()
+    journal.close()
+
+    assert stats["batches_completed"] == 0
+    assert fake_odoo.odoo.rpc_counts["res.partner.search_read"] == 0
+
+
+def test_resume_does_not_log_trailing_invalid_rows_again(fake_odoo, tmp_path):
+    file_name = tmp_path / "contacts.csv"
+    rewrite_csv(DATA_FILE, file_name, lambda rows: rows.append(dict(rows[0], email="")))
+    journal = CheckpointJournal(tmp_path / "import.journal")
+    journal.open(file_name)
+    first = run_import(fake_odoo, tmp_path, file_name=file_name, journal=journal).snapshot()
+    journal.close()
+
+    journal.open(file_name, resume=True)
+    stats = run_import(
+        fake_odoo,
+        tmp_path,
+        file_name=file_name,
+        journal=journal,
+        resume_point=journal.resume_point(),
+    ).snapshot()
+    journal.close()
+
+    assert first["validation_errors"] == 1
+    assert stats["validation_errors"] == stats["batches_completed"] == 0
+
+
+def correct_first_rows(rows: list) -> None:
+    for row in rows[:3]:
+        row["company_name"] = "Acme Ltda"
+    rows[3]["function"] = "Diretora"
+
+
+@pytest.mark.parametrize("engine", ["threads", "pipeline", "asyncio"])
+def test_on_conflict_update_groups_identical_changes(fake_odoo, tmp_path, engine):
+    if engine == "asyncio":
+        pytest.importorskip("httpx")
+    first = run_import(fake_odoo, tmp_path).snapshot()
+    corrected = tmp_path / "corrected.csv"
+    rewrite_csv(DATA_FILE, corrected, correct_first_rows)
+    fake_odoo.odoo.rpc_counts.clear()
+
+    stats = run_import(
+        fake_odoo, tmp_path, file_name=corrected, engine=engine, on_conflict="update"
+    ).snapshot()
+
+    assert stats["contacts_created"] == 0
+    assert stats["contacts_updated"] == 4
+    assert stats["contacts_skipped_odoo"] == first["contacts_created"] - 4
+    # The three identical corrections share one multi-id write
+    assert stats["write_calls"] == fake_odoo.odoo.rpc_counts["res.partner.write"] == 2
+    companies = [p["company_name"] for p in fake_odoo.odoo.partners()]
+    assert companies.count("Acme Ltda") == 3
+
+
+def test_on_conflict_update_skips_partners_already_up_to_date(fake_odoo, tmp_path):
+    first = run_import(fake_odoo, tmp_path).snapshot()
+    fake_odoo.odoo.rpc_counts.clear()
+
+    stats = run_import(fake_odoo, tmp_path, on_conflict="update").snapshot()
+
+    assert stats["contacts_updated"] == stats["write_calls"] == 0
+    assert stats["contacts_skipped_odoo"] == first["contacts_created"]
+    assert fake_odoo.odoo.rpc_counts["res.partner.write"] == 0
+
+
+def test_plan_writes_compares_with_odoo_read_values():
+    record = {
+        "id": 7,
+        "name": "Ana",
+        "function": False,
+        "country_id": [31, "Brazil"],
+        "state_id": False,
+    }
+    same = {"name": "Ana", "function": None, "country_id": 31, "state_id": None}
+    moved = {"name": "Ana", "function": None, "country_id": 31, "state_id": 5}
+
+    assert plan_writes([(same, record)]) == []
+    assert plan_writes([(moved, record), (moved, dict(record, id=8))]) == [
+        ([7, 8], {"state_id": 5})
+    ]
+
+
+def test_outage_during_bisection_rejects_only_the_rows_not_written():
+    rows = [{"email": f"c{i}@example.com"} for i in range(16)]
+    written = []
+
+    def create(chunk):
+        if len(written) == 2:
+            raise ConnectionRefusedError("Odoo fora do ar")
+        if rows[3] in chunk:
+            raise xmlrpc.client.Fault(1, "ValidationError: blocked")
+        written.append(chunk)
+        return list(range(len(chunk)))
+
+    job = BatchJob(batch=rows, contacts=rows)
+    sent = send_or_bisect(job, rows, create)
+
+    assert [chunk for chunk, _ in sent] == written
+    rejected = [row for row, _ in job.rejected]
+    # A DLQ replay must not create the written rows a second time
+    assert not any(row in chunk for chunk in written for row in rejected)
+    assert len(rejected) + sum(map(len, written)) == len(rows)
+    assert any(isinstance(e, ConnectionRefusedError) for _, e in job.rejected)
+
+
+def first_emails(count: int) -> list[str]:
+    with DATA_FILE.open(newline="", encoding="utf-8") as f:
+        return [row["email"].lower() for row, _ in zip(csv.DictReader(f), range(count))]
+
+
+@pytest.mark.parametrize("engine", ["threads", "pipeline", "asyncio"])
+def test_bisection_sends_only_rejected_rows_to_the_dlq(fake_odoo, tmp_path, engine):
+    if engine == "asyncio":
+        pytest.importorskip("httpx")
+    blocked = first_emails(5)[1::3]
+    fake_odoo.odoo.blocked_emails = set(blocked)
+
+    stats = run_import(fake_odoo, tmp_path, engine=engine).snapshot()
+
+    assert stats["batch_errors"] == 0
+    assert stats["contacts_rejected"] == len(blocked) == 2
+    emails = {p["email"] for p in fake_odoo.odoo.partners()}
+    assert emails.isdisjoint(blocked) and stats["contacts_created"] == len(emails)
+    with (tmp_path / "failed_records.csv").open(newline="", encoding="utf-8") as f:
+        dlq = list(csv.DictReader(f))
+    assert sorted(row["email"] for row in dlq) == sorted(blocked)
+    assert all(row["email"] in row["error_log"] for row in dlq)
+
+
+def test_bisection_isolates_rejected_partners_of_a_grouped_write(fake_odoo, tmp_path):
+    run_import(fake_odoo, tmp_path)
+    corrected = tmp_path / "corrected.csv"
+    rewrite_csv(DATA_FILE, corrected, correct_first_rows)
+    fake_odoo.odoo.blocked_emails = {first_emails(2)[1]}
+
+    stats = run_import(fake_odoo, tmp_path, file_name=corrected, on_conflict="update").snapshot()
+
+    assert stats["contacts_updated"] == 3
+    assert stats["contacts_rejected"] == 1
+    companies = [p["company_name"] for p in fake_odoo.odoo.partners()]
+    assert companies.count("Acme Ltda") == 2
+
+
+@pytest.mark.parametrize("skip_validation_errors", [True, False])
+def test_replay_dlq_reimports_rows_rejected_by_odoo(fake_odoo, tmp_path, skip_validation_errors):
+    csv_file = tmp_path / "contacts.csv"
+    csv_file.write_text(
+        "name,email,function,company_name,city,country_id,state_id,street,website\n"
+        "Ana,ana@example.com,Dev,Acme,Salvador,Brazil,Bahia,Rua A,https://acme.com\n"
+        "Bia,bia@example.com,Dev,Acme,Salvador,Brazil,Bahia,Rua B,https://acme.com\n"
+        "Cid,not-an-email,Dev,Acme,Salvador,Brazil,Bahia,Rua C,https://acme.com\n",
+        encoding="utf-8",
+    )
+    fake_odoo.odoo.blocked_emails = {"bia@example.com"}
+    run_import(fake_odoo, tmp_path, file_name=csv_file)
+    fake_odoo.odoo.blocked_emails = set()
+
+    dlq_file = tmp_path / "failed_records.csv"
+    replay_file = set_aside_dlq(dlq_file)
+    stats = run_import(
+        fake_odoo,
+        tmp_path,
+        file_name=replay_file,
+        row_filter=is_replayable if skip_validation_errors else None,
+    ).snapshot()
+
+    assert stats["contacts_created"] == 1
+    bia = next(p for p in fake_odoo.odoo.partners() if p["email"] == "bia@example.com")
+    # The DLQ kept the names read from the CSV, not the ids sent to Odoo
+    assert bia["country_id"] and bia["state_id"]
+    if skip_validation_errors:
+        assert stats["validation_errors"] == 0 and not dlq_file.exists()
+    else:
+        with dlq_file.open(newline="", encoding="utf-8") as f:
+            assert [row["email"] for row in csv.DictReader(f)] == ["not-an-email"]
+
+
+def test_adaptive_controller_grows_batches_while_calls_are_fast(fake_odoo, tmp_path):
+    controller = AdaptiveController(max_concurrency=4, batch_size=10)
+
+    stats = run_import(
+        fake_odoo, tmp_path, batch_size=10, max_workers=4, controller=controller
+    ).snapshot()
+
+    partners = fake_odoo.odoo.partners()
+    assert stats["contacts_created"] == len(partners) > 0
+    assert stats["batches_completed"] < len(partners) / 10
+    assert controller.batch_size > 10
+    assert 1 <= controller.concurrency <= 4
+
+
+def test_adaptive_controller_requires_the_threads_engine(fake_odoo, tmp_path):
+    controller = AdaptiveController(max_concurrency=4, batch_size=10)
+    with pytest.raises(ValueError):
+        run_import(fake_odoo, tmp_path, engine="pipeline", controller=controller)
+
+
+def test_circuit_breaker_pauses_every_worker_during_an_outage(tmp_path):
+    from benchmarks.fake_odoo import FakeOdoo, FakeOdooServer
+
+    odoo = FakeOdoo(seed=0, latency=0.01)
+    breaker = CircuitBreaker(failure_threshold=1, probe_interval=0.05)
+
+    def outage():
+        while odoo.rpc_counts["res.partner.create"] < 2:
+            time.sleep(0.001)
+        odoo.unavailable = True
+        time.sleep(0.3)
+        odoo.unavailable = False
+
+    with FakeOdooServer(odoo) as server:
+        threading.Thread(target=outage, daemon=True).start()
+        stats = run_import(server, tmp_path, max_workers=4, breaker=breaker).snapshot()
+
+    assert stats["batch_errors"] == 0
+    assert stats["contacts_created"] == len(odoo.partners()) > 0
+    assert breaker.trips >= 1
+    # Only the calls in flight and the probes hit the server while it was down
+    assert 0 < odoo.unavailable_hits <= 4 + breaker.probes
+
+
+def test_giving_up_on_the_circuit_is_not_retried(tmp_path):
+    from benchmarks.fake_odoo import FakeOdoo, FakeOdooServer
+    # The classes the retry policy checks against, as imported by the client
+    from src.odoo_xmlrpc_csv_importer.application.import_contacts import CircuitOpenError
+    from src.odoo_xmlrpc_csv_importer.infrastructure.odoo_client import (
+        CircuitBreaker as ClientBreaker,
+    )
+
+    odoo = FakeOdoo(seed=0)
+    breaker = ClientBreaker(failure_threshold=1, probe_interval=0.05, max_open_seconds=0.3)
+
+    with FakeOdooServer(odoo) as server:
+        odoo_client = OdooClient(
+            url=server.url,
+            db=odoo.db,
+            username=odoo.username,
+            password=odoo.password,
+            breaker=breaker,
+        )
+        odoo_client.authenticate()
+        odoo.unavailable = True
+        started = time.monotonic()
+        with odoo_client.models() as models, pytest.raises(CircuitOpenError):
+            odoo_client.get_country_id(models, "Brazil")
+        waited = time.monotonic() - started
+
+    # One wait for the probe, not one per tenacity attempt
+    assert breaker.max_open_seconds <= waited < 2 * breaker.max_open_seconds
+
+
+@pytest.mark.parametrize("engine", ["threads", "pipeline", "asyncio"])
+def test_stage_latencies_are_recorded(fake_odoo, tmp_path, engine):
+    stats = run_import(fake_odoo, tmp_path, engine=engine)
+
+    stages = stats.stage_histograms()
+    assert set(stages) == {"csv_read", "validation", "search", "references", "create"}
+    assert stages["search"].count == stages["create"].count == stats.batches_completed
+
+
+@pytest.mark.parametrize("engine", ["threads", "pipeline", "asyncio"])
+def test_trace_tags_rpcs_with_their_batch(fake_odoo, tmp_path, engine):
+    tracer = Tracer(tmp_path / "trace.json")
+    stats = run_import(fake_odoo, tmp_path, engine=engine, tracer=tracer)
+    tracer.write()
+
+    events = json.loads((tmp_path / "trace.json").read_text())["traceEvents"]
+    spans = [e for e in events if e["ph"] == "X"]
+    creates = [e for e in spans if e["name"] == "res.partner.create"]
+    assert len(creates) == stats.batches_completed
+    assert {e["args"]["batch"] for e in creates} == set(range(1, stats.batches_completed + 1))
+    assert {"search", "references", "create"} <= {e["name"] for e in spans if e["cat"] == "stage"}
+
+    if engine != "pipeline":
+        batches = [e for e in spans if e["cat"] == "batch"]
+        assert len(batches) == stats.batches_completed
+        assert len([e for e in events if e["ph"] == "b"]) == stats.batches_completed
+
+
+def test_validation_pool_starts_safely_from_a_threaded_import(fake_odoo, tmp_path):
+    # fork() from a process with running threads warns, and may deadlock
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        stats = run_import(fake_odoo, tmp_path, validation_workers=2)
+
+    assert not [w for w in caught if "fork()" in str(w.message)]
+    assert stats.contacts_created == len(fake_odoo.odoo.partners())
+    assert stats.batch_errors == 0
+
+
+def test_async_engine_reads_batches_off_the_event_loop():
+    from src.odoo_xmlrpc_csv_importer.application.async_engine import _abatches
+
+    readers = []
+
+    def batches():
+        for number in range(3):
+            readers.append(threading.get_ident())
+            yield [number]
+
+    async def collect():
+        return [batch async for batch in _abatches(batches())], threading.get_ident()
+
+    collected, loop_thread = asyncio.run(collect())
+
+    assert collected == [[0], [1], [2]]
+    assert loop_thread not in readers
@@ -0,0 +1,116 @@
+import csv
+import gzip
+import json
+from pathlib import Path
+
+import pytest
+
+from src.odoo_xmlrpc_csv_importer.infrastructure.checkpoint_journal import ResumePoint
+from src.odoo_xmlrpc_csv_importer.infrastructure.csv_manager import CsvManager
+from src.odoo_xmlrpc_csv_importer.infrastructure.import_stats import ImportStats
+from src.odoo_xmlrpc_csv_importer.infrastructure.input_readers import (
+    detect_format,
+    read_rows,
+)
+
+DATA_FILE = Path(__file__).parent.parent / "data" / "100.csv"
+
+
+def csv_rows() -> list[dict]:
+    with DATA_FILE.open(newline="", encoding="utf-8") as file:
+        return list(csv.DictReader(file))
+
+
+def write_input(tmp_path, name: str) -> Path:
+    """data/100.csv converted to the format and compression given by `name`"""
+    target = tmp_path / name
+    plain = DATA_FILE.read_bytes()
+    if ".jsonl" in name:
+        plain = "".join(json.dumps(row) + "\n" for row in csv_rows()).encode()
+    if name.endswith(".parquet"):
+        pa = pytest.importorskip("pyarrow")
+        pq = pytest.importorskip("pyarrow.parquet")
+        pq.write_table(pa.Table.from_pylist(csv_rows()), target, row_group_size=17)
+    elif name.endswith(".gz"):
+        target.write_bytes(gzip.compress(plain))
+    elif name.endswith(".zst"):
+        zstandard = pytest.importorskip("zstandard")
+        target.write_bytes(zstandard.ZstdCompressor().compress(plain))
+    else:
+        target.write_bytes(plain)
+    return target
+
+
+def manager(tmp_path, file_name, **options) -> CsvManager:
+    return CsvManager(
+        file_name,
+        str(tmp_path / "failed_records.csv"),
+        import_stats=ImportStats(max_workers=1),
+        **options,
+    )
+
+
+INPUTS = [
+    "contacts.csv.gz",
+    "contacts.csv.zst",
+    "contacts.jsonl",
+    "contacts.jsonl.gz",
+    "contacts.parquet",
+]
+
+
+@pytest.mark.parametrize("name", INPUTS)
+@pytest.mark.parametrize("compact_rows", [False, True])
+def test_every_input_streams_the_same_contacts_as_the_csv(tmp_path, name, compact_rows):
+    expected = list(manager(tmp_path, DATA_FILE).stream_csv_contacts())
+    file_name = write_input(tmp_path, name)
+
+    contacts = manager(tmp_path, file_name, compact_rows=compact_rows).stream_csv_contacts()
+
+    assert [dict(c) for c in contacts] == expected
+
+
+@pytest.mark.parametrize("name", INPUTS)
+def test_resume_continues_after_the_last_finished_batch(tmp_path, name):
+    file_name = write_input(tmp_path, name)
+    batches = list(manager(tmp_path, file_name).stream_batches(10))
+    resume_point = ResumePoint(
+        offset=batches[2].end_offset,
+        completed=[(batches[4].start_offset, batches[4].end_offset)],
+        next_batch=4,
+    )
+
+    resumed = list(manager(tmp_path, file_name).stream_batches(10, resume_point))
+
+    # Deduplication only knows the emails read in this run
+    finished = {c["email"] for b in batches[:3] + batches[4:5] for c in b}
+    expected = [c["email"] for b in batches[3:4] + batches[5:] for c in b]
+    assert [c["email"] for b in resumed for c in b if c["email"] not in finished] == expected
+    assert resumed[0].start_offset == batches[2].end_offset
+
+
+def test_jsonl_values_become_strings_and_late_keys_are_kept(tmp_path):
+    file_name = tmp_path / "contacts.ndjson"
+    file_name.write_text(
+        '{"name": "Ana", "email": "ana@example.com", "zip": 1234}\n'
+        "\n"
+        '{"name": "Bia", "email": "bia@example.com", "phone": "+55 11 5555-0000", "zip": null}\n',
+        encoding="utf-8",
+    )
+
+    rows = [row for row, _ in read_rows(file_name, compact_rows=True)]
+
+    assert [dict(row) for row in rows] == [
+        {"name": "Ana", "email": "ana@example.com", "zip": "1234"},
+        {"name": "Bia", "email": "bia@example.com", "zip": None, "phone": "+55 11 5555-0000"},
+    ]
+
+
+def test_format_comes_from_the_extension_under_the_compression(tmp_path):
+    assert detect_format(Path("export.JSONL.gz")) == "jsonl"
+    assert detect_format(Path("export.csv.zst")) == "csv"
+    assert detect_format(Path("export.parquet")) == "parquet"
+
+    unnamed = tmp_path / "export.bin"
+    unnamed.write_bytes(b"PAR1")
+    assert detect_format(unnamed) == "parquet"
@@ -0,0 +1,27 @@
+import pytest
+from typer.testing import CliRunner
+
+from src.odoo_xmlrpc_csv_importer.main import app
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        ["data/test.csv"],
+        ["data/test.csv", "--batch-size", "5"],
+        ["--batch-size", "5", "data/test.csv"],
+        ["import", "data/test.csv"],
+    ],
+)
+def test_file_without_a_subcommand_still_runs_import(args):
+    result = CliRunner().invoke(app, [*args, "--help"])
+
+    assert result.exit_code == 0
+    assert "import [OPTIONS]" in result.output
+
+
+def test_subcommands_are_not_taken_for_a_file():
+    result = CliRunner().invoke(app, ["cache-clear", "--help"])
+
+    assert result.exit_code == 0
+    assert "cache-clear [OPTIONS]" in result.output
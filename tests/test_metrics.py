@@ -0,0 +1,75 @@
+import json
+import urllib.request
+
+import pytest
+
+from src.odoo_xmlrpc_csv_importer.core.histogram import LatencyHistogram
+from src.odoo_xmlrpc_csv_importer.infrastructure.import_stats import ImportStats
+from src.odoo_xmlrpc_csv_importer.infrastructure.metrics_exporter import (
+    MetricsExporter,
+    render_metrics,
+)
+from src.odoo_xmlrpc_csv_importer.infrastructure.transport import ConnectionStats
+
+
+def test_quantiles_stay_within_a_bucket_of_the_exact_value():
+    histogram = LatencyHistogram()
+    for ms in range(1, 1001):
+        histogram.observe(ms / 1000)
+
+    for q in (0.50, 0.95, 0.99):
+        assert histogram.quantile(q) == pytest.approx(q, rel=0.2)
+    assert histogram.quantile(1.0) <= histogram.max == 1.0
+    assert histogram.cumulative()[-1] == (float("inf"), 1000)
+
+
+def stats_with_stages() -> tuple[ImportStats, ConnectionStats]:
+    import_stats = ImportStats(max_workers=2)
+    import_stats.record_batch_success(created=10, skipped_odoo=0)
+    for seconds in (0.01, 0.02, 0.3):
+        import_stats.record_stage("create", seconds)
+    connection_stats = ConnectionStats()
+    connection_stats.record(reused=False)
+    connection_stats.record_bytes(sent=1500, received=300)
+    return import_stats, connection_stats
+
+
+def test_openmetrics_exposition():
+    text = render_metrics(*stats_with_stages())
+
+    assert "# TYPE etl_rpc_sent_bytes counter\n" in text
+    assert "etl_rpc_sent_bytes_total 1500\n" in text
+    assert "etl_contacts_created_total 10\n" in text
+    assert 'etl_stage_duration_seconds_bucket{stage="create",le="+Inf"} 3\n' in text
+    assert 'etl_stage_duration_seconds_count{stage="create"} 3\n' in text
+    assert text.endswith("# EOF\n")
+
+    # The textfile collector reads the Prometheus format: full counter names, no EOF
+    prometheus = render_metrics(*stats_with_stages(), openmetrics=False)
+    assert "# TYPE etl_rpc_sent_bytes_total counter\n" in prometheus
+    assert "# EOF" not in prometheus
+
+
+def test_exporter_serves_metrics_and_writes_textfile_and_report(tmp_path):
+    import_stats, connection_stats = stats_with_stages()
+    exporter = MetricsExporter(
+        import_stats, connection_stats, port=0, host="127.0.0.1", textfile=tmp_path / "etl.prom"
+    ).start()
+    try:
+        request = urllib.request.Request(
+            f"http://127.0.0.1:{exporter.port}/metrics",
+            headers={"Accept": "application/openmetrics-text; version=1.0.0"},
+        )
+        with urllib.request.urlopen(request) as response:
+            assert response.headers["Content-Type"].startswith("application/openmetrics-text")
+            assert response.read().decode().endswith("# EOF\n")
+    finally:
+        exporter.stop()
+
+    assert "etl_batches_completed_total 1" in (tmp_path / "etl.prom").read_text()
+
+    exporter.write_report(tmp_path / "report.json")
+    report = json.loads((tmp_path / "report.json").read_text())
+    assert report["rpc"]["bytes_received"] == 300
+    assert report["stages"]["create"]["count"] == 3
+    assert report["stages"]["create"]["p99_seconds"] <= 0.3
@@ -0,0 +1,32 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from src.odoo_xmlrpc_csv_importer.core.ordered_map import ordered_map
+
+
+def slow_square(n: int) -> int:
+    # Earlier items finish last, so ordering cannot come from completion order
+    time.sleep(max(0, 10 - n) * 0.002)
+    return n * n
+
+
+def test_ordered_map_keeps_input_order():
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(ordered_map(executor, slow_square, range(10), max_pending=4))
+
+    assert results == [n * n for n in range(10)]
+
+
+def test_ordered_map_reads_input_lazily():
+    consumed = []
+
+    def source():
+        for n in range(100):
+            consumed.append(n)
+            yield n
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        results = ordered_map(executor, slow_square, source(), max_pending=3)
+        assert next(results) == 0
+
+    assert len(consumed) == 3
@@ -0,0 +1,51 @@
+from src.odoo_xmlrpc_csv_importer.infrastructure.persistent_cache import PersistentCache
+
+
+def open_cache(tmp_path, *, db="test", ttl_seconds=3600) -> PersistentCache:
+    return PersistentCache(
+        str(tmp_path / "cache.sqlite"),
+        url="http://localhost:8069/",
+        db=db,
+        ttl_seconds=ttl_seconds,
+    )
+
+
+def test_references_roundtrip_including_misses(tmp_path):
+    cache = open_cache(tmp_path)
+    cache.set_reference("country", "brazil", 31)
+    cache.set_reference("country", "atlantis", False)
+    cache.close()
+
+    cache = open_cache(tmp_path)
+    assert cache.get_reference("country", "brazil") == 31
+    assert cache.get_reference("country", "atlantis") is False
+    assert cache.get_reference("country", "portugal") is None
+
+
+def test_partner_ids_are_scoped_by_database(tmp_path):
+    cache = open_cache(tmp_path)
+    cache.set_partner_ids({"a@a.com": 1, "b@b.com": 2})
+
+    other = open_cache(tmp_path, db="other")
+    assert other.get_partner_ids(["a@a.com"]) == {}
+    assert cache.get_partner_ids(["a@a.com", "c@c.com"]) == {"a@a.com": 1}
+
+
+def test_expired_entries_are_ignored(tmp_path):
+    cache = open_cache(tmp_path, ttl_seconds=-1)
+    cache.set_partner_ids({"a@a.com": 1})
+    cache.set_reference("country", "brazil", 31)
+
+    assert cache.get_partner_ids(["a@a.com"]) == {}
+    assert cache.get_reference("country", "brazil") is None
+
+
+def test_invalidate(tmp_path):
+    cache = open_cache(tmp_path)
+    other = open_cache(tmp_path, db="other")
+    cache.set_partner_ids({"a@a.com": 1})
+    other.set_partner_ids({"a@a.com": 9})
+
+    assert cache.invalidate() == 1
+    assert other.get_partner_ids(["a@a.com"]) == {"a@a.com": 9}
+    assert cache.invalidate(all_scopes=True) == 1
@@ -0,0 +1,63 @@
+import threading
+
+import pytest
+
+from src.odoo_xmlrpc_csv_importer.core.pipeline import Pipeline, Stage
+
+
+def test_items_flow_through_every_stage():
+    done, lock = [], threading.Lock()
+
+    def collect(item):
+        with lock:
+            done.append(item)
+
+    pipeline = Pipeline(
+        [
+            Stage("double", lambda x: x * 2, workers=3, queue_size=2),
+            Stage("inc", lambda x: x + 1, workers=2, queue_size=2),
+        ],
+        on_done=collect,
+    ).start()
+    for n in range(50):
+        pipeline.put(n)
+    pipeline.close()
+
+    assert sorted(done) == [n * 2 + 1 for n in range(50)]
+
+
+def test_failed_items_are_reported_and_not_forwarded():
+    done, errors = [], []
+
+    def check(x):
+        if x % 5 == 0:
+            raise ValueError(x)
+        return x
+
+    pipeline = Pipeline(
+        [
+            Stage("check", check, workers=2, queue_size=1),
+            Stage("drop_odd", lambda x: x if x % 2 == 0 else None, workers=1, queue_size=1),
+        ],
+        on_done=done.append,
+        on_error=lambda item, stage, e: errors.append((item, stage)),
+    ).start()
+    for n in range(20):
+        pipeline.put(n)
+    pipeline.close()
+
+    assert sorted(errors) == [(n, "check") for n in (0, 5, 10, 15)]
+    assert sorted(done) == [2, 4, 6, 8, 12, 14, 16, 18]
+
+
+def test_callback_failures_surface_on_close():
+    def explode(item):
+        raise RuntimeError("dlq unavailable")
+
+    pipeline = Pipeline(
+        [Stage("only", lambda x: x, workers=1, queue_size=1)], on_done=explode
+    ).start()
+    pipeline.put(1)
+
+    with pytest.raises(RuntimeError, match="dlq unavailable"):
+        pipeline.close()
@@ -0,0 +1,40 @@
+import pickle
+
+import pytest
+
+from src.odoo_xmlrpc_csv_importer.core.record import Record, as_dicts
+
+INDEX = Record.build_index(["name", "email", "city"])
+
+
+def test_record_reads_like_a_dict():
+    record = Record(INDEX, ["Ana", "ana@example.com", "Recife"])
+
+    assert record["email"] == "ana@example.com"
+    assert record.get("missing", "x") == "x"
+    assert "city" in record and "street" not in record
+    assert record == {"name": "Ana", "email": "ana@example.com", "city": "Recife"}
+    assert not hasattr(record, "__dict__")
+
+
+def test_short_rows_read_missing_values_as_none():
+    record = Record(INDEX, ["Ana"])
+
+    assert record["city"] is None
+    record["city"] = "Recife"
+    assert record.to_dict() == {"name": "Ana", "email": None, "city": "Recife"}
+
+
+def test_unknown_keys_are_rejected_on_write():
+    with pytest.raises(KeyError):
+        Record(INDEX, ["Ana", "a@a.com", ""])["street"] = "x"
+
+
+def test_pickled_records_share_their_index():
+    rows = [Record(INDEX, [str(n), f"{n}@a.com", ""]) for n in range(3)]
+
+    restored = pickle.loads(pickle.dumps(rows))
+
+    assert restored == rows
+    assert len({id(r._index) for r in restored}) == 1
+    assert as_dicts(restored) == [r.to_dict() for r in rows]
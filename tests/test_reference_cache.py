@@ -0,0 +1,127 @@
+import pytest
+
+from src.odoo_xmlrpc_csv_importer.infrastructure.persistent_cache import PersistentCache
+from src.odoo_xmlrpc_csv_importer.services.reference_cache import (
+    ReferenceCache,
+    normalize_reference_name,
+)
+
+
+class StubOdooClient:
+    """Answers reference lookups from a fixed table and counts the RPCs"""
+
+    def __init__(self):
+        self.calls = 0
+        self.countries = {"Brazil": 1, "United States": 2}
+        self.states = {(1, "São Paulo"): 10, (2, "California"): 20}
+
+    def get_country_id(self, models, country_name):
+        self.calls += 1
+        return self.countries.get(country_name, False)
+
+    def get_state_id(self, models, country_id, state_name):
+        self.calls += 1
+        return self.states.get((country_id, state_name), False)
+
+    def search_read_all(self, models, model, domain, fields, page_size=1000):
+        self.calls += 1
+        if model == "res.country":
+            return [{"id": i, "name": n} for n, i in self.countries.items()]
+        return [
+            {"id": i, "name": n, "country_id": [c, "x"]}
+            for (c, n), i in self.states.items()
+        ]
+
+
+@pytest.mark.parametrize(
+    "name, expected",
+    [
+        ("São Paulo", "sao paulo"),
+        ("  SAO   paulo ", "sao paulo"),
+        ("", ""),
+        (None, ""),
+    ],
+)
+def test_normalize_reference_name(name, expected):
+    assert normalize_reference_name(name) == expected
+
+
+def test_misses_are_cached():
+    client = StubOdooClient()
+    cache = ReferenceCache()
+
+    for _ in range(3):
+        assert cache.get_contact_reference_ids(
+            models=None, country_name="Atlantis", state_name="Nowhere", odoo_client=client
+        ) == (False, False)
+
+    assert client.calls == 2
+
+
+def test_a_miss_for_one_spelling_does_not_hide_another():
+    client = StubOdooClient()
+    cache = ReferenceCache()
+
+    # Without a prefetch Odoo matches the exact name, so only "Brazil" is found
+    assert cache.get_contact_reference_ids(
+        models=None, country_name="brazil", state_name="são paulo", odoo_client=client
+    ) == (False, False)
+    assert cache.get_contact_reference_ids(
+        models=None, country_name="Brazil", state_name="São Paulo", odoo_client=client
+    ) == (1, 10)
+
+
+def test_blank_names_do_not_hit_odoo():
+    client = StubOdooClient()
+    cache = ReferenceCache()
+
+    assert cache.get_contact_reference_ids(
+        models=None, country_name="", state_name=None, odoo_client=client
+    ) == (False, False)
+    assert client.calls == 0
+
+
+def test_prefetch_resolves_without_rpc():
+    client = StubOdooClient()
+    cache = ReferenceCache()
+    cache.prefetch(models=None, odoo_client=client)
+    prefetch_calls = client.calls
+
+    assert cache.get_contact_reference_ids(
+        models=None, country_name="brazil", state_name="SAO PAULO", odoo_client=client
+    ) == (1, 10)
+    assert cache.get_contact_reference_ids(
+        models=None, country_name="Atlantis", state_name="Nowhere", odoo_client=client
+    ) == (False, False)
+    assert client.calls == prefetch_calls
+
+
+def test_prefetch_reuses_the_tables_saved_in_the_persistent_store(tmp_path):
+    client = StubOdooClient()
+    store = PersistentCache(str(tmp_path / "cache.sqlite"), url="u", db="d", ttl_seconds=3600)
+    ReferenceCache(store=store).prefetch(models=None, odoo_client=client)
+    prefetch_calls = client.calls
+
+    cache = ReferenceCache(store=store)
+    cache.prefetch(models=None, odoo_client=client)
+
+    assert client.calls == prefetch_calls
+    assert cache.get_contact_reference_ids(
+        models=None, country_name="BRAZIL", state_name="sao paulo", odoo_client=client
+    ) == (1, 10)
+    assert cache.get_contact_reference_ids(
+        models=None, country_name="Atlantis", state_name="Nowhere", odoo_client=client
+    ) == (False, False)
+    assert client.calls == prefetch_calls
+
+
+def test_prefetch_reads_odoo_again_once_the_store_is_cleared(tmp_path):
+    client = StubOdooClient()
+    store = PersistentCache(str(tmp_path / "cache.sqlite"), url="u", db="d", ttl_seconds=3600)
+    ReferenceCache(store=store).prefetch(models=None, odoo_client=client)
+    store.invalidate()
+    prefetch_calls = client.calls
+
+    ReferenceCache(store=store).prefetch(models=None, odoo_client=client)
+
+    assert client.calls == 2 * prefetch_calls
@@ -0,0 +1,44 @@
+import socket
+import xmlrpc.client
+
+import pytest
+
+from src.odoo_xmlrpc_csv_importer.infrastructure.odoo_client import LoadError
+from src.odoo_xmlrpc_csv_importer.infrastructure.retry_policy import (
+    CircuitOpenError,
+    is_call_error,
+    is_transient_error,
+)
+
+
+@pytest.mark.parametrize(
+    "error",
+    [
+        ConnectionRefusedError(),
+        socket.timeout("timed out"),
+        xmlrpc.client.ProtocolError("odoo/xmlrpc", 502, "Bad Gateway", {}),
+        xmlrpc.client.Fault(1, "could not serialize access due to concurrent update"),
+    ],
+)
+def test_outages_are_transient(error):
+    assert is_transient_error(error)
+
+
+@pytest.mark.parametrize(
+    "error",
+    [
+        xmlrpc.client.Fault(1, "ValidationError: the email x@example.com is blocked"),
+        xmlrpc.client.ProtocolError("odoo/xmlrpc", 413, "Request Entity Too Large", {}),
+        LoadError([{"type": "error", "message": "No matching record found"}]),
+        ValueError("bad value"),
+    ],
+)
+def test_data_errors_are_not_transient(error):
+    assert not is_transient_error(error)
+
+
+def test_a_breaker_that_gave_up_is_neither_retried_nor_bisected():
+    error = CircuitOpenError("Odoo indisponível")
+
+    assert not is_transient_error(error)
+    assert is_call_error(error)
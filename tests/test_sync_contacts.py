@@ -0,0 +1,127 @@
+import csv
+import io
+
+from rich.console import Console
+
+from src.odoo_xmlrpc_csv_importer.application.sync_contacts import sync_contacts
+from src.odoo_xmlrpc_csv_importer.infrastructure.csv_manager import CsvManager
+from src.odoo_xmlrpc_csv_importer.infrastructure.import_stats import ImportStats
+from src.odoo_xmlrpc_csv_importer.infrastructure.odoo_client import OdooClient
+from src.odoo_xmlrpc_csv_importer.infrastructure.sync_state import SyncStateStore
+from src.odoo_xmlrpc_csv_importer.services.reference_cache import ReferenceCache
+
+from tests.test_import_contacts import DATA_FILE, rewrite_csv, run_import
+
+
+def run_sync(server, tmp_path, *, file_name=DATA_FILE, batch_size=10, max_workers=2) -> dict:
+    odoo = server.odoo
+    odoo_client = OdooClient(
+        url=server.url, db=odoo.db, username=odoo.username, password=odoo.password
+    )
+    odoo_client.authenticate()
+
+    import_stats = ImportStats(max_workers=max_workers)
+    state_store = SyncStateStore(str(tmp_path / "sync.sqlite"), url=server.url, db=odoo.db)
+    try:
+        sync_contacts(
+            file_name=file_name,
+            max_workers=max_workers,
+            batch_size=batch_size,
+            odoo_client=odoo_client,
+            csv_manager=CsvManager(
+                file_name, str(tmp_path / "failed_records.csv"), import_stats=import_stats
+            ),
+            reference_cache=ReferenceCache(),
+            import_stats=import_stats,
+            console=Console(file=io.StringIO()),
+            state_store=state_store,
+        )
+    finally:
+        state_store.close()
+    return import_stats.snapshot()
+
+
+def test_first_sync_creates_every_contact(fake_odoo, tmp_path):
+    stats = run_sync(fake_odoo, tmp_path)
+
+    assert stats["contacts_created"] == len(fake_odoo.odoo.partners()) > 0
+    assert stats["contacts_updated"] == stats["contacts_unchanged"] == 0
+
+
+def test_unchanged_export_sends_no_writes(fake_odoo, tmp_path):
+    first = run_sync(fake_odoo, tmp_path)
+    fake_odoo.odoo.rpc_counts.clear()
+
+    second = run_sync(fake_odoo, tmp_path)
+
+    counts = fake_odoo.odoo.rpc_counts
+    assert second["contacts_unchanged"] == first["contacts_created"]
+    assert second["contacts_created"] == second["contacts_updated"] == 0
+    assert counts["res.partner.create"] == counts["res.partner.write"] == 0
+    assert counts["res.partner.search_read"] == 0
+
+
+def test_changed_row_is_written_once(fake_odoo, tmp_path):
+    run_sync(fake_odoo, tmp_path)
+    fake_odoo.odoo.rpc_counts.clear()
+
+    changed_file = tmp_path / "changed.csv"
+    rewrite_csv(DATA_FILE, changed_file, lambda rows: rows[0].update(function="Diretora"))
+    email = next(csv.DictReader(changed_file.open(encoding="utf-8")))["email"].lower()
+
+    stats = run_sync(fake_odoo, tmp_path, file_name=changed_file)
+
+    assert stats["contacts_updated"] == 1
+    assert stats["contacts_created"] == 0
+    assert fake_odoo.odoo.rpc_counts["res.partner.write"] == 1
+    partner = next(p for p in fake_odoo.odoo.partners() if p["email"] == email)
+    assert partner["function"] == "Diretora"
+
+
+def test_rows_with_the_same_correction_share_one_write(fake_odoo, tmp_path):
+    run_sync(fake_odoo, tmp_path)
+    fake_odoo.odoo.rpc_counts.clear()
+
+    def correct(rows):
+        rows[0]["function"] = rows[1]["function"] = "Diretora"
+
+    changed_file = tmp_path / "changed.csv"
+    rewrite_csv(DATA_FILE, changed_file, correct)
+
+    stats = run_sync(fake_odoo, tmp_path, file_name=changed_file, batch_size=100)
+
+    assert stats["contacts_updated"] == 2
+    assert fake_odoo.odoo.rpc_counts["res.partner.write"] == 1
+    assert sum(p["function"] == "Diretora" for p in fake_odoo.odoo.partners()) >= 2
+
+
+def test_partners_imported_before_are_adopted_without_writes_when_identical(fake_odoo, tmp_path):
+    imported = run_import(fake_odoo, tmp_path).snapshot()
+    fake_odoo.odoo.rpc_counts.clear()
+
+    stats = run_sync(fake_odoo, tmp_path)
+    again = run_sync(fake_odoo, tmp_path)
+
+    assert stats["contacts_created"] == stats["contacts_updated"] == 0
+    assert stats["contacts_skipped_odoo"] == imported["contacts_created"]
+    assert fake_odoo.odoo.rpc_counts["res.partner.write"] == 0
+    assert again["contacts_unchanged"] == imported["contacts_created"]
+
+
+def test_adopted_partners_that_differ_from_the_export_are_corrected(fake_odoo, tmp_path):
+    imported = run_import(fake_odoo, tmp_path).snapshot()
+    fake_odoo.odoo.rpc_counts.clear()
+
+    changed_file = tmp_path / "changed.csv"
+    rewrite_csv(DATA_FILE, changed_file, lambda rows: rows[0].update(function="Diretora"))
+    email = next(csv.DictReader(changed_file.open(encoding="utf-8")))["email"].lower()
+
+    stats = run_sync(fake_odoo, tmp_path, file_name=changed_file)
+    again = run_sync(fake_odoo, tmp_path, file_name=changed_file)
+
+    assert stats["contacts_updated"] == 1
+    assert stats["contacts_skipped_odoo"] == imported["contacts_created"] - 1
+    assert fake_odoo.odoo.rpc_counts["res.partner.write"] == 1
+    partner = next(p for p in fake_odoo.odoo.partners() if p["email"] == email)
+    assert partner["function"] == "Diretora"
+    assert again["contacts_unchanged"] == imported["contacts_created"]
@@ -0,0 +1,59 @@
+import asyncio
+import json
+import threading
+
+from src.odoo_xmlrpc_csv_importer.infrastructure.tracer import Tracer
+
+
+def load_events(path) -> list[dict]:
+    return json.loads(path.read_text())["traceEvents"]
+
+
+def test_spans_inside_a_batch_are_tagged_and_queue_time_is_recorded(tmp_path):
+    tracer = Tracer(tmp_path / "trace.json")
+    tracer.mark_queued(7)
+
+    def worker():
+        with tracer.batch(7, rows=10), tracer.span("res.partner.create", "rpc"):
+            pass
+
+    thread = threading.Thread(target=worker, name="worker-0")
+    thread.start()
+    thread.join()
+    with tracer.span("fora", "stage"):
+        pass
+    tracer.write()
+
+    events = load_events(tmp_path / "trace.json")
+    spans = {e["name"]: e for e in events if e["ph"] == "X"}
+    assert spans["res.partner.create"]["args"] == {"batch": 7}
+    assert spans["lote 7"]["args"] == {"rows": 10, "batch": 7}
+    assert spans["fora"]["args"] == {}
+    assert spans["res.partner.create"]["tid"] == spans["lote 7"]["tid"] != spans["fora"]["tid"]
+
+    begin, end = (e for e in events if e.get("cat") == "queue")
+    assert (begin["ph"], end["ph"], begin["id"], end["id"]) == ("b", "e", 7, 7)
+    assert begin["ts"] <= end["ts"] <= spans["lote 7"]["ts"] + 1
+
+    names = {e["args"]["name"] for e in events if e["name"] == "thread_name"}
+    assert "worker-0" in names
+
+
+def test_async_batches_get_a_track_each(tmp_path):
+    tracer = Tracer(tmp_path / "trace.json")
+
+    async def batch(number):
+        with tracer.batch(number, rows=1, own_track=True):
+            await asyncio.sleep(0.01)
+            with tracer.span("res.partner.create", "rpc"):
+                await asyncio.sleep(0)
+
+    async def run():
+        await asyncio.gather(batch(1), batch(2))
+
+    asyncio.run(run())
+    tracer.write()
+
+    rpcs = [e for e in load_events(tmp_path / "trace.json") if e.get("cat") == "rpc"]
+    assert len({e["tid"] for e in rpcs}) == 2
+    assert sorted(e["args"]["batch"] for e in rpcs) == [1, 2]